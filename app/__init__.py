@@ -2,15 +2,29 @@ from flask import Flask
 from .api import api
 from .models import db
 from .config import Config
+from .cleanup import start_cleanup_scheduler
+from .unit_of_work import init_unit_of_work
+from .storage import init_storage
+from .metrics import instrument_app
+from .logs import configure_logging, get_logger
+from .memory_profile import start_memory_profiling
 import os
 import json
 
-def create_app():
-    app = Flask(__name__)
+def create_app(instance_path=None):
+    """Build the app; instance_path overrides where games.json is kept (Flask's instance folder)."""
+    app = Flask(__name__, instance_path=instance_path)
     app.config.from_object(Config)
+    configure_logging(app.config['LOG_LEVEL'], app.config['LOG_FORMAT'], app.config['LOG_DEBUG_SAMPLE_RATE'])
+    logger = get_logger("app")
+    if app.config['MEMORY_PROFILING']:
+        start_memory_profiling(app.config['MEMORY_PROFILE_FRAMES'])
     
     # Initialize SQLAlchemy
     db.init_app(app)
+    init_storage(app, db)
+    init_unit_of_work(app)
+    instrument_app(app, db)
     
     app.register_blueprint(api)
 
@@ -29,8 +43,8 @@ def create_app():
                     from app.game import GameManager
                     manager = GameManager.from_dict(game_data)
                     app.config["games"][session_id] = manager
-        except Exception as e:
-            print(f"Error loading saved games: {e}")
+        except Exception:
+            logger.exception("loading saved games failed", extra={'path': games_file})
 
     # Save games periodically
     @app.before_request
@@ -43,7 +57,10 @@ def create_app():
                 for session_id, manager in app.config["games"].items():
                     games_data[session_id] = manager.to_dict()
                 json.dump(games_data, f)
-        except Exception as e:
-            print(f"Error saving games: {e}")
+        except Exception:
+            logger.exception("saving games failed", extra={'path': games_file})
+
+    # Delete abandoned games periodically
+    start_cleanup_scheduler(app)
 
     return app
\ No newline at end of file
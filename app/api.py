@@ -1,24 +1,24 @@
 import uuid
-import copy
 import random
+import threading
 from flask import Blueprint, jsonify, current_app, render_template, request
 from app.game import GameManager
 from app.player import HumanPlayer
-from app.bots import IdiotBot, WhiteIdiotBot, BlackIdiotBot, GreedyBot, MinimaxBot, BetterMinimaxBotOne, BetterMinimaxBotTwo
-from app.models import db, Game, BoardState, Move
-from datetime import datetime, UTC, timedelta
+from app.bots import BOT_REGISTRY
+from app.models import db, Game, BoardState
+from app.bot_jobs import CANCELLED, FAILED, get_job_runner
+from app.cleanup import cleanup_abandoned_games
+from app.pondering import get_ponderer
+from app.rehydrate import load_game
+from app.unit_of_work import begin_read, read_only
+from app.metrics import METRICS, add_phase_time, init_metrics
+from app.memory_profile import memory_report
+from app.logs import get_logger
+from datetime import datetime, UTC
 
 api = Blueprint("api", __name__)
-
-BOT_REGISTRY = {
-    "white_idiot": WhiteIdiotBot,
-    "black_idiot": BlackIdiotBot,
-    "pongo": GreedyBot,
-    "borzoi": MinimaxBot,
-    "barrowofmonkeys": BetterMinimaxBotOne,
-    "gigantopithecus": BetterMinimaxBotTwo,
-    # Add others here
-}
+init_metrics(api)
+logger = get_logger("api")
 
 @api.route("/")
 def index():
@@ -47,8 +47,6 @@ def new_game_vs_bot():
         else:
             # For other bots when player has a color preference
             bot_color = "black" if player_color == "white" else "white"
-    
-    print(f"Creating new game with bot color: {bot_color}")
 
     session_id = uuid.uuid4()  # Use UUID object directly for database
     manager = GameManager()
@@ -60,22 +58,16 @@ def new_game_vs_bot():
     try:
         # Set up players
         if bot_color == "white":
-            print("Setting up white bot vs human")
             white_bot = bot_cls(name=bot_cls.__name__, color="white")
             black_player = HumanPlayer(name=player_name, color="black")
-            print(f"White bot: {white_bot}")
-            print(f"Black player: {black_player}")
             manager.set_players(white_bot, black_player)
             white_type = "bot"
             white_name = bot_cls.__name__
             black_type = "human"
             black_name = player_name
         else:
-            print("Setting up human vs black bot")
             white_player = HumanPlayer(name=player_name, color="white")
             black_bot = bot_cls(name=bot_cls.__name__, color="black")
-            print(f"White player: {white_player}")
-            print(f"Black bot: {black_bot}")
             manager.set_players(white_player, black_bot)
             white_type = "human"
             white_name = player_name
@@ -98,26 +90,25 @@ def new_game_vs_bot():
         initial_board_state = BoardState(
             session_id=session_id,
             move_number=0,
-            board_state=manager.to_dict()['board'],
+            board_state=manager.board_state(),
             captured_pieces=[]
         )
         db.session.add(initial_board_state)
 
-        # Commit the transaction
-        db.session.commit()
+        # Write now so errors are reported here; the request commits once it returns
+        db.session.flush()
 
         # Keep in-memory copy for active game
         current_app.config["games"][str(session_id)] = manager
 
-        print(f"Game created with session ID: {session_id}")
-        print(f"Initial turn: {manager.current_turn}")
-        print(f"White player: {manager.players['white']}")
-        print(f"Black player: {manager.players['black']}")
+        logger.info("game created", extra={
+            'session_id': str(session_id), 'white': white_name, 'black': black_name, 'bot_color': bot_color
+        })
         
         return jsonify({"session_id": str(session_id), "bot_color": bot_color})
     except Exception as e:
         db.session.rollback()
-        print(f"Error creating game: {str(e)}")
+        logger.exception("game creation failed", extra={'bot_type': bot_type})
         return jsonify({"error": str(e)}), 500
 
 @api.route("/api/new-game/bots", methods=["POST"])
@@ -156,20 +147,36 @@ def new_game_bots_only():
         initial_board_state = BoardState(
             session_id=session_id,
             move_number=0,
-            board_state=manager.to_dict()['board'],
+            board_state=manager.board_state(),
             captured_pieces=[]
         )
         db.session.add(initial_board_state)
-        db.session.commit()
+        db.session.flush()
     except Exception as e:
         db.session.rollback()
-        print(f"Error creating bot vs bot game: {str(e)}")
+        logger.exception("bot vs bot game creation failed", extra={'white': white_key, 'black': black_key})
         return jsonify({"error": str(e)}), 500
 
     # Keep in-memory copy for active game
     current_app.config["games"][str(session_id)] = manager
+    logger.info("game created", extra={
+        'session_id': str(session_id), 'white': white_bot_cls.__name__, 'black': black_bot_cls.__name__
+    })
     return jsonify({"session_id": str(session_id)})
 
+@api.route("/metrics")
+def metrics():
+    """Request latency and phase histograms in the Prometheus text format."""
+    return current_app.response_class(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route("/api/admin/memory", methods=["GET"])
+def memory_usage():
+    """Bytes per in-memory game and peak allocation per bot search; 404 unless MEMORY_PROFILING is on."""
+    if not current_app.config.get('MEMORY_PROFILING'):
+        return jsonify({"error": "Memory profiling is disabled"}), 404
+    top = request.args.get('top', 10, type=int)
+    return jsonify(memory_report(current_app.config.get("games", {}), top))
+
 @api.route("/api/bots", methods=["GET"])
 def get_available_bots():
     return jsonify({
@@ -179,21 +186,13 @@ def get_available_bots():
             {"id": "pongo", "name": "Pongo", "description": "Picks the best move by piece value.", "avatar": "pongo.png"},
             {"id": "borzoi", "name": "Borzoi", "description": "Uses 1-ply minimax to find the best move.", "avatar": "borzoi.png"},
             {"id": "barrowofmonkeys", "name": "Barrow of Monkeys", "description": "Uses 2-ply minimax with mobility evaluation.", "avatar": "barrowofmonkeys.png"},
-            {"id": "gigantopithecus", "name": "Gigantopithecus", "description": "Uses 2-ply minimax with safety evaluation.", "avatar": "gigantopithecus.png"}
+            {"id": "gigantopithecus", "name": "Gigantopithecus", "description": "Uses 2-ply minimax with safety evaluation.", "avatar": "gigantopithecus.png"},
+            {"id": "silverback", "name": "Silverback", "description": "Searches up to 6 plies deep with null-move pruning and late-move reductions.", "avatar": "default_player.png"}
         ]
     })
 
-def piece_to_dict(piece):
-    """Convert a piece object to a dictionary representation"""
-    if piece is None:
-        return None
-    return {
-        'type': piece.__class__.__name__,
-        'color': piece.color,
-        'symbol': piece.symbol()
-    }
-
 @api.route("/api/board")
+@read_only
 def get_board():
     session_id = request.args.get('session_id')
     if not session_id:
@@ -204,130 +203,96 @@ def get_board():
     except ValueError:
         return jsonify({'error': 'Invalid session ID format'}), 400
 
-    # Try to get game from memory first
-    manager = current_app.config["games"].get(str(session_id))
-    
-    # If not in memory, try to load from database
+    manager = get_manager(session_id)
     if not manager:
-        game = Game.query.get(session_id)
-        if not game:
-            return jsonify({'error': 'Game not found'}), 404
-
-        # Get the latest board state
-        latest_board_state = BoardState.query.filter_by(
-            session_id=session_id
-        ).order_by(BoardState.move_number.desc()).first()
-
-        if not latest_board_state:
-            return jsonify({'error': 'No board state found'}), 404
-
-        # Create new game manager
-        manager = GameManager()
-        
-        # Restore board state
-        from app.pieces import Pawn, Rook, Knight, Bishop, Queen, King
-        piece_classes = {
-            'Pawn': Pawn,
-            'Rook': Rook,
-            'Knight': Knight,
-            'Bishop': Bishop,
-            'Queen': Queen,
-            'King': King
-        }
-        
-        for row in range(8):
-            for col in range(8):
-                piece_data = latest_board_state.board_state[row][col]
-                if piece_data:
-                    piece_class = piece_classes[piece_data['type']]
-                    piece = piece_class(piece_data['color'])
-                    manager.board.place_piece(piece, (row, col))
-
-        # Restore players
-        if game.white_player_type == 'human':
-            manager.players['white'] = HumanPlayer(name=game.white_player_name, color='white')
-        else:
-            bot_cls = BOT_REGISTRY.get(game.white_player_name.lower().replace(' ', ''))
-            if bot_cls:
-                manager.players['white'] = bot_cls(name=game.white_player_name, color='white')
-            else:
-                manager.players['white'] = WhiteIdiotBot()
-
-        if game.black_player_type == 'human':
-            manager.players['black'] = HumanPlayer(name=game.black_player_name, color='black')
-        else:
-            bot_cls = BOT_REGISTRY.get(game.black_player_name.lower().replace(' ', ''))
-            if bot_cls:
-                manager.players['black'] = bot_cls(name=game.black_player_name, color='black')
-            else:
-                manager.players['black'] = BlackIdiotBot()
-
-        # Restore game state
-        manager.current_turn = game.current_turn
-
-        # Restore move history
-        moves = Move.query.filter_by(session_id=session_id).order_by(Move.move_number).all()
-        manager.move_history = [
-            {
-                'from': move.from_position,
-                'to': move.to_position,
-                'color': move.piece_color
-            }
-            for move in moves
-        ]
-
-        # Store in memory for future requests
-        current_app.config["games"][str(session_id)] = manager
-    
-    # Convert board state to a format the client can understand
-    board_state = []
-    for row in manager.board.grid:
-        row_data = []
-        for piece in row:
-            if piece is None:
-                row_data.append(None)
-            else:
-                row_data.append({
-                    'type': piece.__class__.__name__,
-                    'color': piece.color,
-                    'symbol': piece.symbol()
-                })
-        board_state.append(row_data)
+        return jsonify({'error': 'Game not found'}), 404
     
-    # Get captured pieces
+    # A client that already has this exact state gets a bodyless 304
+    etag = manager.etag()
+    if request.if_none_match.contains(etag):
+        return _board_response(None, etag, status=304)
+
+    # Clients that pass the last version they saw get only what changed since
+    since = request.args.get('since', type=int)
+    if since is not None and since == manager.version:
+        return _board_response(None, etag, status=304)
+
+    delta = manager.delta_since(since) if since is not None else None
+    if delta is None:
+        # Unknown or missing version: send the full board, serialized once per version
+        payload = manager.board_payload(
+            lambda: current_app.json.dumps(_board_payload(manager, manager.board_state(), manager.move_history)))
+        return _board_response(payload, etag)
+
+    response = _board_payload(manager)
+    response['since'] = since
+    response.update(delta)
+    return _board_response(current_app.json.dumps(response), etag)
+
+def get_manager(session_id):
+    """
+    Return the GameManager for a session: the in-memory copy, or one rebuilt
+    from the database (app/rehydrate.py) and kept in memory for later requests.
+    Returns None for unknown or malformed session IDs.
+    """
+    if not session_id:
+        return None
+    games = current_app.config["games"]
+    manager = games.get(str(session_id))
+    if manager:
+        return manager
+    try:
+        session_uuid = uuid.UUID(str(session_id))
+    except ValueError:
+        return None
+    begin_read()
+    manager = load_game(session_uuid)
+    if manager is None:
+        return None
+    # Another request may have rehydrated the same game meanwhile; keep the first copy
+    return games.setdefault(str(session_uuid), manager)
+
+def _board_payload(manager, board=None, move_history=None):
+    """Fields of an /api/board response; the full board and history are only included when given."""
     captured_pieces = manager.board.get_captured_pieces_unicode()
-    
-    return jsonify({
-        'board': board_state,
+    status = manager.status()
+    payload = {
+        'version': manager.version,
         'turn': manager.current_turn,
-        'move_history': manager.move_history,
-        'status': manager.get_game_status(),
+        'status': status.message,
+        'status_detail': status.to_dict(),
         'captured_by_white': captured_pieces['captured_by_white'],
         'captured_by_black': captured_pieces['captured_by_black'],
         'white_player_name': manager.players['white'].name,
         'black_player_name': manager.players['black'].name
-    })
+    }
+    if board is not None:
+        payload['board'] = board
+        payload['move_history'] = move_history
+    return payload
+
+def _board_response(body, etag, status=200):
+    """Wrap a serialized /api/board body with its ETag; no-cache makes browsers revalidate every poll."""
+    response = current_app.response_class(body, status=status, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @api.route("/api/move", methods=["POST"])
 def make_move():
     data = request.get_json()
-    print("RAW JSON from request:", data)
-    print("data.get('from') =", data.get("from"), "type:", type(data.get("from")))
     session_id = uuid.UUID(data.get("session_id"))  # Convert string to UUID
     from_pos = tuple(map(int, data.get("from")))
     to_pos = tuple(map(int, data.get("to")))
 
     # Get game from database
-    game = Game.query.get(session_id)
+    game = db.session.get(Game, session_id)
     if not game:
         return jsonify({"error": "Invalid session ID"}), 400
 
-    # Get game manager from memory
-    manager = current_app.config["games"].get(str(session_id))
+    manager = get_manager(session_id)
     if not manager:
-        return jsonify({"error": "Game not found in memory"}), 400
-
-    print(f"from_pos = {from_pos}, to_pos = {to_pos}, type(from_pos) = {type(from_pos)}")
+        return jsonify({"error": "Game not found"}), 400
     
     # Get the piece being moved
     piece = manager.board.get_piece_at(from_pos)
@@ -338,20 +303,13 @@ def make_move():
     if piece.color != manager.current_turn:
         return jsonify({"error": "Not your turn"}), 400
     
-    # Check if the move is in the piece's valid moves
-    if to_pos not in piece.get_valid_moves(manager.board):
-        return jsonify({"error": "Invalid move for this piece"}), 400
-    
-    # Check if the move would leave the king in check
-    test_board = copy.deepcopy(manager.board)
-    if test_board.move_piece(from_pos, to_pos, validate=False) and test_board.is_in_check(piece.color):
-        return jsonify({"error": "This move would leave your king in check"}), 400
-    
-    # If we're in check, verify this move gets us out of check
-    if manager.board.is_in_check(piece.color):
-        test_board = copy.deepcopy(manager.board)
-        if not test_board.move_piece(from_pos, to_pos, validate=False) or test_board.is_in_check(piece.color):
+    # Check the move against the cached legal moves for this position
+    if not manager.is_legal_move(from_pos, to_pos):
+        if to_pos not in piece.get_valid_moves(manager.board):
+            return jsonify({"error": "Invalid move for this piece"}), 400
+        if manager.status().in_check:
             return jsonify({"error": "You must move out of check"}), 400
+        return jsonify({"error": "This move would leave your king in check"}), 400
     
     try:
         # Make the move in memory
@@ -359,50 +317,58 @@ def make_move():
         if not success:
             return jsonify({"error": "Invalid move"}), 400
 
-        # Get the current move number
-        move_number = len(manager.move_history)
+        # The human has replied, so the current ponder round is no longer needed
+        ponderer = get_ponderer(current_app)
+        if ponderer:
+            ponderer.stop(str(session_id))
 
-        # Save move to database
-        move = Move(
-            session_id=session_id,
-            move_number=move_number,
-            from_position=list(from_pos),  # Convert tuple to list for array storage
-            to_position=list(to_pos),      # Convert tuple to list for array storage
-            piece_type=piece.__class__.__name__,
-            piece_color=piece.color
-        )
-        db.session.add(move)
+        # Get the current move number
+        move_number = manager.version
 
         # Save new board state
         board_state = BoardState(
             session_id=session_id,
             move_number=move_number,
-            board_state=manager.to_dict()['board'],
+            board_state=manager.board_state(),
             captured_pieces=manager.board.get_captured_pieces_unicode()
         )
         db.session.add(board_state)
 
+        logger.debug("move", extra={'session_id': str(session_id), 'from': from_pos, 'to': to_pos, 'ply': move_number})
+
         # Update game status
+        status = manager.status()
         game.current_turn = manager.current_turn
-        game.game_status = manager.get_game_status()
+        game.game_status = status.message
+        game.move_record = manager.move_record()
         game.last_active = datetime.now(UTC)
 
-        # Commit all changes
-        db.session.commit()
+        # Write now so errors are reported here; the request commits once it returns
+        db.session.flush()
 
         return jsonify({
             "success": True,
+            "version": manager.version,
+            "changes": manager.delta_since(manager.version - 1)['changes'],
             "turn": manager.current_turn,
-            "status": manager.get_game_status()
+            "status": status.message,
+            "status_detail": status.to_dict()
         })
     except Exception as e:
         db.session.rollback()
-        print(f"Error making move: {str(e)}")
+        logger.exception("move failed", extra={'session_id': str(session_id), 'from': from_pos, 'to': to_pos})
         return jsonify({"error": str(e)}), 500
 
 @api.route("/api/bot-move", methods=["POST"])
 def bot_move():
-    """Make a move for the current bot player"""
+    """
+    Make a move for the current bot player.
+
+    The search runs on the bot job pool (app/bot_jobs.py). The request waits
+    up to "wait" seconds (default BOT_MOVE_WAIT_SECONDS) for the move; with
+    "async": true, or when the wait runs out, it answers 202 with a job id
+    to poll at /api/bot-move/<job_id>.
+    """
     try:
         data = request.get_json()
         if not data:
@@ -414,108 +380,180 @@ def bot_move():
         if not session_id:
             return jsonify({'error': 'Missing session ID'}), 400
             
-        manager = current_app.config["games"].get(session_id)
+        manager = get_manager(session_id)
         if not manager:
             return jsonify({'error': 'Invalid session ID'}), 400
             
         player = manager.get_current_player()
-        print(f"Current turn: {manager.current_turn}")
-        print(f"Current player: {player}")
-        print(f"Player color: {player.color}")
-        print(f"Requested bot color: {bot_color}")
         
         # Check if the current player is a bot
-        if not hasattr(player, 'decide_move'):
+        if isinstance(player, HumanPlayer):
             return jsonify({'error': 'Current player is human, not a bot'}), 400
             
         # Verify the bot color matches the current player's color
         if bot_color and player.color != bot_color:
-            print(f"Bot color mismatch: Expected {bot_color}, got {player.color}")
-            print(f"Current turn: {manager.current_turn}")
-            print(f"Player type: {type(player)}")
+            logger.warning("bot color mismatch", extra={
+                'session_id': session_id, 'requested': bot_color, 'to_move': player.color
+            })
             return jsonify({'error': f'Bot color mismatch. Expected {bot_color}, got {player.color}'}), 400
         
-        # Get the bot's move using the board directly
-        move = player.decide_move(manager.board)
-        
-        # If no move is found and we're in checkmate or draw, update DB and return
-        if not move and (manager.board.is_checkmate(player.color) or manager.board.is_draw(player.color)):
-            game = Game.query.get(uuid.UUID(session_id))
-            if game:
-                # Use manager.get_game_status() for a descriptive status
-                game.game_status = manager.get_game_status()
-                game.last_active = datetime.now(UTC)
-                db.session.commit()
+        # If the game is already over (checkmate or draw), update DB and return without searching
+        status = manager.status()
+        if status.is_over:
+            _update_game(session_id, game_status=status.message)
             return jsonify({
                 'success': True,
-                'status': manager.get_game_status(),
-                'winner': 'black' if player.color == 'white' else 'white' if manager.board.is_checkmate(player.color) else None
+                'status': status.message,
+                'status_detail': status.to_dict(),
+                'winner': status.winner
             })
-        
-        if not move:
-            return jsonify({'error': 'No valid move found'}), 400
-            
-        # Handle both tuple and Move object returns
-        if isinstance(move, tuple):
-            from_pos, to_pos = move
-        else:
-            from_pos = move.from_pos
-            to_pos = move.to_pos
-        
-        print(f"Bot move: from {from_pos} to {to_pos}")
-        
-        # Get the piece symbol before making the move
-        piece_obj = manager.board.get_piece_at(from_pos)
-        if not piece_obj:
-            return jsonify({'error': 'No piece found at move source position'}), 400
-            
-        piece_symbol = piece_obj.symbol()
-        
-        # Make the move by passing from_pos and to_pos separately
-        success = manager.make_move(from_pos, to_pos)
-        if not success:
-            return jsonify({'error': 'Invalid move'}), 400
-        
-        # Get the updated board state
-        board_state = []
-        for row in manager.board.grid:
-            row_data = []
-            for piece in row:
-                if piece is None:
-                    row_data.append(None)
-                else:
-                    row_data.append(piece.symbol())
-            board_state.append(row_data)
-        
-        # Get captured pieces
-        captured_pieces = manager.board.get_captured_pieces_unicode()
-        
-        game = Game.query.get(uuid.UUID(session_id))
-        if game:
-            game.last_active = datetime.now(UTC)
-            db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'move': {
-                'from': [from_pos[0], from_pos[1]],
-                'to': [to_pos[0], to_pos[1]],
-                'piece': piece_symbol
-            },
-            'board': board_state,
-            'turn': manager.current_turn,
-            'status': manager.get_game_status(),
-            'captured_by_white': captured_pieces['captured_by_white'],
-            'captured_by_black': captured_pieces['captured_by_black']
-        })
+
+        # An answer pondered while the human was thinking is played without searching
+        ponderer = get_ponderer(current_app)
+        pondered_move = ponderer.lookup(session_id, manager) if ponderer else None
+        if pondered_move:
+            with _bot_move_lock:
+                payload, code = _apply_bot_move(session_id, manager, pondered_move)
+            payload['pondered'] = code == 200
+            return jsonify(payload), code
+
+        # Search on the job pool; wait for it unless the client asked for a job id right away
+        job = get_job_runner(current_app).submit(session_id, manager)
+        if job is None:
+            return jsonify({'error': 'Current player is human, not a bot'}), 400
+        wait = 0 if data.get('async') else _bot_move_wait(data.get('wait'))
+        if not job.wait(wait):
+            return jsonify({'success': True, 'pending': True, **job.to_dict()}), 202
+        payload, code = _collect_bot_job(job, manager, data.get('include_stats'))
+        return jsonify(payload), code
         
     except Exception as e:
-        print(f"Error in bot_move: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("bot move failed", extra={'session_id': (request.get_json(silent=True) or {}).get('session_id')})
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+_bot_move_lock = threading.Lock()
+
+def _bot_move_wait(requested):
+    """Seconds a request may block on a bot job, capped at BOT_MOVE_WAIT_SECONDS."""
+    limit = current_app.config.get('BOT_MOVE_WAIT_SECONDS', 30)
+    if requested is None:
+        return limit
+    return max(0.0, min(float(requested), limit))
+
+def _collect_bot_job(job, manager, include_stats=False):
+    """
+    Turn a finished job into the bot-move response, playing its move on the game
+    exactly once. With include_stats the bot's search statistics are added.
+    """
+    if job.state == CANCELLED:
+        return {'error': 'Bot move was cancelled', **job.to_dict()}, 409
+    if job.state == FAILED:
+        return {'error': f'Internal server error: {job.error}'}, 500
+
+    with _bot_move_lock:
+        if job.response is None:
+            if job.version != manager.version:
+                return {'error': 'The game has moved on since this bot move was requested', **job.to_dict()}, 409
+            add_phase_time('decide_move', job.search_seconds or 0.0)
+            job.response = _apply_bot_move(job.session_id, manager, job.move)
+            job.applied = True
+    payload, code = job.response
+    if include_stats and job.search_stats is not None:
+        payload = {**payload, 'search_stats': job.search_stats.to_dict()}
+    return payload, code
+
+def _apply_bot_move(session_id, manager, move):
+    """Play a bot's chosen move on the game and build the response; returns (payload, status code)."""
+    if not move:
+        return {'error': 'No valid move found'}, 400
+        
+    # Handle both tuple and Move object returns
+    if isinstance(move, tuple):
+        from_pos, to_pos = move
+    else:
+        from_pos = move.from_pos
+        to_pos = move.to_pos
+    
+    logger.debug("bot move", extra={'session_id': session_id, 'from': from_pos, 'to': to_pos})
+    
+    # Get the piece symbol before making the move
+    piece_obj = manager.board.get_piece_at(from_pos)
+    if not piece_obj:
+        return {'error': 'No piece found at move source position'}, 400
+        
+    piece_symbol = piece_obj.symbol()
+    
+    # Make the move by passing from_pos and to_pos separately
+    success = manager.make_move(from_pos, to_pos)
+    if not success:
+        return {'error': 'Invalid move'}, 400
+    
+    # Get captured pieces
+    captured_pieces = manager.board.get_captured_pieces_unicode()
+    status = manager.status()
+
+    # Think about the bot's next answer while the human considers their reply
+    ponderer = get_ponderer(current_app)
+    if ponderer:
+        if status.is_over:
+            ponderer.forget(session_id)
+        elif isinstance(manager.get_current_player(), HumanPlayer):
+            ponderer.start(session_id, manager)
+    
+    _update_game(
+        session_id,
+        current_turn=manager.current_turn,
+        game_status=status.message,
+        move_record=manager.move_record()
+    )
+    
+    return {
+        'success': True,
+        'move': {
+            'from': [from_pos[0], from_pos[1]],
+            'to': [to_pos[0], to_pos[1]],
+            'piece': piece_symbol
+        },
+        'version': manager.version,
+        'changes': manager.delta_since(manager.version - 1)['changes'],
+        'turn': manager.current_turn,
+        'status': status.message,
+        'status_detail': status.to_dict(),
+        'captured_by_white': captured_pieces['captured_by_white'],
+        'captured_by_black': captured_pieces['captured_by_black']
+    }, 200
+
+def _update_game(session_id, **values):
+    """Update a game's row with a single UPDATE (no SELECT first), touching last_active."""
+    values['last_active'] = datetime.now(UTC)
+    Game.query.filter_by(session_id=uuid.UUID(str(session_id))).update(values, synchronize_session=False)
+
+@api.route("/api/bot-move/<job_id>", methods=["GET"])
+def bot_move_result(job_id):
+    """Poll a bot move job; ?wait=<seconds> long-polls until it finishes (capped at BOT_MOVE_WAIT_SECONDS)."""
+    job = get_job_runner(current_app).get(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown bot move job'}), 404
+
+    if not job.wait(_bot_move_wait(request.args.get('wait', 0, type=float))):
+        return jsonify({'success': True, 'pending': True, **job.to_dict()}), 202
+
+    manager = get_manager(job.session_id)
+    if not manager:
+        return jsonify({'error': 'Invalid session ID'}), 400
+    payload, code = _collect_bot_job(job, manager, request.args.get('include_stats', type=int))
+    return jsonify(payload), code
+
+@api.route("/api/bot-move/<job_id>", methods=["DELETE"])
+def cancel_bot_move(job_id):
+    """Cancel a queued or running bot move job."""
+    job = get_job_runner(current_app).cancel(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown bot move job'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
 @api.route("/api/valid-moves", methods=["GET"])
+@read_only
 def get_valid_moves():
     session_id = request.args.get("session_id")
     position = request.args.get("position")
@@ -528,13 +566,40 @@ def get_valid_moves():
     except Exception:
         return jsonify({"error": "Invalid position format. Use 'row,col'."}), 400
 
-    manager = current_app.config["games"].get(session_id)
+    manager = get_manager(session_id)
     if not manager:
         return jsonify({"error": "Invalid session ID"}), 400
 
     moves = manager.get_valid_moves((row, col))
     return jsonify({"valid_moves": moves})
 
+@api.route("/api/legal-moves", methods=["GET"])
+@read_only
+def get_legal_moves():
+    """Return every legal move for the side to move, keyed by 'row,col' of the piece."""
+    manager = get_manager(request.args.get("session_id"))
+    if not manager:
+        return jsonify({"error": "Invalid session ID"}), 400
+
+    moves = {
+        f"{from_pos[0]},{from_pos[1]}": [list(to_pos) for to_pos in targets]
+        for from_pos, targets in manager.legal_moves().items()
+    }
+    return jsonify({"turn": manager.current_turn, "moves": moves})
+
+@api.route("/api/game-record", methods=["GET"])
+@read_only
+def export_game_record():
+    """Download the game's moves as a binary game record (format in app/move_encoding.py)."""
+    session_id = request.args.get("session_id")
+    manager = get_manager(session_id)
+    if not manager:
+        return jsonify({"error": "Game not found"}), 404
+
+    response = current_app.response_class(manager.move_record(), mimetype='application/octet-stream')
+    response.headers['Content-Disposition'] = f'attachment; filename="{session_id}.icgr"'
+    return response
+
 @api.route("/botvbot")
 def botvbot_page():
     return render_template("botvbot.html")
@@ -551,41 +616,27 @@ def resign_game():
     except Exception:
         return jsonify({"error": "Invalid session_id format"}), 400
 
-    # Update in-memory game manager if present
-    manager = current_app.config["games"].get(str(session_id))
-    if manager:
-        # Optionally, you could set a flag or status in the manager
-        pass
+    # Stop any bot search still running for this game
+    get_job_runner(current_app).cancel_session(str(session_id))
+    ponderer = get_ponderer(current_app)
+    if ponderer:
+        ponderer.forget(str(session_id))
 
     # Update database
-    game = Game.query.get(session_id_uuid)
+    game = db.session.get(Game, session_id_uuid)
     if not game:
         return jsonify({"error": "Game not found"}), 404
     game.game_status = f"Resigned by {resigning_color}"
     game.last_active = datetime.now(UTC)
-    db.session.commit()
     return jsonify({"success": True, "status": game.game_status})
 
 @api.route("/api/cleanup-abandoned", methods=["POST"])
 def cleanup_abandoned():
-    timeout_minutes = int(request.json.get("timeout", 60))
-    cutoff = datetime.now(UTC) - timedelta(minutes=timeout_minutes)
-    abandoned_games = Game.query.filter(
-        Game.game_status == "active",
-        Game.last_active < cutoff
-    ).all()
-    count = len(abandoned_games)
-    
+    data = request.get_json(silent=True) or {}
+    timeout_minutes = int(data.get("timeout", 60))
     try:
-        for game in abandoned_games:
-            # Delete related records first
-            Move.query.filter_by(session_id=game.session_id).delete()
-            BoardState.query.filter_by(session_id=game.session_id).delete()
-            # Then delete the game
-            db.session.delete(game)
-        db.session.commit()
+        count = cleanup_abandoned_games(current_app, timeout_minutes, current_app.config.get('CLEANUP_BATCH_SIZE', 500))
         return jsonify({"deleted": count})
     except Exception as e:
-        db.session.rollback()
-        print(f"Error cleaning up abandoned games: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        logger.exception("abandoned game cleanup failed")
+        return jsonify({"error": str(e)}), 500
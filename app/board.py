@@ -1,11 +1,17 @@
 from __future__ import annotations
-from typing import Optional, List, Tuple
+from typing import Dict, Iterator, Optional, List, Tuple
 from pieces import Pawn, Rook, Knight, Bishop, King, Queen
-import copy
+from app.zobrist import compute_hash
 
 # Type alias for readability
 Position = Tuple[int, int]
 
+# Offsets and ray directions used by is_square_attacked and attackers
+KNIGHT_OFFSETS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+ORTHOGONAL_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
 class Board:
 
     def __init__(self):
@@ -16,6 +22,7 @@ class Board:
         self.halfmove_clock = 0  # Half-move counter (50-move rule)
         self.history = {}  # FEN-like position hash to count repetitions
         self.current_turn = 'white'  # Needed for repetition tracking
+        self._legal_moves_cache = None  # (color, position hash, moves) for the last position asked about
 
     def place_piece(self, piece, position):
         row, col = position
@@ -56,18 +63,11 @@ class Board:
             if to_pos not in piece.get_valid_moves(self):
                 return False
 
-            # Create a test board to check if the move would leave us in check
-            test_board = copy.deepcopy(self)
-            test_board.move_piece(from_pos, to_pos, validate=False)
-            if test_board.is_in_check(piece.color):
+            # Reject moves that leave our own king attacked (this also covers
+            # failing to get out of an existing check)
+            if self.leaves_king_in_check(from_pos, to_pos):
                 return False
 
-            # If we're in check, verify this move gets us out of check
-            if self.is_in_check(piece.color):
-                test_board = copy.deepcopy(self)
-                if not test_board.move_piece(from_pos, to_pos, validate=False) or test_board.is_in_check(piece.color):
-                    return False
-
         # Store information about the last move before any modifications
         last_move_info = None
         if self.last_move:
@@ -126,42 +126,182 @@ class Board:
         rook.set_position(rook_to)
         rook.mark_as_moved()
 
-    def is_in_check(self, color: str) -> bool:
-        king_pos = None
-
-        # Find the king's position
+    def find_king(self, color: str, grid=None) -> Optional[Position]:
+        grid = self.grid if grid is None else grid
         for row in range(8):
             for col in range(8):
-                piece = self.grid[row][col]
-                if piece and piece.color == color and piece.__class__.__name__ == 'King':
-                    king_pos = (row, col)
-                    break
-            if king_pos:
-                break
+                piece = grid[row][col]
+                if piece and piece.color == color and isinstance(piece, King):
+                    return (row, col)
+        return None
 
-        if not king_pos:
-            return False  # King not found (shouldn't happen in normal play)
+    def is_square_attacked(self, position: Position, by_color: str, grid=None) -> bool:
+        """
+        Return True if any piece of by_color attacks the given square.
 
-        # Check if any enemy piece can attack the king
-        for row in range(8):
-            for col in range(8):
-                piece = self.grid[row][col]
-                if piece and piece.color != color:
-                    if piece.can_attack(king_pos, self):
+        Looks outward from the square (knight jumps, adjacent kings, pawn
+        diagonals and the first piece along each rook and bishop ray) instead
+        of generating every enemy piece's moves. grid defaults to the board's
+        own grid.
+        """
+        grid = self.grid if grid is None else grid
+        row, col = position
+
+        for dr, dc in KNIGHT_OFFSETS:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                piece = grid[r][c]
+                if piece is not None and piece.color == by_color and isinstance(piece, Knight):
+                    return True
+
+        for dr, dc in KING_OFFSETS:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                piece = grid[r][c]
+                if piece is not None and piece.color == by_color and isinstance(piece, King):
+                    return True
+
+        # White pawns attack towards row 0, so a white attacker sits one row below the square
+        pawn_row = row + 1 if by_color == 'white' else row - 1
+        if 0 <= pawn_row < 8:
+            for c in (col - 1, col + 1):
+                if 0 <= c < 8:
+                    piece = grid[pawn_row][c]
+                    if piece is not None and piece.color == by_color and isinstance(piece, Pawn):
                         return True
 
+        for directions, sliders in ((ORTHOGONAL_DIRECTIONS, (Rook, Queen)), (DIAGONAL_DIRECTIONS, (Bishop, Queen))):
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8:
+                    piece = grid[r][c]
+                    if piece is not None:
+                        if piece.color == by_color and isinstance(piece, sliders):
+                            return True
+                        break
+                    r += dr
+                    c += dc
+
         return False
 
+    def attackers(self, position: Position, by_color: str) -> List[Position]:
+        """
+        Positions of every piece of by_color attacking the given square,
+        found the same way as in is_square_attacked. Only the first piece
+        along each ray counts, so pieces behind it (x-rays) show up once it
+        has left the grid.
+        """
+        grid = self.grid
+        row, col = position
+        found = []
+
+        for offsets, kind in ((KNIGHT_OFFSETS, Knight), (KING_OFFSETS, King)):
+            for dr, dc in offsets:
+                r, c = row + dr, col + dc
+                if 0 <= r < 8 and 0 <= c < 8:
+                    piece = grid[r][c]
+                    if piece is not None and piece.color == by_color and isinstance(piece, kind):
+                        found.append((r, c))
+
+        pawn_row = row + 1 if by_color == 'white' else row - 1
+        if 0 <= pawn_row < 8:
+            for c in (col - 1, col + 1):
+                if 0 <= c < 8:
+                    piece = grid[pawn_row][c]
+                    if piece is not None and piece.color == by_color and isinstance(piece, Pawn):
+                        found.append((pawn_row, c))
+
+        for directions, sliders in ((ORTHOGONAL_DIRECTIONS, (Rook, Queen)), (DIAGONAL_DIRECTIONS, (Bishop, Queen))):
+            for dr, dc in directions:
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8:
+                    piece = grid[r][c]
+                    if piece is not None:
+                        if piece.color == by_color and isinstance(piece, sliders):
+                            found.append((r, c))
+                        break
+                    r += dr
+                    c += dc
+
+        return found
+
+    def is_in_check(self, color: str) -> bool:
+        king_pos = self.find_king(color)
+        if not king_pos:
+            return False  # King not found (shouldn't happen in normal play)
+        return self.is_square_attacked(king_pos, 'black' if color == 'white' else 'white')
+
+    def leaves_king_in_check(self, from_pos: Position, to_pos: Position, scratch=None) -> bool:
+        """
+        Return True if moving the piece on from_pos to to_pos would leave its
+        own king attacked. Assumes to_pos is one of the piece's pseudo-legal moves.
+
+        The move (including an en passant capture) is made and unmade on
+        scratch, a private copy of the grid rows, never on self.grid: the live
+        board is read by concurrent requests. Callers testing many moves pass
+        one scratch grid (see iter_legal_moves); it is left as it was found.
+        """
+        grid = [row[:] for row in self.grid] if scratch is None else scratch
+        piece = grid[from_pos[0]][from_pos[1]]
+        captured = grid[to_pos[0]][to_pos[1]]
+
+        # A pawn moving diagonally onto an empty square is an en passant capture
+        en_passant_pos = None
+        if isinstance(piece, Pawn) and from_pos[1] != to_pos[1] and captured is None:
+            en_passant_pos = (from_pos[0], to_pos[1])
+            en_passant_piece = grid[en_passant_pos[0]][en_passant_pos[1]]
+            grid[en_passant_pos[0]][en_passant_pos[1]] = None
+
+        grid[to_pos[0]][to_pos[1]] = piece
+        grid[from_pos[0]][from_pos[1]] = None
+        try:
+            king_pos = to_pos if isinstance(piece, King) else self.find_king(piece.color, grid)
+            opponent = 'black' if piece.color == 'white' else 'white'
+            return king_pos is not None and self.is_square_attacked(king_pos, opponent, grid)
+        finally:
+            grid[from_pos[0]][from_pos[1]] = piece
+            grid[to_pos[0]][to_pos[1]] = captured
+            if en_passant_pos:
+                grid[en_passant_pos[0]][en_passant_pos[1]] = en_passant_piece
+
+    def iter_legal_moves(self, color: str) -> Iterator[Tuple[Position, Position]]:
+        """
+        Yield (from_pos, to_pos) for every legal move of the given color.
+        Moves are produced lazily, so callers that only need to know whether
+        a move exists can stop at the first one.
+        """
+        scratch = [row[:] for row in self.grid]
+        pieces = [piece for row in scratch for piece in row if piece and piece.color == color]
+        for piece in pieces:
+            from_pos = piece.position
+            for to_pos in piece.get_valid_moves(self):
+                if not self.leaves_king_in_check(from_pos, to_pos, scratch):
+                    yield from_pos, to_pos
+
     def has_any_valid_moves(self, color: str) -> bool:
-        for row in range(8):
-            for col in range(8):
-                piece = self.grid[row][col]
-                if piece and piece.color == color:
-                    for move in piece.get_valid_moves(self):
-                        test_board = copy.deepcopy(self)
-                        if test_board.move_piece(piece.position, move) and not test_board.is_in_check(color):
-                            return True
-        return False
+        cache = self._legal_moves_cache
+        if cache and cache[0] == color and cache[1] == self.position_hash(color):
+            return bool(cache[2])
+        return next(self.iter_legal_moves(color), None) is not None
+
+    def legal_moves(self, color: str) -> Dict[Position, List[Position]]:
+        """
+        Return every legal move of the given color as {from_pos: [to_pos, ...]}.
+
+        The result is cached against the position hash, so it is generated
+        once per position and dropped as soon as any move changes the board.
+        Callers must treat the returned dict and lists as read-only.
+        """
+        key = self.position_hash(color)
+        cache = self._legal_moves_cache
+        if cache and cache[0] == color and cache[1] == key:
+            return cache[2]
+
+        moves: Dict[Position, List[Position]] = {}
+        for from_pos, to_pos in self.iter_legal_moves(color):
+            moves.setdefault(from_pos, []).append(to_pos)
+        self._legal_moves_cache = (color, key, moves)
+        return moves
 
     def is_checkmate(self, color: str) -> bool:
         return self.is_in_check(color) and not self.has_any_valid_moves(color)
@@ -405,6 +545,13 @@ class Board:
         key += f"_{self.current_turn}"
         return key
 
+    def position_hash(self, color_to_move: Optional[str] = None) -> int:
+        """
+        64-bit Zobrist hash of the position (pieces, castling rights, en passant
+        file and side to move). Defaults to self.current_turn as the side to move.
+        """
+        return compute_hash(self, color_to_move)
+
     def record_position(self):
         key = self.generate_position_key()
         self.history[key] = self.history.get(key, 0) + 1
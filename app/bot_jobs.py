@@ -0,0 +1,187 @@
+"""
+Background computation of bot moves.
+
+/api/bot-move submits the bot's search to a small thread pool and hands the
+client a job id instead of running decide_move() inside the request. The
+client then polls (or long-polls) the job; the finished move is applied to
+the game by whichever request collects it first.
+
+Searches run on a copy of the board, so requests reading the live game are
+never affected. Cancelling a job sets an event that minimax_search checks at
+every node (see search_cancel_event), so a running search stops promptly;
+a job that has not started yet is simply dropped from the queue.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app.logs import get_logger
+from app.memory_profile import search_memory
+from app.metrics import add_phase_time
+from app.minimax_search import SearchCancelled, search_cancel_event
+from app.player import HumanPlayer
+
+# Finished jobs are kept this long so late polls still find their result
+JOB_RETENTION_SECONDS = 300
+
+logger = get_logger("bot_jobs")
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+
+class BotJob:
+    """A bot move being computed for one position of one game."""
+
+    def __init__(self, session_id: str, version: int, color: str):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.version = version  # Game version the move was computed for
+        self.color = color
+        self.state = PENDING
+        self.move = None
+        self.error = None
+        self.applied = False  # Set once a request has played the move on the game
+        self.response = None  # (payload, status code) of the applied move, returned to every later poll
+        self.search_seconds = None  # Time decide_move took
+        self.search_stats = None  # SearchStats reported by the bot, if it keeps them
+        self.created = time.monotonic()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes or the timeout expires; returns whether it finished."""
+        return self._done.wait(timeout)
+
+    def _finish(self, state: str):
+        self.state = state
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'session_id': self.session_id,
+            'state': self.state,
+            'color': self.color,
+            'version': self.version,
+            'error': self.error
+        }
+
+
+class BotJobRunner:
+    """Thread pool plus the table of jobs submitted to it."""
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bot-move")
+        self._jobs: Dict[str, BotJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id: str, manager) -> Optional[BotJob]:
+        """
+        Start computing the move of the side to move in the given game.
+        If a job for the same game and version is already queued or running,
+        that job is returned instead of starting a second search. Returns
+        None if the side to move is not a bot.
+
+        The player, version and board copy are read under manager.lock, so a
+        move landing meanwhile cannot pair them up from different positions.
+        """
+        with manager.lock:
+            player = manager.get_current_player()
+            if isinstance(player, HumanPlayer):
+                return None
+            version = manager.version
+            with self._lock:
+                self._prune()
+                for job in self._jobs.values():
+                    if job.session_id == session_id and job.version == version and job.state in (PENDING, RUNNING, DONE) and not job.applied:
+                        return job
+
+                job = BotJob(session_id, version, player.color)
+                self._jobs[job.id] = job
+            board = manager.board.copy()
+        self._executor.submit(self._run, job, player, board)
+        return job
+
+    def _run(self, job: BotJob, player, board):
+        if job.cancel_event.is_set():
+            job._finish(CANCELLED)
+            return
+        job.state = RUNNING
+        token = search_cancel_event.set(job.cancel_event)
+        start = time.perf_counter()
+        try:
+            with search_memory(type(player).__name__):
+                job.move = player.decide_move(board)
+            job.search_seconds = time.perf_counter() - start
+            job.search_stats = getattr(player, 'last_search_stats', None)
+            if job.search_stats is not None and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("bot search: %s", job.search_stats.summary(), extra={
+                    'session_id': job.session_id, 'bot': player.name, 'nodes': job.search_stats.nodes,
+                    'depth': job.search_stats.depth, 'search_ms': round(job.search_seconds * 1000, 2)
+                })
+            job._finish(CANCELLED if job.cancel_event.is_set() else DONE)
+        except SearchCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            logger.exception("bot search failed", extra={'session_id': job.session_id, 'bot': player.name})
+            job.error = str(e)
+            job._finish(FAILED)
+        finally:
+            search_cancel_event.reset(token)
+            add_phase_time('decide_move', time.perf_counter() - start, endpoint='bot_job')
+
+    def get(self, job_id: str) -> Optional[BotJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[BotJob]:
+        job = self.get(job_id)
+        if job and not job.finished:
+            job.cancel_event.set()
+        return job
+
+    def cancel_session(self, session_id: str) -> int:
+        """Cancel every unfinished job of a game (e.g. on resignation); returns how many were cancelled."""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.session_id == session_id and not job.finished]
+        for job in jobs:
+            job.cancel_event.set()
+        return len(jobs)
+
+    def _prune(self):
+        cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+        self._executor.shutdown(wait=True)
+
+
+_runner_lock = threading.Lock()
+
+
+def get_job_runner(app) -> BotJobRunner:
+    """Return the app's job runner, creating it on first use with BOT_WORKERS threads."""
+    runner = app.extensions.get('bot_jobs')
+    if runner is None:
+        with _runner_lock:
+            runner = app.extensions.get('bot_jobs')
+            if runner is None:
+                runner = BotJobRunner(max_workers=app.config.get('BOT_WORKERS', 2))
+                app.extensions['bot_jobs'] = runner
+    return runner
@@ -4,6 +4,17 @@ from app.board import Board
 from app.move_scoring import find_best_greedy_move, find_random_move, PIECE_VALUES
 from app.position_evaluation import evaluate_position_mobility, evaluate_position_safety
 from app.minimax_search import find_best_move
+from app.negamax_search import SearchOptions, find_best_move_pvs
+from app.search_stats import SearchStats
+import os
+
+# Search engines the minimax bots can use: 'minimax' (plain alpha-beta, app/minimax_search.py)
+# or 'pvs' (negamax with principal variation search, app/negamax_search.py)
+SEARCH_ENGINES = {
+    'minimax': find_best_move,
+    'pvs': find_best_move_pvs,
+}
+DEFAULT_SEARCH_ENGINE = os.getenv('SEARCH_ENGINE', 'minimax')
 
 class IdiotBot(Player):
     def __init__(self, name: str = None, color: str = None, image: str = None):
@@ -35,7 +46,11 @@ class GreedyBot(Player):
         When in check, only considers moves that get out of check.
         Returns a tuple: (from_position, to_position) or None if no valid moves (checkmate)
         """
-        return find_best_greedy_move(board, self.color)
+        stats = SearchStats()
+        move = find_best_greedy_move(board, self.color, stats=stats)
+        self.last_search_stats = stats
+        self.nodes_searched = stats.nodes
+        return move
 
 def evaluate_material(board: Board, color: str) -> float:
     """
@@ -64,8 +79,18 @@ def evaluate_material(board: Board, color: str) -> float:
     return score
 
 class MinimaxBot(Player):
-    def __init__(self, name: str = None, color: str = None, image: str = None):
+    depth = 1
+    evaluate_position = staticmethod(evaluate_material)
+    # Null-move pruning, late-move reductions and a time limit (pvs engine only), see app/negamax_search.py
+    search_options = None
+
+    def __init__(self, name: str = None, color: str = None, image: str = None, engine: str = None):
         super().__init__(name=name or "Borzoi", color=color, image=image or "borzoi.png")
+        self.engine = engine or DEFAULT_SEARCH_ENGINE
+        if self.engine not in SEARCH_ENGINES:
+            raise ValueError(f"Unknown search engine: {self.engine}")
+        if self.search_options is not None and self.engine != 'pvs':
+            raise ValueError(f"{type(self).__name__} needs the pvs search engine")
 
     def decide_move(self, board: Board):
         """
@@ -74,20 +99,51 @@ class MinimaxBot(Player):
         the best position after the opponent's best response.
         Returns a tuple: (from_position, to_position) or None if no valid moves (checkmate)
         """
-        return find_best_move(board, self.color, 1, evaluate_material)
+        stats = SearchStats()
+        options = {'options': self.search_options} if self.search_options is not None else {}
+        move = SEARCH_ENGINES[self.engine](board, self.color, self.depth, self.evaluate_position, stats, **options)
+        self.last_search_stats = stats
+        self.nodes_searched = stats.nodes
+        return move
 
 class BetterMinimaxBotOne(MinimaxBot):
-    def __init__(self, name: str = None, color: str = None, image: str = None):
-        super().__init__(name=name or "Barrow of Monkeys", color=color, image=image or "barrowofmonkeys.png")
-    
-    def decide_move(self, board: Board):
-        """Decide move using 2-ply minimax with alpha-beta pruning."""
-        return find_best_move(board, self.color, 2, evaluate_position_mobility)
+    """2-ply minimax with alpha-beta pruning and mobility evaluation."""
+    depth = 2
+    evaluate_position = staticmethod(evaluate_position_mobility)
+
+    def __init__(self, name: str = None, color: str = None, image: str = None, engine: str = None):
+        super().__init__(name=name or "Barrow of Monkeys", color=color, image=image or "barrowofmonkeys.png", engine=engine)
 
 class BetterMinimaxBotTwo(MinimaxBot):
-    def __init__(self, name: str = None, color: str = None, image: str = None):
-        super().__init__(name=name or "Gigantopithecus", color=color, image=image or "gigantopithecus.png")
-    
-    def decide_move(self, board: Board):
-        """Decide move using 2-ply minimax with alpha-beta pruning."""
-        return find_best_move(board, self.color, 2, evaluate_position_safety) 
\ No newline at end of file
+    """2-ply minimax with alpha-beta pruning and king safety evaluation."""
+    depth = 2
+    evaluate_position = staticmethod(evaluate_position_safety)
+
+    def __init__(self, name: str = None, color: str = None, image: str = None, engine: str = None):
+        super().__init__(name=name or "Gigantopithecus", color=color, image=image or "gigantopithecus.png", engine=engine)
+
+class SilverbackBot(MinimaxBot):
+    """
+    Deep negamax search with null-move pruning, late-move reductions and a
+    quiescence search of captures, deepening up to 6 plies within a
+    one-second budget.
+    """
+    depth = 6
+    evaluate_position = staticmethod(evaluate_position_safety)
+    search_options = SearchOptions(null_move=True, late_move_reductions=True, quiescence=True, time_limit=1.0)
+
+    def __init__(self, name: str = None, color: str = None, image: str = None, engine: str = None):
+        super().__init__(name=name or "Silverback", color=color, image=image or "default_player.png", engine=engine or 'pvs')
+
+# Maps the bot ids used by the API and front-end to their classes.
+# Lives here (rather than in api.py) so headless tools can use it without Flask.
+BOT_REGISTRY = {
+    "white_idiot": WhiteIdiotBot,
+    "black_idiot": BlackIdiotBot,
+    "pongo": GreedyBot,
+    "borzoi": MinimaxBot,
+    "barrowofmonkeys": BetterMinimaxBotOne,
+    "gigantopithecus": BetterMinimaxBotTwo,
+    "silverback": SilverbackBot,
+    # Add others here
+}
@@ -0,0 +1,120 @@
+"""
+Removal of abandoned games.
+
+A game is abandoned when it is still active but has not been touched for a
+timeout. Cleanup deletes such games in batches with one set-based DELETE per
+table, so each transaction holds its locks briefly however many games have
+piled up, and drops the same games from memory (app.config["games"], bot jobs
+and pondering) in the same pass.
+
+CleanupScheduler runs it in a daemon thread every CLEANUP_INTERVAL_SECONDS;
+POST /api/cleanup-abandoned runs it on demand.
+"""
+import threading
+from datetime import datetime, timedelta, UTC
+from typing import Iterable, Optional
+
+from app.logs import get_logger
+from app.models import db, Game, BoardState, Move
+from app.pondering import get_ponderer
+
+DEFAULT_BATCH_SIZE = 500
+
+logger = get_logger("cleanup")
+
+
+def purge_in_memory(app, session_ids: Iterable) -> int:
+    """Forget deleted games in memory: cached managers, running bot jobs and pondered answers."""
+    games = app.config.get("games", {})
+    runner = app.extensions.get('bot_jobs')
+    ponderer = get_ponderer(app)
+    purged = 0
+    for session_id in map(str, session_ids):
+        if games.pop(session_id, None) is not None:
+            purged += 1
+        if runner:
+            runner.cancel_session(session_id)
+        if ponderer:
+            ponderer.forget(session_id)
+    return purged
+
+
+def cleanup_abandoned_games(app, timeout_minutes: float, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Delete active games idle for longer than timeout_minutes.
+
+    Must run inside an app context. Each batch selects at most batch_size
+    game IDs and deletes their moves, board states and the games themselves
+    with three statements in one transaction.
+
+    Returns:
+        The number of games deleted
+    """
+    cutoff = datetime.now(UTC) - timedelta(minutes=timeout_minutes)
+    deleted = 0
+    while True:
+        session_ids = [row[0] for row in db.session.query(Game.session_id).filter(
+            Game.game_status == "active",
+            Game.last_active < cutoff
+        ).limit(batch_size)]
+        if not session_ids:
+            break
+        try:
+            Move.query.filter(Move.session_id.in_(session_ids)).delete(synchronize_session=False)
+            BoardState.query.filter(BoardState.session_id.in_(session_ids)).delete(synchronize_session=False)
+            Game.query.filter(Game.session_id.in_(session_ids)).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        purge_in_memory(app, session_ids)
+        deleted += len(session_ids)
+    return deleted
+
+
+class CleanupScheduler:
+    """Daemon thread that runs cleanup_abandoned_games every interval_seconds."""
+
+    def __init__(self, app, interval_seconds: float, timeout_minutes: float, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.app = app
+        self.interval_seconds = interval_seconds
+        self.timeout_minutes = timeout_minutes
+        self.batch_size = batch_size
+        self.runs = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="game-cleanup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                with self.app.app_context():
+                    deleted = cleanup_abandoned_games(self.app, self.timeout_minutes, self.batch_size)
+                if deleted:
+                    logger.info("abandoned games deleted", extra={'deleted': deleted})
+            except Exception:
+                logger.exception("abandoned game cleanup failed")
+            self.runs += 1
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+
+def start_cleanup_scheduler(app) -> Optional[CleanupScheduler]:
+    """Start the app's cleanup thread unless CLEANUP_INTERVAL_SECONDS is 0; the idle timeout is GAME_SESSION_TIMEOUT."""
+    interval = app.config.get('CLEANUP_INTERVAL_SECONDS', 0)
+    if interval <= 0:
+        return None
+    scheduler = CleanupScheduler(
+        app,
+        interval_seconds=interval,
+        timeout_minutes=app.config.get('GAME_SESSION_TIMEOUT', 3600) / 60,
+        batch_size=app.config.get('CLEANUP_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    ).start()
+    app.extensions['cleanup_scheduler'] = scheduler
+    return scheduler
@@ -1,6 +1,92 @@
+import base64
+import threading
+from array import array
+
 from app.board import Board
 from app.player import HumanPlayer
-from app.bots import WhiteIdiotBot, BlackIdiotBot
+from app.metrics import timed
+from app.move_encoding import decode_game_record, decode_move, encode_game_record, encode_move
+from pieces import Pawn, Queen
+
+def serialize_piece(piece):
+    """JSON form of a square's contents as sent to the client."""
+    if piece is None:
+        return None
+    return {
+        'type': piece.__class__.__name__,
+        'color': piece.color,
+        'symbol': piece.symbol()
+    }
+
+class GameStatus:
+    """
+    Result of evaluating the position for the side to move.
+
+    state is one of 'active', 'check', 'checkmate' or 'draw'; winner is set
+    for checkmate and draw_reason for draws. message is the human-readable
+    string returned by GameManager.get_game_status().
+    """
+
+    def __init__(self, state, turn, winner=None, draw_reason=None):
+        self.state = state
+        self.turn = turn
+        self.winner = winner
+        self.draw_reason = draw_reason
+
+    @property
+    def is_over(self):
+        return self.state in ('checkmate', 'draw')
+
+    @property
+    def in_check(self):
+        return self.state in ('check', 'checkmate')
+
+    @property
+    def message(self):
+        if self.state == 'checkmate':
+            return f"Checkmate! {self.winner.capitalize()} wins."
+        if self.state == 'draw':
+            return f"Draw by {self.draw_reason}."
+        if self.state == 'check':
+            return f"{self.turn.capitalize()} is in check."
+        return "active"
+
+    def to_dict(self):
+        return {
+            'state': self.state,
+            'winner': self.winner,
+            'draw_reason': self.draw_reason,
+            'in_check': self.in_check,
+            'game_over': self.is_over,
+            'message': self.message
+        }
+
+    @classmethod
+    def evaluate(cls, board, color):
+        """
+        Compute the status of a position in one pass: one check test and one
+        early-exit search for a legal move. Draw reasons are tested in the
+        same priority as Board.get_draw_reason().
+        """
+        in_check = board.is_in_check(color)
+        has_moves = board.has_any_valid_moves(color)
+        if in_check and not has_moves:
+            return cls('checkmate', color, winner='black' if color == 'white' else 'white')
+
+        if not has_moves:
+            reason = "stalemate"
+        elif board.is_fifty_move_rule():
+            reason = "50-move rule"
+        elif board.is_threefold_repetition():
+            reason = "threefold repetition"
+        elif board.is_insufficient_material():
+            reason = "insufficient material"
+        else:
+            reason = None
+
+        if reason:
+            return cls('draw', color, draw_reason=reason)
+        return cls('check' if in_check else 'active', color)
 
 class GameManager:
     def __init__(self):
@@ -8,7 +94,13 @@ class GameManager:
         self.board.setup_standard_position()
         self.current_turn = 'white'
         self.players = {'white': None, 'black': None}
-        self.move_history = []  # List of tuples (from_pos, to_pos, color)
+        self.moves = array('H')  # 16-bit encoded moves (app/move_encoding.py), one per ply
+        self.first_color = 'white'  # Color that played moves[0]
+        self._status_cache = None  # (position key, GameStatus)
+        self.ply_changes = []  # Squares changed by each ply, aligned with the end of move_history
+        self._etag_cache = None  # (version, etag)
+        self._board_payload_cache = None  # (version, serialized /api/board response)
+        self.lock = threading.Lock()  # Held by make_move and by readers that need a consistent position
 
     def set_players(self, white_player, black_player):
         self.players['white'] = white_player
@@ -20,40 +112,149 @@ class GameManager:
     def switch_turn(self):
         self.current_turn = 'black' if self.current_turn == 'white' else 'white'
 
+    def status(self):
+        """
+        Return the GameStatus of the current position.
+
+        The result is memoized on the position hash together with the state
+        the draw rules depend on, so repeated calls for the same position
+        (several per request) cost one hash computation.
+        """
+        key = (
+            self.board.position_hash(self.current_turn),
+            self.board.is_fifty_move_rule(),
+            self.board.is_threefold_repetition()
+        )
+        if self._status_cache is None or self._status_cache[0] != key:
+            with timed('status'):
+                self._status_cache = (key, GameStatus.evaluate(self.board, self.current_turn))
+        return self._status_cache[1]
+
     def is_game_over(self):
-        return self.board.is_checkmate(self.current_turn) or self.board.is_draw(self.current_turn)
+        return self.status().is_over
 
     def get_game_status(self):
-        if self.board.is_checkmate(self.current_turn):
-            return f"Checkmate! {self.opposite_color(self.current_turn).capitalize()} wins."
-        elif self.board.is_draw(self.current_turn):
-            reason = self.board.get_draw_reason(self.current_turn)
-            return f"Draw by {reason}."
-        elif self.board.is_in_check(self.current_turn):
-            return f"{self.current_turn.capitalize()} is in check."
-        return "active"
+        return self.status().message
 
     def make_move(self, from_pos, to_pos, promotion_piece_cls=None):
+        with self.lock:
+            return self._make_move(from_pos, to_pos, promotion_piece_cls)
+
+    def _make_move(self, from_pos, to_pos, promotion_piece_cls):
         piece = self.board.get_piece_at(from_pos)
         if not piece or piece.color != self.current_turn:
             return False
 
-        success = self.board.move_piece(from_pos, to_pos, promotion_piece_cls=promotion_piece_cls)
+        # Validate against the cached legal move list
+        if not self.is_legal_move(from_pos, to_pos):
+            return False
+        if isinstance(piece, Pawn) and to_pos[0] in (0, 7):
+            promotion_piece_cls = promotion_piece_cls or Queen
+        before = [row[:] for row in self.board.grid]
+        success = self.board.move_piece(from_pos, to_pos, promotion_piece_cls=promotion_piece_cls, validate=False)
         if success:
-            # Record the move in history with the color of the piece that made the move
-            self.move_history.append({
-                'from': from_pos,
-                'to': to_pos,
-                'color': self.current_turn  # Store the color of the piece that made the move
-            })
+            self.ply_changes.append([
+                (row, col) for row in range(8) for col in range(8)
+                if self.board.grid[row][col] is not before[row][col]
+            ])
+            if not self.moves:
+                self.first_color = self.current_turn
+            self.moves.append(encode_move(from_pos, to_pos, promotion_piece_cls))
             self.switch_turn()
         return success
 
+    def history_slice(self, start=0):
+        """Moves from ply start onwards as dicts {'from', 'to', 'color'}; colors alternate from first_color."""
+        colors = (self.first_color, self.opposite_color(self.first_color))
+        history = []
+        for ply in range(start, len(self.moves)):
+            from_pos, to_pos, _ = decode_move(self.moves[ply])
+            history.append({'from': from_pos, 'to': to_pos, 'color': colors[ply % 2]})
+        return history
+
+    @property
+    def move_history(self):
+        """Full move history as dicts, decoded from the compact moves array."""
+        return self.history_slice()
+
+    @move_history.setter
+    def move_history(self, history):
+        self.moves = array('H', (encode_move(move['from'], move['to']) for move in history))
+        self.first_color = history[0]['color'] if history else 'white'
+
+    def move_record(self):
+        """Binary game record of the moves played (see app/move_encoding.py)."""
+        return encode_game_record(self.moves, self.first_color)
+
+    @property
+    def version(self):
+        """State version seen by clients: the number of plies played."""
+        return len(self.moves)
+
+    def etag(self):
+        """
+        Entity tag for the current state, built from the position hash and
+        the version. It is computed once per version, so checking a client's
+        If-None-Match does not touch the board.
+        """
+        if self._etag_cache is None or self._etag_cache[0] != self.version:
+            self._etag_cache = (self.version, f"{self.board.position_hash(self.current_turn):016x}-{self.version}")
+        return self._etag_cache[1]
+
+    def board_payload(self, serialize):
+        """
+        The serialized full /api/board response for the current state.
+        serialize() builds it and is called once per version; later calls
+        for the same version return the cached result.
+        """
+        if self._board_payload_cache is None or self._board_payload_cache[0] != self.version:
+            self._board_payload_cache = (self.version, serialize())
+        return self._board_payload_cache[1]
+
+    def changed_squares_since(self, version):
+        """
+        Return the sorted squares whose contents changed after the given
+        version, or None if that version is unknown (e.g. older than the
+        changes recorded since the game was reloaded).
+        """
+        first_known = self.version - len(self.ply_changes)
+        if version is None or not first_known <= version <= self.version:
+            return None
+        squares = set()
+        for changes in self.ply_changes[version - first_known:]:
+            squares.update(changes)
+        return sorted(squares)
+
+    def delta_since(self, version):
+        """
+        Changes a client at the given version needs to catch up: the new
+        contents of changed squares and the moves played since. Returns None
+        when a full board has to be sent instead.
+        """
+        squares = self.changed_squares_since(version)
+        if squares is None:
+            return None
+        return {
+            'changes': [
+                {'position': [row, col], 'piece': serialize_piece(self.board.grid[row][col])}
+                for row, col in squares
+            ],
+            'new_moves': self.history_slice(version)
+        }
+
+    def board_state(self):
+        """Full 8x8 board in the serialized form sent to clients."""
+        return [[serialize_piece(piece) for piece in row] for row in self.board.grid]
+
+    def legal_moves(self):
+        """All legal moves for the side to move as {from_pos: [to_pos, ...]}, cached per position."""
+        return self.board.legal_moves(self.current_turn)
+
+    def is_legal_move(self, from_pos, to_pos):
+        return tuple(to_pos) in self.legal_moves().get(tuple(from_pos), ())
+
     def get_valid_moves(self, position):
-        piece = self.board.get_piece_at(position)
-        if piece and piece.color == self.current_turn:
-            return piece.get_valid_moves(self.board)
-        return []
+        return list(self.legal_moves().get(tuple(position), []))
 
     def opposite_color(self, color):
         return 'black' if color == 'white' else 'white'
@@ -63,23 +264,8 @@ class GameManager:
 
     def to_dict(self):
         """Convert game state to a dictionary for serialization"""
-        # Convert board to serializable format
-        board_state = []
-        for row in self.board.grid:
-            row_data = []
-            for piece in row:
-                if piece is None:
-                    row_data.append(None)
-                else:
-                    row_data.append({
-                        'type': piece.__class__.__name__,
-                        'color': piece.color,
-                        'symbol': piece.symbol()
-                    })
-            board_state.append(row_data)
-
         return {
-            'board': board_state,
+            'board': self.board_state(),
             'current_turn': self.current_turn,
             'players': {
                 'white': {
@@ -93,47 +279,31 @@ class GameManager:
                     'color': self.players['black'].color
                 }
             },
-            'move_history': self.move_history  # Include move history in serialization
+            'move_record': base64.b64encode(self.move_record()).decode('ascii')
         }
 
     @classmethod
     def from_dict(cls, data):
-        """Create a GameManager instance from a dictionary"""
-        manager = cls()
-        manager.current_turn = data['current_turn']
-        manager.move_history = data.get('move_history', [])  # Restore move history
-        
-        # Restore board state
-        from pieces import Pawn, Rook, Knight, Bishop, Queen, King
-        piece_classes = {
-            'Pawn': Pawn,
-            'Rook': Rook,
-            'Knight': Knight,
-            'Bishop': Bishop,
-            'Queen': Queen,
-            'King': King
-        }
-        
-        for row in range(8):
-            for col in range(8):
-                piece_data = data['board'][row][col]
-                if piece_data:
-                    piece_class = piece_classes[piece_data['type']]
-                    piece = piece_class(piece_data['color'])
-                    manager.board.place_piece(piece, (row, col))
-
-        # Restore players
-        white_data = data['players']['white']
-        black_data = data['players']['black']
-
-        if white_data['type'] == 'human':
-            manager.players['white'] = HumanPlayer(name=white_data['name'], color=white_data['color'])
-        else:
-            manager.players['white'] = WhiteIdiotBot()
+        """
+        Create a GameManager instance from a dictionary.
 
-        if black_data['type'] == 'human':
-            manager.players['black'] = HumanPlayer(name=black_data['name'], color=black_data['color'])
-        else:
-            manager.players['black'] = BlackIdiotBot()
+        Like games loaded from the database (app/rehydrate.py), the move record
+        is replayed from the starting position, so castling rights, en passant
+        and repetition history are restored and bots keep their class.
+        Dictionaries without a move record only restore the pieces.
+        """
+        from app.rehydrate import replay_moves, restore_from_snapshot, restore_player
 
+        manager = cls()
+        manager.set_players(*(
+            restore_player(data['players'][color]['type'], data['players'][color]['name'], color)
+            for color in ('white', 'black')
+        ))
+        if data.get('move_record'):
+            moves, manager.current_turn = decode_game_record(base64.b64decode(data['move_record']))
+            return replay_moves(manager, moves)
+
+        restore_from_snapshot(manager, data['board'])
+        manager.current_turn = data['current_turn']
+        manager.move_history = data.get('move_history', [])
         return manager
@@ -0,0 +1,123 @@
+"""
+Structured, non-blocking logging.
+
+Modules log through get_logger() with fields passed as `extra`:
+
+    logger.info("game created", extra={'session_id': sid, 'bot': name})
+
+configure_logging() routes the "idiotchess" logger through a QueueHandler,
+so request threads only enqueue records; a QueueListener thread formats
+them (as JSON lines by default) and writes them out. Per-move DEBUG events
+are sampled: only LOG_DEBUG_SAMPLE_RATE of them are kept, while INFO and
+above always pass. Every record's extra fields are emitted as top-level
+JSON keys, so session_id and *_ms timings can be aggregated.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT_LOGGER = "idiotchess"
+
+# Attributes every LogRecord has; anything else came from `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module, e.g. get_logger("api") -> "idiotchess.api"."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """The extra fields attached to a record."""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the record's extra fields."""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(record_fields(record))
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the extra fields appended as key=value."""
+
+    def format(self, record):
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        fields = record_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        return line
+
+
+class _RecordQueueHandler(QueueHandler):
+    """QueueHandler that keeps extra fields and passes tracebacks as exc_text."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def stop_listener(listener: QueueListener):
+    """Flush and stop a listener; stopping twice is a no-op."""
+    if listener._thread is not None:
+        listener.stop()
+
+
+class DebugSampler(logging.Filter):
+    """Keep every record above DEBUG and a random sample_rate share of DEBUG records."""
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.sample_rate
+
+
+def configure_logging(level: str = 'INFO', fmt: str = 'json', debug_sample_rate: float = 0.01, stream=None) -> QueueListener:
+    """
+    Send "idiotchess" logs through a queue to a background writer thread.
+    Returns the started listener (stopped automatically at exit).
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+            stop_listener(handler.listener)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter() if fmt == 'json' else TextFormatter())
+
+    records = queue.SimpleQueue()
+    handler = _RecordQueueHandler(records)
+    handler.addFilter(DebugSampler(debug_sample_rate))  # Dropped before they are queued
+    handler.listener = QueueListener(records, output, respect_handler_level=False)
+
+    logger.addHandler(handler)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    handler.listener.start()
+    atexit.register(stop_listener, handler.listener)
+    return handler.listener
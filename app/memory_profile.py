@@ -0,0 +1,204 @@
+"""
+Memory profiling of in-memory games and bot searches.
+
+Two measurements answer "what is the worker's memory made of?":
+
+    game_footprint()  deep size of one GameManager, split into components
+                      (pieces and grid, Board.history, captured pieces, move
+                      record, caches, players)
+    search_memory()   peak bytes allocated while a decide_move() runs, from
+                      tracemalloc; recorded per bot class in SEARCH_MEMORY
+
+With MEMORY_PROFILING enabled, create_app() starts tracemalloc and
+memory_report() also groups everything allocated since then by subsystem
+(board, search, game, api, database, web), attributed to the file of the
+innermost traced frame. GET /api/admin/memory serves the report and
+utils/profile_memory.py measures the same things offline.
+
+tracemalloc slows allocation-heavy code severalfold and its peak is
+process-wide, so search peaks include whatever other threads allocated
+meanwhile: profile with BOT_WORKERS=1 and without pondering for exact numbers.
+"""
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Dict, Optional
+
+# Path fragments identifying each subsystem; the first match wins, anything else is 'other'
+SUBSYSTEMS = (
+    ('board', ('app/board.py', 'pieces/', 'utils/board_sim.py')),
+    ('search', ('app/minimax_search.py', 'app/negamax_search.py', 'app/move_scoring.py', 'app/position_evaluation.py',
+                'app/search_stats.py', 'app/bots.py', 'app/tablebase.py', 'app/opening_book.py', 'app/zobrist.py')),
+    ('game', ('app/game.py', 'app/move_encoding.py', 'app/rehydrate.py')),
+    ('api', ('app/api.py', 'app/bot_jobs.py', 'app/pondering.py', 'app/metrics.py', 'app/logs.py')),
+    ('database', ('sqlalchemy/', 'flask_sqlalchemy/', 'psycopg2/', 'sqlite3/', 'app/models.py', 'app/storage.py')),
+    ('web', ('flask/', 'werkzeug/', 'jinja2/', 'json/')),
+)
+
+# Shared, immutable or global objects never counted as part of a game
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, type(None), bool)
+
+
+def subsystem_of(filename: str) -> str:
+    path = filename.replace('\\', '/')
+    for name, fragments in SUBSYSTEMS:
+        if any(fragment in path for fragment in fragments):
+            return name
+    return 'other'
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """Bytes used by obj and everything it references that is not already in seen."""
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIPPED_TYPES):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, '__dict__'):
+            stack.append(vars(current))
+        for slot in getattr(type(current), '__slots__', ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return size
+
+
+def game_footprint(manager) -> Dict[str, int]:
+    """Deep size of a GameManager by component, plus 'total'; shared objects are counted once."""
+    board = manager.board
+    seen = set()
+    components = {
+        'pieces': deep_sizeof(board.grid, seen),
+        'history': deep_sizeof(board.history, seen),
+        'captured': deep_sizeof(board.captured_pieces, seen),
+        'moves': deep_sizeof(manager.moves, seen) + deep_sizeof(manager.ply_changes, seen),
+        'caches': sum(deep_sizeof(cache, seen) for cache in (
+            board._legal_moves_cache, manager._status_cache, manager._etag_cache, manager._board_payload_cache)),
+        'players': deep_sizeof(manager.players, seen),
+    }
+    components['other'] = deep_sizeof(manager, seen)  # Remaining attributes and the objects themselves
+    components['total'] = sum(components.values())
+    return components
+
+
+class SearchMemory:
+    """Peak allocation of the decide_move() calls of one bot class."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_peak = 0
+        self.max_peak = 0
+        self.last_peak = 0
+
+    def observe(self, peak: int):
+        self.count += 1
+        self.total_peak += peak
+        self.max_peak = max(self.max_peak, peak)
+        self.last_peak = peak
+
+    def to_dict(self) -> dict:
+        return {
+            'searches': self.count,
+            'mean_peak_bytes': self.total_peak // self.count if self.count else 0,
+            'max_peak_bytes': self.max_peak,
+            'last_peak_bytes': self.last_peak
+        }
+
+
+class SearchMemoryRegistry:
+    def __init__(self):
+        self.bots: Dict[str, SearchMemory] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, bot: str, peak: int):
+        with self._lock:
+            self.bots.setdefault(bot, SearchMemory()).observe(peak)
+
+    def reset(self):
+        with self._lock:
+            self.bots.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {bot: memory.to_dict() for bot, memory in sorted(self.bots.items())}
+
+
+SEARCH_MEMORY = SearchMemoryRegistry()
+
+
+@contextmanager
+def search_memory(bot: str):
+    """
+    Measure the block's peak allocation while tracemalloc is tracing and
+    record it under bot. Yields a dict that receives 'peak_bytes' and
+    'retained_bytes' on exit; a no-op when not tracing.
+    """
+    sample = {}
+    if not tracemalloc.is_tracing():
+        yield sample
+        return
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    try:
+        yield sample
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        sample['peak_bytes'] = max(0, peak - before)
+        sample['retained_bytes'] = current - before
+        SEARCH_MEMORY.observe(bot, sample['peak_bytes'])
+
+
+def start_memory_profiling(frames: int = 1):
+    """Start tracemalloc (if not already tracing) keeping frames frames per allocation."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def subsystem_usage(snapshot: tracemalloc.Snapshot, top: int = 10) -> dict:
+    """Traced bytes per subsystem and the top allocation sites of a snapshot."""
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)))
+    subsystems = {}
+    for stat in snapshot.statistics('filename'):
+        name = subsystem_of(stat.traceback[0].filename)
+        subsystems[name] = subsystems.get(name, 0) + stat.size
+    sites = [{'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+              'bytes': stat.size, 'count': stat.count} for stat in snapshot.statistics('lineno')[:top]]
+    return {'subsystems': dict(sorted(subsystems.items(), key=lambda item: -item[1])), 'top_allocations': sites}
+
+
+def memory_report(games: dict, top: int = 10) -> dict:
+    """Per-game footprints of the in-memory games, search peaks and, when tracing, usage by subsystem."""
+    footprints = {session_id: game_footprint(manager) for session_id, manager in list(games.items())}
+    components = {}
+    for footprint in footprints.values():
+        for name, size in footprint.items():
+            components[name] = components.get(name, 0) + size
+    count = len(footprints)
+    largest = max(footprints.items(), key=lambda item: item[1]['total'], default=None)
+
+    report = {
+        'tracing': tracemalloc.is_tracing(),
+        'games': {
+            'count': count,
+            'total_bytes': components.get('total', 0),
+            'bytes_per_game': components.get('total', 0) // count if count else 0,
+            'components_per_game': {name: size // count for name, size in components.items() if name != 'total'},
+            'largest': {'session_id': largest[0], 'bytes': largest[1]['total']} if largest else None
+        },
+        'searches': SEARCH_MEMORY.to_dict()
+    }
+    if report['tracing']:
+        current, peak = tracemalloc.get_traced_memory()
+        report['traced'] = {'current_bytes': current, 'peak_bytes': peak}
+        report.update(subsystem_usage(tracemalloc.take_snapshot(), top))
+    return report
@@ -0,0 +1,247 @@
+"""
+Request timing and Prometheus metrics.
+
+Every request to the api blueprint is timed, and the time spent in
+instrumented phases is recorded alongside the total:
+
+    db           SQL statements (SQLAlchemy cursor events)
+    decide_move  bot searches
+    status       GameManager.status() evaluations
+    serialize    JSON encoding of responses
+
+Phase time is accumulated per request through a context variable. Code that
+runs outside a request (bot job and ponder threads) records under its own
+endpoint label instead. GET /metrics serves the histograms in the Prometheus
+text format.
+
+With PROFILE_SLOW_REQUESTS_MS set, requests run under cProfile and the
+profile of any request slower than that is written to PROFILE_DIR, to be
+read with `python -m pstats` or snakeviz.
+"""
+import cProfile
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from flask import g, request
+from flask.json.provider import DefaultJSONProvider
+
+from app.logs import get_logger
+
+# Upper bounds in seconds, Prometheus style; +Inf is implicit
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PHASES = ('db', 'decide_move', 'status', 'serialize')
+
+logger = get_logger("requests")
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound label, cumulative count) pairs ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+
+class MetricsRegistry:
+    """Request latency and phase histograms, keyed by their label values."""
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, str], Histogram] = {}  # (endpoint, method, status)
+        self.phases: Dict[Tuple[str, str], Histogram] = {}  # (endpoint, phase)
+        self.slow_profiles = 0
+        self._lock = threading.Lock()
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float):
+        key = (endpoint, method, str(status))
+        with self._lock:
+            histogram = self.requests.get(key) or self.requests.setdefault(key, Histogram())
+            histogram.observe(seconds)
+
+    def observe_phase(self, endpoint: str, phase: str, seconds: float):
+        key = (endpoint, phase)
+        with self._lock:
+            histogram = self.phases.get(key) or self.phases.setdefault(key, Histogram())
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.phases.clear()
+            self.slow_profiles = 0
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            self._render_histograms(lines, 'idiotchess_request_duration_seconds',
+                                    'Time spent handling API requests.',
+                                    ('endpoint', 'method', 'status'), self.requests)
+            self._render_histograms(lines, 'idiotchess_request_phase_seconds',
+                                    'Time spent per request in each phase (db, decide_move, status, serialize).',
+                                    ('endpoint', 'phase'), self.phases)
+            lines.append('# HELP idiotchess_slow_request_profiles_total Profiles written for slow requests.')
+            lines.append('# TYPE idiotchess_slow_request_profiles_total counter')
+            lines.append(f'idiotchess_slow_request_profiles_total {self.slow_profiles}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histograms(lines, name, help_text, label_names, histograms):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for values, histogram in sorted(histograms.items()):
+            labels = ','.join(f'{label}="{value}"' for label, value in zip(label_names, values))
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+
+METRICS = MetricsRegistry()
+
+# Phase totals of the request being handled in this context, or None outside requests
+_request_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar('request_phases', default=None)
+
+
+def add_phase_time(phase: str, seconds: float, endpoint: str = 'background'):
+    """Add time to a phase of the current request, or record it under endpoint outside a request."""
+    phases = _request_phases.get()
+    if phases is None:
+        METRICS.observe_phase(endpoint, phase, seconds)
+    else:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str, endpoint: str = 'background'):
+    """Time a block as the given phase (see add_phase_time)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase_time(phase, time.perf_counter() - start, endpoint)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that records encoding time as the serialize phase."""
+
+    def dumps(self, obj, **kwargs):
+        with timed('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
+def _start_request_timer():
+    g.metrics_start = time.perf_counter()
+    g.metrics_token = _request_phases.set({})
+    g.metrics_profiler = None
+    if g.get('profile_threshold'):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.metrics_profiler = profiler
+        except ValueError:
+            pass  # Another profiler is active on this thread
+
+
+def _note_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+def _finish_request_timer(app, exc=None):
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    status = g.pop('metrics_status', 500 if exc else 200)
+    phases = _request_phases.get() or {}
+    _request_phases.reset(g.pop('metrics_token'))
+
+    METRICS.observe_request(endpoint, request.method, status, elapsed)
+    for phase, seconds in phases.items():
+        METRICS.observe_phase(endpoint, phase, seconds)
+    if logger.isEnabledFor(logging.DEBUG):
+        fields = {f"{phase}_ms": round(seconds * 1000, 2) for phase, seconds in phases.items()}
+        logger.debug("request", extra={
+            'endpoint': endpoint, 'method': request.method, 'status': status,
+            'duration_ms': round(elapsed * 1000, 2), 'session_id': _session_id(), **fields
+        })
+
+    profiler = g.pop('metrics_profiler', None)
+    if profiler:
+        profiler.disable()
+        if elapsed * 1000 >= g.profile_threshold:
+            _write_profile(app, profiler, endpoint, elapsed)
+
+
+def _session_id():
+    session_id = request.args.get('session_id')
+    if session_id is None and request.is_json:
+        session_id = (request.get_json(silent=True) or {}).get('session_id')
+    return session_id
+
+
+def _write_profile(app, profiler, endpoint, elapsed):
+    directory = app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+    os.makedirs(directory, exist_ok=True)
+    name = endpoint.strip('/').replace('/', '_').replace('<', '').replace('>', '') or 'root'
+    path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{elapsed * 1000:.0f}ms.prof")
+    profiler.dump_stats(path)
+    with METRICS._lock:
+        METRICS.slow_profiles += 1
+
+
+def init_metrics(blueprint):
+    """Time every request of the blueprint (call before registering it)."""
+    from flask import current_app
+
+    @blueprint.before_request
+    def start_timer():
+        g.profile_threshold = current_app.config.get('PROFILE_SLOW_REQUESTS_MS', 0)
+        _start_request_timer()
+
+    blueprint.after_request(_note_status)
+
+    @blueprint.teardown_request
+    def finish_timer(exc=None):
+        _finish_request_timer(current_app, exc)
+
+
+def instrument_app(app, db=None):
+    """Time JSON encoding and, when a database is configured, SQL statements."""
+    app.json = TimedJSONProvider(app)
+    if db is None:
+        return
+    from sqlalchemy import event
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        add_phase_time('db', time.perf_counter() - conn.info['metrics_query_start'].pop())
@@ -1,6 +1,18 @@
 from app.board import Board
+from app.search_stats import SearchStats
+from app.opening_book import probe_book
+from app.tablebase import best_move as tablebase_move, tablebase_score
+from contextvars import ContextVar
 from typing import Callable, Tuple, Optional
 import random
+import threading
+import time
+
+class SearchCancelled(Exception):
+    """Raised from inside a search whose cancel event has been set."""
+
+# Event checked at every node; set per worker thread by cancellable callers (see app/bot_jobs.py)
+search_cancel_event: ContextVar[Optional[threading.Event]] = ContextVar("search_cancel_event", default=None)
 
 def minimax_search(
     board: Board,
@@ -9,7 +21,9 @@ def minimax_search(
     evaluate_position: Callable[[Board, str], float],
     alpha: float = float('-inf'),
     beta: float = float('inf'),
-    maximizing_player: bool = True
+    maximizing_player: bool = True,
+    stats: Optional[SearchStats] = None,
+    ply: int = 1
 ) -> float:
     """
     Minimax algorithm with alpha-beta pruning.
@@ -22,50 +36,99 @@ def minimax_search(
         alpha: Alpha value for pruning
         beta: Beta value for pruning
         maximizing_player: Whether the current player is maximizing
+        stats: Optional SearchStats filled in with node and cutoff counts and the principal variation
+        ply: Distance from the root, used to index the principal variation
         
     Returns:
         float: Best evaluation score
+
+    Raises:
+        SearchCancelled: If the search_cancel_event of the current context is set
     """
+    if stats is not None:
+        stats.nodes += 1
+        stats.clear_pv(ply)
+
+    cancel_event = search_cancel_event.get()
+    if cancel_event is not None and cancel_event.is_set():
+        raise SearchCancelled()
+
     if depth == 0:
+        # Small endings are scored exactly from the tablebases when available
+        to_move = color if maximizing_player else ('black' if color == 'white' else 'white')
+        tb_score = tablebase_score(board, to_move)
+        if tb_score is not None:
+            return tb_score if to_move == color else -tb_score
         return evaluate_position(board, color)
-    
-    if maximizing_player:
-        max_eval = float('-inf')
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece_at((row, col))
-                if piece and piece.color == color:
-                    for move in piece.get_valid_moves(board):
-                        test_board = board.copy()
-                        if test_board.move_piece((row, col), move):
-                            eval = minimax_search(test_board, depth - 1, color, evaluate_position, alpha, beta, False)
-                            max_eval = max(max_eval, eval)
-                            alpha = max(alpha, eval)
-                            if beta <= alpha:
-                                break
-        return max_eval
-    else:
-        min_eval = float('inf')
-        opponent_color = 'black' if color == 'white' else 'white'
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece_at((row, col))
-                if piece and piece.color == opponent_color:
-                    for move in piece.get_valid_moves(board):
-                        test_board = board.copy()
-                        if test_board.move_piece((row, col), move):
-                            eval = minimax_search(test_board, depth - 1, color, evaluate_position, alpha, beta, True)
-                            min_eval = min(min_eval, eval)
-                            beta = min(beta, eval)
-                            if beta <= alpha:
-                                break
-        return min_eval
+
+    if stats is not None:
+        stats.interior_nodes += 1
+    mover = color if maximizing_player else ('black' if color == 'white' else 'white')
+    best_eval = float('-inf') if maximizing_player else float('inf')
+    searched = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board.get_piece_at((row, col))
+            if not piece or piece.color != mover:
+                continue
+            for move in piece.get_valid_moves(board):
+                test_board = board.copy()
+                if not test_board.move_piece((row, col), move):
+                    continue
+                eval = minimax_search(test_board, depth - 1, color, evaluate_position, alpha, beta,
+                                      not maximizing_player, stats, ply + 1)
+                improved = eval > best_eval if maximizing_player else eval < best_eval
+                if improved:
+                    best_eval = eval
+                    if stats is not None:
+                        stats.update_pv(ply, ((row, col), move))
+                if maximizing_player:
+                    alpha = max(alpha, eval)
+                else:
+                    beta = min(beta, eval)
+                searched += 1
+                if beta <= alpha:
+                    # The node is refuted: no other piece's moves need searching
+                    if stats is not None:
+                        stats.children += searched
+                        stats.record_cutoff(searched - 1)
+                    return best_eval
+    if stats is not None:
+        stats.children += searched
+    return best_eval
+
+def book_or_tablebase_move(
+    board: Board,
+    color: str,
+    stats: Optional[SearchStats] = None,
+    use_book: bool = True
+) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """
+    The opening book move (if use_book) or tablebase move for the position,
+    or None when neither covers it and a search is needed. Shared by the
+    search engines; stats is finished with the move's source.
+    """
+    if use_book:
+        book_move = probe_book(board, color)
+        if book_move:
+            if stats is not None:
+                stats.finish('book', [book_move])
+            return book_move
+
+    tb_move = tablebase_move(board, color)
+    if tb_move:
+        if stats is not None:
+            stats.finish('tablebase', [tb_move])
+        return tb_move
+    return None
 
 def find_best_move(
     board: Board,
     color: str,
     depth: int,
-    evaluate_position: Callable[[Board, str], float]
+    evaluate_position: Callable[[Board, str], float],
+    stats: Optional[SearchStats] = None,
+    use_book: bool = True
 ) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
     """
     Find the best move using minimax search.
@@ -75,17 +138,27 @@ def find_best_move(
         color: Color of the player to move
         depth: Search depth
         evaluate_position: Function to evaluate a position
+        stats: Optional SearchStats filled in by the search (see minimax_search)
+        use_book: Play a move from the opening book without searching when the position is in it
         
     Returns:
         Optional[Tuple[Tuple[int, int], Tuple[int, int]]]: Best move as (from_pos, to_pos) or None if no valid moves
     """
+    known_move = book_or_tablebase_move(board, color, stats, use_book)
+    if known_move:
+        return known_move
+
     if board.is_checkmate(color):
+        if stats is not None:
+            stats.finish('search', depth=depth)
         return None
     
     best_score = float('-inf')
     best_moves = []
+    lines = {}  # Principal variation below each root move
     alpha = float('-inf')
     beta = float('inf')
+    start = time.perf_counter()
     
     for row in range(8):
         for col in range(8):
@@ -98,11 +171,18 @@ def find_best_move(
                             continue
                         
                         # Use minimax search to evaluate the position
-                        score = minimax_search(test_board, depth - 1, color, evaluate_position, alpha, beta, False)
+                        score = minimax_search(test_board, depth - 1, color, evaluate_position, alpha, beta, False, stats)
+                        if stats is not None:
+                            lines[((row, col), move)] = stats.line_at(1)
                         if score > best_score:
                             best_score = score
                             best_moves = [((row, col), move)]
                         elif score == best_score:
                             best_moves.append(((row, col), move))
     
-    return random.choice(best_moves) if best_moves else None 
\ No newline at end of file
+    best_move = random.choice(best_moves) if best_moves else None
+    if stats is not None:
+        stats.depth_times[depth] = time.perf_counter() - start
+        pv = [best_move] + lines.get(best_move, []) if best_move else []
+        stats.finish('search', pv, best_score if best_move else None, depth)
+    return best_move
@@ -1,14 +1,23 @@
 from datetime import datetime, UTC
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 import uuid
 
 db = SQLAlchemy()
 
+# Portable column types: native on Postgres, JSON text on SQLite
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
+IntegerArray = db.JSON().with_variant(ARRAY(db.Integer), 'postgresql')
+
 class Game(db.Model):
     __tablename__ = 'games'
+    __table_args__ = (
+        # Abandoned-game cleanup scans active games by last activity
+        db.Index('ix_games_active_last_active', 'last_active', postgresql_where=db.text("game_status = 'active'"),
+                 sqlite_where=db.text("game_status = 'active'")),
+    )
     
-    session_id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC))
     current_turn = db.Column(db.String(5), nullable=False)
     game_status = db.Column(db.String(50), nullable=False)
@@ -17,6 +26,7 @@ class Game(db.Model):
     white_player_name = db.Column(db.String(100))
     black_player_name = db.Column(db.String(100))
     last_active = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC))
+    move_record = db.Column(db.LargeBinary)  # Binary game record, 2 bytes per move (app/move_encoding.py)
     
     # Relationships
     board_states = db.relationship('BoardState', backref='game', lazy=True)
@@ -43,12 +53,15 @@ class Game(db.Model):
 
 class BoardState(db.Model):
     __tablename__ = 'board_states'
+    __table_args__ = (
+        db.Index('ix_board_states_session_move', 'session_id', 'move_number'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(UUID(as_uuid=True), db.ForeignKey('games.session_id'), nullable=False)
+    session_id = db.Column(db.Uuid, db.ForeignKey('games.session_id'), nullable=False)
     move_number = db.Column(db.Integer, nullable=False)
-    board_state = db.Column(JSONB, nullable=False)
-    captured_pieces = db.Column(JSONB)
+    board_state = db.Column(JSONType, nullable=False)
+    captured_pieces = db.Column(JSONType)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC))
     
     def to_dict(self):
@@ -64,12 +77,15 @@ class BoardState(db.Model):
 
 class Move(db.Model):
     __tablename__ = 'moves'
+    __table_args__ = (
+        db.Index('ix_moves_session_move', 'session_id', 'move_number'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(UUID(as_uuid=True), db.ForeignKey('games.session_id'), nullable=False)
+    session_id = db.Column(db.Uuid, db.ForeignKey('games.session_id'), nullable=False)
     move_number = db.Column(db.Integer, nullable=False)
-    from_position = db.Column(db.ARRAY(db.Integer), nullable=False)
-    to_position = db.Column(db.ARRAY(db.Integer), nullable=False)
+    from_position = db.Column(IntegerArray, nullable=False)
+    to_position = db.Column(IntegerArray, nullable=False)
     piece_type = db.Column(db.String(20), nullable=False)
     piece_color = db.Column(db.String(5), nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(UTC))
@@ -0,0 +1,84 @@
+"""
+Compact move encoding and binary game records.
+
+A move fits in 16 bits: from square (bits 0-5), to square (bits 6-11) and
+promotion piece (bits 12-14), with squares numbered row * 8 + col in board
+coordinates. A game record is a short header followed by one big-endian
+16-bit word per ply:
+
+    offset  size  field
+    0       4     magic b"ICGR"
+    4       1     format version (1)
+    5       1     first mover: 0 = white, 1 = black
+    6       4     ply count (big-endian u32)
+    10      2*n   moves
+
+Decoding is a single array.frombytes() call, so a record of hundreds of
+plies is read in microseconds.
+"""
+import struct
+import sys
+from array import array
+from typing import Iterable, Optional, Tuple
+
+from pieces import Bishop, Knight, Queen, Rook
+
+Position = Tuple[int, int]
+
+RECORD_MAGIC = b"ICGR"
+RECORD_VERSION = 1
+RECORD_HEADER = struct.Struct(">4sBBI")
+
+PROMOTION_CODES = {None: 0, Knight: 1, Bishop: 2, Rook: 3, Queen: 4}
+PROMOTION_CLASSES = {code: cls for cls, code in PROMOTION_CODES.items()}
+
+
+def encode_move(from_pos: Position, to_pos: Position, promotion_piece_cls=None) -> int:
+    """Pack a move into 16 bits."""
+    return (
+        (from_pos[0] * 8 + from_pos[1]) |
+        ((to_pos[0] * 8 + to_pos[1]) << 6) |
+        (PROMOTION_CODES[promotion_piece_cls] << 12)
+    )
+
+
+def decode_move(code: int) -> Tuple[Position, Position, Optional[type]]:
+    """Unpack a 16-bit move into (from_pos, to_pos, promotion class or None)."""
+    from_square = code & 0x3F
+    to_square = (code >> 6) & 0x3F
+    return (from_square >> 3, from_square & 7), (to_square >> 3, to_square & 7), PROMOTION_CLASSES[(code >> 12) & 7]
+
+
+def encode_game_record(moves: Iterable[int], first_color: str = 'white') -> bytes:
+    """Build a binary game record from encoded moves."""
+    words = moves if isinstance(moves, array) and moves.typecode == 'H' else array('H', moves)
+    if sys.byteorder == 'little':
+        words = array('H', words)
+        words.byteswap()
+    header = RECORD_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, 0 if first_color == 'white' else 1, len(words))
+    return header + words.tobytes()
+
+
+def decode_game_record(data: bytes) -> Tuple[array, str]:
+    """
+    Read a binary game record.
+
+    Returns:
+        (array('H') of encoded moves, color of the first mover)
+
+    Raises:
+        ValueError: If the data is not a valid record
+    """
+    if len(data) < RECORD_HEADER.size:
+        raise ValueError("Game record is truncated")
+    magic, version, first_mover, count = RECORD_HEADER.unpack_from(data)
+    if magic != RECORD_MAGIC or version != RECORD_VERSION:
+        raise ValueError("Not a game record (bad magic or version)")
+    if len(data) != RECORD_HEADER.size + 2 * count:
+        raise ValueError(f"Game record length does not match its {count} moves")
+
+    moves = array('H')
+    moves.frombytes(data[RECORD_HEADER.size:])
+    if sys.byteorder == 'little':
+        moves.byteswap()
+    return moves, 'white' if first_mover == 0 else 'black'
@@ -1,4 +1,8 @@
 from app.board import Board
+from app.opening_book import probe_book
+from app.search_stats import SearchStats
+from app.tablebase import best_move as tablebase_move
+from pieces import Pawn
 from typing import Optional, Tuple
 import random
 
@@ -12,6 +16,70 @@ PIECE_VALUES = {
     'king': 0  # Don't value king captures as they should be handled by check logic
 }
 
+# The king is only "captured" in exchanges, where recapturing with it onto a defended square must never pay off
+SEE_KING_VALUE = 100
+
+def _exchange_value(piece) -> float:
+    name = piece.__class__.__name__.lower()
+    return SEE_KING_VALUE if name == 'king' else PIECE_VALUES.get(name, 0)
+
+def static_exchange_evaluation(board: Board, from_pos: tuple, to_pos: tuple) -> float:
+    """
+    Static exchange evaluation (SEE) of a move: the material its side wins on
+    to_pos if both sides then keep recapturing there with their least valuable
+    attacker, each free to stop when recapturing would lose material.
+
+    Attackers come from Board.attackers, and pieces uncovered behind a
+    capturer (x-rays) join in. Pins, checks and promotions are ignored. The
+    exchange is played out on the grid in place and undone, so no copy of the
+    board is needed.
+
+    Args:
+        board: Current board state
+        from_pos: The starting position of the move
+        to_pos: The target position of the move (a capture or a quiet move)
+
+    Returns:
+        float: Material won by the move: the victim's value for a free capture,
+            0 for an even trade or a safe quiet move, negative when the moved
+            piece is lost for less than it is worth
+    """
+    grid = board.grid
+    piece = grid[from_pos[0]][from_pos[1]]
+    victim_pos = to_pos
+    if isinstance(piece, Pawn) and from_pos[1] != to_pos[1] and grid[to_pos[0]][to_pos[1]] is None:
+        victim_pos = (from_pos[0], to_pos[1])  # En passant
+    victim = grid[victim_pos[0]][victim_pos[1]]
+
+    # gains[i]: material won by the side making capture i if the exchange stopped after it
+    gains = [_exchange_value(victim) if victim else 0]
+    on_square = _exchange_value(piece)
+    side = 'black' if piece.color == 'white' else 'white'
+    removed = [(from_pos, piece), (victim_pos, victim)]
+    grid[from_pos[0]][from_pos[1]] = None
+    grid[victim_pos[0]][victim_pos[1]] = None
+    try:
+        while True:
+            attackers = board.attackers(to_pos, side)
+            if not attackers:
+                break
+            row, col = min(attackers, key=lambda pos: _exchange_value(grid[pos[0]][pos[1]]))
+            gains.append(on_square - gains[-1])
+            if max(-gains[-2], gains[-1]) < 0:
+                break  # Neither side can change the outcome by going on
+            on_square = _exchange_value(grid[row][col])
+            removed.append(((row, col), grid[row][col]))
+            grid[row][col] = None
+            side = 'black' if side == 'white' else 'white'
+    finally:
+        for (row, col), removed_piece in reversed(removed):
+            grid[row][col] = removed_piece
+
+    # Each side only goes on recapturing when that beats stopping
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+    return gains[0]
+
 def score_move_by_piece_value(board: Board, from_pos: tuple, to_pos: tuple, color: str) -> float:
     """
     Scores a potential move based on various factors.
@@ -49,6 +117,9 @@ def score_move_by_piece_value(board: Board, from_pos: tuple, to_pos: tuple, colo
 def evaluate_move(board: Board, from_pos: tuple, to_pos: tuple, color: str) -> float:
     """
     Evaluate a move based on piece values and position.
+    Material is scored by static exchange evaluation, so captures that lose
+    the capturing piece and moves onto squares where the piece is lost for
+    less score below safe moves.
     
     Args:
         board: Current board state
@@ -59,13 +130,8 @@ def evaluate_move(board: Board, from_pos: tuple, to_pos: tuple, color: str) -> f
     Returns:
         float: Move score (higher is better)
     """
-    score = 0
-    
-    # Score captures
-    target_piece = board.get_piece_at(to_pos)
-    if target_piece:
-        piece_type = target_piece.__class__.__name__.lower()
-        score += PIECE_VALUES.get(piece_type, 0)
+    # Score the material won or lost on the target square
+    score = static_exchange_evaluation(board, from_pos, to_pos)
     
     # Bonus for moving pieces to center squares
     center_distance = abs(3.5 - to_pos[0]) + abs(3.5 - to_pos[1])
@@ -73,73 +139,84 @@ def evaluate_move(board: Board, from_pos: tuple, to_pos: tuple, color: str) -> f
     
     return score
 
-def find_best_greedy_move(board: Board, color: str) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+def find_best_greedy_move(board: Board, color: str, use_book: bool = True,
+                          stats: Optional[SearchStats] = None) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
     """
     Find the best move using greedy search based on piece values and captures.
     
     Args:
         board: Current board state
         color: Color of the player to move
+        use_book: Play a move from the opening book without scoring when the position is in it
+        stats: Optional SearchStats; nodes counts the moves scored
         
     Returns:
         Optional[Tuple[Tuple[int, int], Tuple[int, int]]]: Best move as (from_pos, to_pos) or None if no valid moves
     """
+    if use_book:
+        book_move = probe_book(board, color)
+        if book_move:
+            if stats is not None:
+                stats.finish('book', [book_move])
+            return book_move
+
+    tb_move = tablebase_move(board, color)
+    if tb_move:
+        if stats is not None:
+            stats.finish('tablebase', [tb_move])
+        return tb_move
+
     best_score = float('-inf')
     best_moves = []
 
-    # First check if we're in checkmate
-    if board.is_checkmate(color):
-        return None
-
-    for row in range(8):
-        for col in range(8):
-            piece = board.get_piece_at((row, col))
-            if piece and piece.color == color:
-                for move in piece.get_valid_moves(board):
-                    # Create a test board to check if this move is valid
-                    test_board = board.copy()
-                    if test_board.move_piece((row, col), move):
-                        # If we're in check, only keep moves that get us out of check
-                        if board.is_in_check(color):
-                            if test_board.is_in_check(color):
-                                continue  # Skip this move as it doesn't get us out of check
-                        score = evaluate_move(board, (row, col), move, color)
-                        if score > best_score:
-                            best_score = score
-                            best_moves = [((row, col), move)]
-                        elif score == best_score:
-                            best_moves.append(((row, col), move))
-
-    return random.choice(best_moves) if best_moves else None
-
-def find_random_move(board: Board, color: str) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    # One pass over the legal moves (which already get out of check); none means checkmate or stalemate
+    for from_pos, to_pos in board.iter_legal_moves(color):
+        score = evaluate_move(board, from_pos, to_pos, color)
+        if stats is not None:
+            stats.nodes += 1
+        if score > best_score:
+            best_score = score
+            best_moves = [(from_pos, to_pos)]
+        elif score == best_score:
+            best_moves.append((from_pos, to_pos))
+
+    best_move = random.choice(best_moves) if best_moves else None
+    if stats is not None:
+        stats.finish('greedy', [best_move] if best_move else [], best_score if best_move else None, 1)
+    return best_move
+
+def find_random_move(board: Board, color: str, lazy: bool = True) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
     """
     Find a random valid move from all available options.
     When in check, only considers moves that get out of check.
+
+    With lazy (the default), the pseudo-legal moves are shuffled one draw at
+    a time (Fisher-Yates) and the first legal one is returned, so usually
+    only a move or two is checked for legality. The legal moves come out of
+    the shuffle in uniformly random order, so the first is a uniform pick,
+    exactly as when choosing from the full legal move list (lazy=False).
     
     Args:
         board: Current board state
         color: Color of the player to move
+        lazy: Stop at the first legal move of a lazy shuffle instead of listing every legal move
         
     Returns:
         Optional[Tuple[Tuple[int, int], Tuple[int, int]]]: Random move as (from_pos, to_pos) or None if no valid moves
     """
-    all_moves = []
-
-    # First check if we're in checkmate
-    if board.is_checkmate(color):
-        return None
-
-    for row in range(8):
-        for col in range(8):
-            piece = board.get_piece_at((row, col))
-            if piece and piece.color == color:
-                for move in piece.get_valid_moves(board):
-                    # Create a test board to check if this move is valid
-                    test_board = board.copy()
-                    if test_board.move_piece((row, col), move):
-                        # If we're in check, only keep moves that get us out of check
-                        if not board.is_in_check(color) or not test_board.is_in_check(color):
-                            all_moves.append(((row, col), move))
-
-    return random.choice(all_moves) if all_moves else None
\ No newline at end of file
+    if not lazy:
+        # One pass over the legal moves (which already get out of check); none means checkmate or stalemate
+        all_moves = list(board.iter_legal_moves(color))
+        return random.choice(all_moves) if all_moves else None
+
+    moves = [(piece.position, to_pos)
+             for row in board.grid for piece in row if piece is not None and piece.color == color
+             for to_pos in piece.get_valid_moves(board)]
+    scratch = [row[:] for row in board.grid]
+    for i in range(len(moves)):
+        # Draw the i-th move of the shuffle from those not drawn yet
+        j = random.randrange(i, len(moves))
+        moves[i], moves[j] = moves[j], moves[i]
+        if not board.leaves_king_in_check(*moves[i], scratch):
+            return moves[i]
+    return None  # No legal move: checkmate or stalemate
\ No newline at end of file
@@ -0,0 +1,360 @@
+"""
+Negamax search with principal variation search and aspiration windows.
+
+An alternative to minimax_search.find_best_move that the minimax bots can
+select (see SEARCH_ENGINES in app/bots.py). It reaches the same best score
+while visiting far fewer nodes:
+
+- Negamax: every node maximizes from the side to move's point of view, so
+  there is one code path and evaluate_position(board, color) is called for
+  the side to move (the evaluators are symmetric).
+- Iterative deepening: each depth is searched in turn and the best move
+  found at each position is tried first at the next depth. Captures follow,
+  most valuable victim first, except that captures losing material by
+  static exchange evaluation (SEE) are tried after the quiet moves.
+- Principal variation search: the first move of a node gets the full
+  window, later moves a null window that only proves they are no better;
+  a move that turns out better is searched again with the full window.
+- Aspiration windows: from depth 2 on, the root is searched within
+  ASPIRATION_WINDOW of the previous depth's score and widened on failure.
+- Mate-distance scoring: being mated at ply p scores -(MATE_SCORE - p), so
+  faster mates are preferred and slower losses are fought for; stalemate
+  scores 0. Tablebase scores at the leaves are shifted the same way.
+
+SearchOptions turns on the selective features, which let a bot search
+deeper in the same time at the risk of occasionally missing a move:
+
+- Null-move pruning: before searching a node, let the opponent move twice
+  (a "null move") at reduced depth; if that still fails high, the node
+  would too, so it is cut off. Skipped in check, right after another null
+  move, and when the side to move has only king and pawns, where zugzwang
+  (every move makes things worse) makes passing better than any real move.
+- Late-move reductions: quiet moves ordered late are searched one ply
+  shallower with a null window first, and only re-searched to full depth
+  if they unexpectedly beat alpha. Losing captures count as quiet moves.
+- Quiescence search: instead of evaluating the leaves as they stand, keep
+  searching captures there until the position is quiet, so a leaf in the
+  middle of an exchange is not misjudged. The side to move may stand pat
+  on the evaluation, and captures that lose material by SEE are pruned
+  without being searched. Checks are not resolved.
+- A time limit: iterative deepening stops at the deepest completed depth.
+
+SearchStats.tt_probes/tt_hits count lookups in the per-search best-move
+table used for move ordering.
+"""
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.board import Board
+from app.minimax_search import SearchCancelled, book_or_tablebase_move, search_cancel_event
+from app.move_scoring import PIECE_VALUES, static_exchange_evaluation
+from app.search_stats import SearchStats
+from app.tablebase import TB_WIN_SCORE, tablebase_score
+from pieces import King, Pawn
+
+Position = Tuple[int, int]
+Move = Tuple[Position, Position]
+
+# Same scale as tablebase scores, so a tablebase win and a found mate compare by distance
+MATE_SCORE = TB_WIN_SCORE
+MAX_PLY = 128
+ASPIRATION_WINDOW = 0.5  # Half a pawn either side of the previous depth's score
+NULL_WINDOW = 1e-6  # Scores are floats (evaluators add 0.1-pawn terms)
+
+INFINITY = float('inf')
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search that ran past its time limit."""
+
+
+class SearchOptions:
+    """Selective search features of find_best_move_pvs; all off by default."""
+
+    def __init__(
+        self,
+        null_move: bool = False,
+        null_move_reduction: int = 2,
+        late_move_reductions: bool = False,
+        lmr_full_depth_moves: int = 3,
+        lmr_min_depth: int = 3,
+        quiescence: bool = False,
+        time_limit: Optional[float] = None
+    ):
+        self.null_move = null_move
+        self.null_move_reduction = null_move_reduction  # Extra plies the null-move search is reduced by
+        self.late_move_reductions = late_move_reductions
+        self.lmr_full_depth_moves = lmr_full_depth_moves  # Moves searched at full depth before reducing
+        self.lmr_min_depth = lmr_min_depth  # Remaining depth needed to reduce
+        self.quiescence = quiescence
+        self.time_limit = time_limit  # Seconds; depth 1 always completes
+
+
+def _opponent(color: str) -> str:
+    return 'black' if color == 'white' else 'white'
+
+
+def _piece_value(piece) -> float:
+    return PIECE_VALUES.get(piece.__class__.__name__.lower(), 0) if piece else 0
+
+
+def has_non_pawn_material(board: Board, color: str) -> bool:
+    """Whether color has a piece besides its king and pawns (null moves are unsafe without one)."""
+    return any(
+        piece is not None and piece.color == color and not isinstance(piece, (King, Pawn))
+        for row in board.grid for piece in row
+    )
+
+
+def _is_quiet(board: Board, move: Move) -> bool:
+    """Neither a capture (including en passant) nor a promotion."""
+    (from_row, from_col), (to_row, to_col) = move
+    if board.grid[to_row][to_col] is not None:
+        return False
+    piece = board.grid[from_row][from_col]
+    return not (isinstance(piece, Pawn) and (from_col != to_col or to_row in (0, 7)))
+
+
+def _is_losing_capture(board: Board, move: Move) -> bool:
+    """A capture that loses material by static exchange evaluation."""
+    (from_row, from_col), (to_row, to_col) = move
+    victim = board.grid[to_row][to_col]
+    # Taking a piece worth at least the capturer's value can never lose material
+    return (victim is not None and _piece_value(victim) < _piece_value(board.grid[from_row][from_col])
+            and static_exchange_evaluation(board, *move) < 0)
+
+
+class NegamaxSearch:
+    """State of one search: the evaluator, options, statistics and the best-move table."""
+
+    def __init__(self, evaluate_position: Callable[[Board, str], float], stats: SearchStats,
+                 options: Optional[SearchOptions] = None):
+        self.evaluate_position = evaluate_position
+        self.stats = stats
+        self.options = options or SearchOptions()
+        self.best_moves: Dict[int, Move] = {}  # Position hash -> best or refuting move found there
+        self.cancel_event = search_cancel_event.get()
+        self.deadline: Optional[float] = None  # perf_counter() time after which SearchTimeout is raised
+
+    def ordered_moves(self, board: Board, color: str, shuffle: bool = False) -> Tuple[List[Move], Optional[int]]:
+        """
+        Legal moves, best-move-table move first, then captures by victim value
+        (cheapest attacker first), then the rest. Returns (moves, position hash).
+        """
+        moves = list(board.iter_legal_moves(color))
+        if not moves:
+            return moves, None
+        if shuffle:
+            random.shuffle(moves)  # Equal moves are tried, and so chosen, in random order
+
+        key = board.position_hash(color)
+        self.stats.tt_probes += 1
+        hash_move = self.best_moves.get(key)
+        if hash_move is not None:
+            self.stats.tt_hits += 1
+
+        grid = board.grid
+
+        def order(move):
+            if move == hash_move:
+                return -INFINITY
+            (from_row, from_col), (to_row, to_col) = move
+            victim = _piece_value(grid[to_row][to_col])
+            if not victim:
+                return 0
+            attacker = _piece_value(grid[from_row][from_col])
+            if victim < attacker:
+                exchange = static_exchange_evaluation(board, move[0], move[1])
+                if exchange < 0:
+                    return -exchange  # After the quiet moves, the cheapest losses first
+            return -(victim * 10 - attacker)
+
+        moves.sort(key=order)
+        return moves, key
+
+    def negamax(self, board: Board, depth: int, alpha: float, beta: float, color: str, ply: int,
+                allow_null: bool = True) -> float:
+        """Score of the position for color, the side to move, searched depth plies deeper."""
+        stats = self.stats
+        options = self.options
+        stats.nodes += 1
+        stats.clear_pv(ply)
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        # No line from here can beat mating (or being mated) sooner than is already possible
+        alpha = max(alpha, -MATE_SCORE + ply)
+        beta = min(beta, MATE_SCORE - ply - 1)
+        if alpha >= beta:
+            return alpha
+
+        if depth == 0 or ply >= MAX_PLY:
+            tb_score = tablebase_score(board, color)
+            if tb_score is not None:
+                return tb_score - ply if tb_score > 0 else tb_score + ply if tb_score < 0 else 0.0
+            if options.quiescence:
+                return self.quiesce(board, alpha, beta, color, ply)
+            return self.evaluate_position(board, color)
+
+        opponent = _opponent(color)
+        selective = options.null_move or options.late_move_reductions
+        in_check = board.is_in_check(color) if selective else None
+        if (options.null_move and allow_null and ply > 0 and not in_check
+                and depth > options.null_move_reduction and beta < MATE_SCORE - MAX_PLY
+                and has_non_pawn_material(board, color)):
+            passed = board.copy()
+            passed.last_move = None  # Passing forfeits any en passant capture
+            passed.current_turn = opponent
+            score = -self.negamax(passed, depth - 1 - options.null_move_reduction, -beta, -beta + NULL_WINDOW,
+                                  opponent, ply + 1, allow_null=False)
+            if score >= beta:
+                stats.null_move_cutoffs += 1
+                return beta
+
+        moves, key = self.ordered_moves(board, color, shuffle=ply == 0)
+        if not moves:
+            mated = in_check if in_check is not None else board.is_in_check(color)
+            return -(MATE_SCORE - ply) if mated else 0.0
+
+        stats.interior_nodes += 1
+        may_reduce = (options.late_move_reductions and depth >= options.lmr_min_depth and not in_check)
+        best_score = -INFINITY
+        for index, move in enumerate(moves):
+            quiet = (may_reduce and index >= options.lmr_full_depth_moves
+                     and (_is_quiet(board, move) or _is_losing_capture(board, move)))
+            child = board.copy()
+            child.move_piece(*move, validate=False)
+            if index == 0:
+                score = -self.negamax(child, depth - 1, -beta, -alpha, opponent, ply + 1)
+            else:
+                if quiet and not child.is_in_check(opponent):
+                    stats.reductions += 1
+                    score = -self.negamax(child, depth - 2, -alpha - NULL_WINDOW, -alpha, opponent, ply + 1)
+                else:
+                    score = INFINITY  # Not reduced: go straight to the full-depth search
+                if score > alpha:
+                    score = -self.negamax(child, depth - 1, -alpha - NULL_WINDOW, -alpha, opponent, ply + 1)
+                    if alpha < score < beta:
+                        stats.researches += 1
+                        score = -self.negamax(child, depth - 1, -beta, -alpha, opponent, ply + 1)
+
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+                self.best_moves[key] = move
+                stats.update_pv(ply, move)
+            if alpha >= beta:
+                stats.children += index + 1
+                stats.record_cutoff(index)
+                return best_score
+        stats.children += len(moves)
+        return best_score
+
+    def captures(self, board: Board, color: str) -> List[Move]:
+        """Legal captures of color that do not lose material by SEE, most valuable victim first."""
+        grid = board.grid
+        scored = []
+        for piece in [piece for row in grid for piece in row if piece is not None and piece.color == color]:
+            from_pos = piece.position
+            for to_pos in piece.get_valid_moves(board):
+                victim = grid[to_pos[0]][to_pos[1]]
+                if victim is None:
+                    continue
+                if _is_losing_capture(board, (from_pos, to_pos)):
+                    self.stats.see_pruned += 1
+                    continue
+                if not board.leaves_king_in_check(from_pos, to_pos):
+                    scored.append((_piece_value(victim) * 10 - _piece_value(piece), (from_pos, to_pos)))
+        scored.sort(key=lambda item: -item[0])
+        return [move for _, move in scored]
+
+    def quiesce(self, board: Board, alpha: float, beta: float, color: str, ply: int) -> float:
+        """Score of a leaf for color, the side to move, once the captures worth making are played out."""
+        stats = self.stats
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        # The side to move may decline every capture and keep the static evaluation
+        best_score = self.evaluate_position(board, color)
+        if best_score >= beta or ply >= MAX_PLY:
+            return best_score
+        alpha = max(alpha, best_score)
+
+        opponent = _opponent(color)
+        for move in self.captures(board, color):
+            child = board.copy()
+            child.move_piece(*move, validate=False)
+            stats.qnodes += 1
+            score = -self.quiesce(child, -beta, -alpha, opponent, ply + 1)
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return best_score
+
+    def search_root(self, board: Board, color: str, depth: int, guess: Optional[float]) -> float:
+        """Search the root to depth within an aspiration window around guess, widening it on failure."""
+        if guess is None or abs(guess) >= MATE_SCORE - MAX_PLY:
+            return self.negamax(board, depth, -INFINITY, INFINITY, color, 0)
+        alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        while True:
+            score = self.negamax(board, depth, alpha, beta, color, 0)
+            if score <= alpha:
+                alpha = -INFINITY
+            elif score >= beta:
+                beta = INFINITY
+            else:
+                return score
+            self.stats.aspiration_researches += 1
+
+
+def find_best_move_pvs(
+    board: Board,
+    color: str,
+    depth: int,
+    evaluate_position: Callable[[Board, str], float],
+    stats: Optional[SearchStats] = None,
+    use_book: bool = True,
+    options: Optional[SearchOptions] = None
+) -> Optional[Move]:
+    """
+    Find the best move with an iterative-deepening negamax / PVS search.
+    Drop-in replacement for minimax_search.find_best_move (same arguments and
+    result); options enables null-move pruning, late-move reductions and a
+    time limit, in which case depth is the deepest iteration tried.
+
+    Raises:
+        SearchCancelled: If the search_cancel_event of the current context is set
+    """
+    stats = stats if stats is not None else SearchStats()
+    known_move = book_or_tablebase_move(board, color, stats, use_book)
+    if known_move:
+        return known_move
+
+    options = options or SearchOptions()
+    search = NegamaxSearch(evaluate_position, stats, options)
+    started = time.perf_counter()
+    score, pv, completed = None, [], 0
+    for iteration in range(1, depth + 1):
+        start = time.perf_counter()
+        if options.time_limit is not None and iteration > 1:
+            search.deadline = started + options.time_limit
+        try:
+            score = search.search_root(board, color, iteration, score)
+        except SearchTimeout:
+            break
+        pv = stats.line_at(0)
+        completed = iteration
+        stats.depth_times[iteration] = time.perf_counter() - start
+
+    best_move = pv[0] if pv else None
+    stats.finish('search', pv, score if best_move else None, completed)
+    return best_move
@@ -0,0 +1,272 @@
+"""
+Opening book stored as a compact, memory-mapped binary file.
+
+The file layout follows Polyglot: a flat array of 16-byte big-endian entries
+(key: u64, move: u16, weight: u16, learn: u32) sorted by key, so a lookup is a
+binary search over the mapped file with no parsing or loading step. Keys are
+this project's Zobrist hashes (app/zobrist.py), so Polyglot books from other
+engines are not interchangeable with ours even though the format is.
+
+Books are built from PGN files with build_book_from_pgn() (see
+utils/build_opening_book.py). find_best_move() and find_best_greedy_move()
+consult the default book before searching.
+"""
+import mmap
+import os
+import random
+import re
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.board import Board
+from pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+Position = Tuple[int, int]
+Move = Tuple[Position, Position]
+
+ENTRY = struct.Struct(">QHHI")  # key, move, weight, learn
+
+# Shipped book; OPENING_BOOK_PATH overrides it and an empty value disables the book
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(__file__), "data", "opening_book.bin")
+
+# Only the first plies of each game go into the book by default
+DEFAULT_BOOK_PLIES = 16
+
+PROMOTION_CODES = {None: 0, Knight: 1, Bishop: 2, Rook: 3, Queen: 4}
+PROMOTION_CLASSES = {code: cls for cls, code in PROMOTION_CODES.items()}
+
+SAN_PIECES = {'N': Knight, 'B': Bishop, 'R': Rook, 'Q': Queen, 'K': King}
+
+
+def encode_book_move(from_pos: Position, to_pos: Position, promotion_piece_cls=None, castling: bool = False) -> int:
+    """
+    Encode a move in Polyglot's 16-bit layout: to file (bits 0-2), to rank
+    (3-5), from file (6-8), from rank (9-11) and promotion piece (12-14).
+    Castling is stored as "king takes own rook", as Polyglot does.
+    """
+    if castling:
+        to_pos = (to_pos[0], 7 if to_pos[1] == 6 else 0)
+    from_row, from_col = from_pos
+    to_row, to_col = to_pos
+    return (
+        to_col | ((7 - to_row) << 3) | (from_col << 6) | ((7 - from_row) << 9) |
+        (PROMOTION_CODES.get(promotion_piece_cls, 0) << 12)
+    )
+
+
+def decode_book_move(move: int, board: Board) -> Tuple[Position, Position, Optional[type]]:
+    """Decode a Polyglot move into (from_pos, to_pos, promotion class) for our board coordinates."""
+    to_pos = (7 - ((move >> 3) & 7), move & 7)
+    from_pos = (7 - ((move >> 9) & 7), (move >> 6) & 7)
+    promotion = PROMOTION_CLASSES.get((move >> 12) & 7)
+
+    # Translate "king takes own rook" back to the two-square king move
+    piece = board.get_piece_at(from_pos)
+    target = board.get_piece_at(to_pos)
+    if isinstance(piece, King) and isinstance(target, Rook) and target.color == piece.color:
+        to_pos = (to_pos[0], 6 if to_pos[1] == 7 else 2)
+    return from_pos, to_pos, promotion
+
+
+class OpeningBook:
+    """Read-only view of a book file, memory-mapped and binary-searched."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % ENTRY.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a valid opening book (size {size} is not a multiple of {ENTRY.size})")
+        self._count = size // ENTRY.size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key_at(self, index: int) -> int:
+        return struct.unpack_from(">Q", self._data, index * ENTRY.size)[0]
+
+    def find(self, key: int) -> List[Tuple[int, int]]:
+        """Return all (move, weight) entries stored for a position hash."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        entries = []
+        index = lo
+        while index < self._count:
+            entry_key, move, weight, _learn = ENTRY.unpack_from(self._data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((move, weight))
+            index += 1
+        return entries
+
+    def choose_move(self, board: Board, color: str) -> Optional[Move]:
+        """
+        Pick a book move for the side to move, weighted by how often it was played.
+        Entries that are not legal in this position (hash collisions) are ignored.
+        Returns None when the position is not in the book.
+        """
+        candidates = []
+        for move, weight in self.find(board.position_hash(color)):
+            from_pos, to_pos, _promotion = decode_book_move(move, board)
+            if _is_legal(board, from_pos, to_pos, color):
+                candidates.append(((from_pos, to_pos), max(weight, 1)))
+
+        if not candidates:
+            return None
+        moves, weights = zip(*candidates)
+        return random.choices(moves, weights=weights)[0]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+
+def _is_legal(board: Board, from_pos: Position, to_pos: Position, color: str) -> bool:
+    piece = board.get_piece_at(from_pos)
+    if not piece or piece.color != color:
+        return False
+    return board.copy().move_piece(from_pos, to_pos)
+
+
+def write_book(entries: Dict[int, Dict[int, int]], path: str):
+    """
+    Write a book file from {position hash: {encoded move: weight}}.
+    Entries are sorted by key (then by descending weight) as the format requires.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        for key in sorted(entries):
+            for move, weight in sorted(entries[key].items(), key=lambda item: -item[1]):
+                f.write(ENTRY.pack(key, move, min(weight, 0xFFFF), 0))
+
+
+_SAN_RE = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+
+
+def parse_san(board: Board, san: str, color: str) -> Tuple[Position, Position, Optional[type]]:
+    """
+    Resolve a SAN move (e.g. 'Nf3', 'exd5', 'O-O', 'e8=Q+') against a position.
+
+    Returns:
+        (from_pos, to_pos, promotion class or None)
+
+    Raises:
+        ValueError: If the move cannot be parsed or does not match exactly one legal move
+    """
+    san = san.rstrip("+#!?")
+    home_row = 7 if color == 'white' else 0
+    if san in ("O-O", "0-0"):
+        return (home_row, 4), (home_row, 6), None
+    if san in ("O-O-O", "0-0-0"):
+        return (home_row, 4), (home_row, 2), None
+
+    match = _SAN_RE.match(san)
+    if not match:
+        raise ValueError(f"Unrecognised SAN move: {san}")
+    piece_letter, from_file, from_rank, target, promotion_letter = match.groups()
+    piece_cls = SAN_PIECES[piece_letter] if piece_letter else Pawn
+    to_pos = (8 - int(target[1]), ord(target[0]) - ord('a'))
+
+    candidates = []
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if not isinstance(piece, piece_cls) or piece.color != color:
+                continue
+            if from_file and col != ord(from_file) - ord('a'):
+                continue
+            if from_rank and row != 8 - int(from_rank):
+                continue
+            if to_pos in piece.get_valid_moves(board) and _is_legal(board, (row, col), to_pos, color):
+                candidates.append((row, col))
+
+    if len(candidates) != 1:
+        raise ValueError(f"SAN move {san} matches {len(candidates)} legal moves")
+    return candidates[0], to_pos, SAN_PIECES.get(promotion_letter) if promotion_letter else None
+
+
+_COMMENT_RE = re.compile(r"\{[^}]*\}|;[^\n]*")
+_VARIATION_RE = re.compile(r"\([^()]*\)")
+_TOKEN_SKIP_RE = re.compile(r"^(\d+\.+|\$\d+|1-0|0-1|1/2-1/2|\*)$")
+
+
+def read_pgn_games(text: str) -> Iterator[List[str]]:
+    """Yield the SAN move list of each game in a PGN text (tags, comments and variations are dropped)."""
+    for block in re.split(r"\n\s*\n(?=\[)", text):
+        movetext = "\n".join(line for line in block.splitlines() if not line.startswith("["))
+        movetext = _COMMENT_RE.sub(" ", movetext)
+        while _VARIATION_RE.search(movetext):
+            movetext = _VARIATION_RE.sub(" ", movetext)
+        # Split "1.e4" into "1." and "e4"
+        movetext = re.sub(r"(\d+\.+)", r" \1 ", movetext)
+        moves = [token for token in movetext.split() if not _TOKEN_SKIP_RE.match(token)]
+        if moves:
+            yield moves
+
+
+def build_book_from_pgn(pgn_paths: Iterable[str], out_path: str, max_plies: int = DEFAULT_BOOK_PLIES) -> int:
+    """
+    Build a book file from one or more PGN files.
+
+    Every position reached in the first max_plies plies of each game gets an
+    entry for the move played, weighted by how many games played it. Games
+    with moves that cannot be resolved are cut off at the bad move.
+
+    Returns:
+        int: Number of entries written
+    """
+    entries: Dict[int, Dict[int, int]] = {}
+    for path in pgn_paths:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        for san_moves in read_pgn_games(text):
+            board = Board()
+            board.setup_standard_position()
+            color = 'white'
+            for san in san_moves[:max_plies]:
+                try:
+                    from_pos, to_pos, promotion = parse_san(board, san, color)
+                except ValueError:
+                    break
+                castling = isinstance(board.get_piece_at(from_pos), King) and abs(from_pos[1] - to_pos[1]) == 2
+                move = encode_book_move(from_pos, to_pos, promotion, castling)
+                position_moves = entries.setdefault(board.position_hash(color), {})
+                position_moves[move] = position_moves.get(move, 0) + 1
+                board.move_piece(from_pos, to_pos, promotion_piece_cls=promotion, validate=False)
+                color = 'black' if color == 'white' else 'white'
+
+    write_book(entries, out_path)
+    return sum(len(moves) for moves in entries.values())
+
+
+_default_book = None
+_default_book_lock = threading.Lock()
+
+
+def get_default_book() -> Optional[OpeningBook]:
+    """Open the configured book on first use; returns None if there is no book file."""
+    global _default_book
+    if _default_book is None:
+        with _default_book_lock:
+            if _default_book is None:
+                path = os.getenv("OPENING_BOOK_PATH", DEFAULT_BOOK_PATH)
+                _default_book = OpeningBook(path) if path and os.path.exists(path) else False
+    return _default_book or None
+
+
+def probe_book(board: Board, color: str) -> Optional[Move]:
+    """Return a book move for the position, or None if it is not covered by the default book."""
+    book = get_default_book()
+    if book is None:
+        return None
+    return book.choose_move(board, color)
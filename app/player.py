@@ -6,6 +6,8 @@ class Player:
         self.name = name
         self.color = color  # 'white' or 'black'
         self.image = image  # Path to player avatar or image
+        self.nodes_searched = 0  # Positions visited by the last decide_move() call (search bots only)
+        self.last_search_stats = None  # SearchStats of the last decide_move() call (search bots only)
 
     def decide_move(self, board):
         """
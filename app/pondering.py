@@ -0,0 +1,178 @@
+"""
+Pondering: searching the bot's answers while the human is thinking.
+
+After a bot moves in a human-vs-bot game, a background task plays each of
+the human's likeliest replies on a copy of the board (captures first, by
+victim value) and runs decide_move() on the result with a copy of the bot,
+so a round still finishing cannot overwrite the search statistics of the
+game's bot while it searches its real move. The
+answers are cached by position hash, so when the human's actual move
+reaches a cached position, /api/bot-move plays the answer without searching.
+
+The work is bounded per game (replies searched and seconds spent per round)
+and globally (worker threads and total cached answers). A round stops as
+soon as the human moves, and its answers are discarded when the bot moves
+again, since they can no longer be reached.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.board import Board
+from app.logs import get_logger
+from app.memory_profile import search_memory
+from app.metrics import timed
+from app.minimax_search import SearchCancelled, search_cancel_event
+from app.move_scoring import PIECE_VALUES
+
+Position = Tuple[int, int]
+Move = Tuple[Position, Position]
+
+logger = get_logger("pondering")
+
+
+def likely_replies(board: Board, color: str) -> List[Move]:
+    """Legal moves of color, most forcing first: captures by victim value, then the rest in board order."""
+    def capture_value(move):
+        target = board.get_piece_at(move[1])
+        return PIECE_VALUES.get(target.__class__.__name__.lower(), 0) if target else -1
+
+    moves = [(from_pos, to_pos) for from_pos, targets in board.legal_moves(color).items() for to_pos in targets]
+    return sorted(moves, key=capture_value, reverse=True)
+
+
+class Ponderer:
+    """Background ponder tasks and the per-game caches of their answers."""
+
+    def __init__(self, max_workers: int = 1, replies_per_round: int = 8,
+                 seconds_per_round: float = 5.0, max_entries: int = 2000):
+        self.replies_per_round = replies_per_round
+        self.seconds_per_round = seconds_per_round
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ponder")
+        self._caches: "OrderedDict[str, Dict[int, Move]]" = OrderedDict()  # Least recently started game first
+        self._stop_events: Dict[str, threading.Event] = {}
+        self._entries = 0
+        self._lock = threading.Lock()
+
+    def start(self, session_id: str, manager):
+        """
+        Start pondering the current position, where the human (manager.current_turn)
+        is to move. Answers from the game's previous round are dropped.
+        Returns the Future of the ponder task.
+        """
+        human_color = manager.current_turn
+        # A copy: a stopped round may still be finishing while a bot job searches with the game's bot
+        bot = copy.copy(manager.players['black' if human_color == 'white' else 'white'])
+        with self._lock:
+            previous = self._stop_events.get(session_id)
+            if previous:
+                previous.set()
+            self._entries -= len(self._caches.pop(session_id, {}))
+            self._caches[session_id] = {}
+            stop_event = threading.Event()
+            self._stop_events[session_id] = stop_event
+            self._evict()
+        return self._executor.submit(self._ponder, session_id, bot, manager.board.copy(), human_color, stop_event)
+
+    def _ponder(self, session_id: str, bot, board: Board, human_color: str, stop_event: threading.Event):
+        if stop_event.is_set():
+            return
+        timer = threading.Timer(self.seconds_per_round, stop_event.set)
+        timer.daemon = True
+        timer.start()
+        token = search_cancel_event.set(stop_event)
+        try:
+            for from_pos, to_pos in likely_replies(board, human_color)[:self.replies_per_round]:
+                if stop_event.is_set():
+                    break
+                after = board.copy()
+                after.move_piece(from_pos, to_pos, validate=False)
+                with timed('decide_move', endpoint='ponder'), search_memory(type(bot).__name__):
+                    move = bot.decide_move(after)
+                if move and not stop_event.is_set():
+                    self._store(session_id, stop_event, after.position_hash(bot.color), move)
+        except SearchCancelled:
+            pass
+        except Exception:
+            logger.exception("pondering failed", extra={'session_id': session_id})
+        finally:
+            timer.cancel()
+            search_cancel_event.reset(token)
+
+    def _store(self, session_id: str, stop_event: threading.Event, key: int, move: Move):
+        with self._lock:
+            cache = self._caches.get(session_id)
+            # Answers from a round that has since been replaced are unreachable
+            if cache is None or key in cache or self._stop_events.get(session_id) is not stop_event:
+                return
+            cache[key] = move
+            self._entries += 1
+            self._evict()
+
+    def _evict(self):
+        # Drop whole games, least recently pondered first, until under the global cap
+        while self._entries > self.max_entries and len(self._caches) > 1:
+            session_id, cache = self._caches.popitem(last=False)
+            self._entries -= len(cache)
+            event = self._stop_events.pop(session_id, None)
+            if event:
+                event.set()
+
+    def lookup(self, session_id: str, manager) -> Optional[Move]:
+        """Return the pondered answer for the game's current position if it is cached and legal."""
+        with self._lock:
+            cache = self._caches.get(session_id)
+            move = cache.get(manager.board.position_hash(manager.current_turn)) if cache else None
+        if move and manager.is_legal_move(*move):
+            return move
+        return None
+
+    def stop(self, session_id: str):
+        """Stop the game's running round (the human has moved); answers found so far are kept."""
+        with self._lock:
+            event = self._stop_events.get(session_id)
+        if event:
+            event.set()
+
+    def forget(self, session_id: str):
+        """Stop pondering a game and drop its answers (game over, resigned or deleted)."""
+        with self._lock:
+            event = self._stop_events.pop(session_id, None)
+            self._entries -= len(self._caches.pop(session_id, {}))
+        if event:
+            event.set()
+
+    @property
+    def cached_entries(self) -> int:
+        return self._entries
+
+    def shutdown(self):
+        with self._lock:
+            for event in self._stop_events.values():
+                event.set()
+        self._executor.shutdown(wait=True)
+
+
+_ponderer_lock = threading.Lock()
+
+
+def get_ponderer(app) -> Optional[Ponderer]:
+    """Return the app's Ponderer, or None unless PONDER_ENABLED is set."""
+    if not app.config.get('PONDER_ENABLED', False):
+        return None
+    ponderer = app.extensions.get('ponderer')
+    if ponderer is None:
+        with _ponderer_lock:
+            ponderer = app.extensions.get('ponderer')
+            if ponderer is None:
+                ponderer = Ponderer(
+                    max_workers=app.config.get('PONDER_WORKERS', 1),
+                    replies_per_round=app.config.get('PONDER_REPLIES', 8),
+                    seconds_per_round=app.config.get('PONDER_SECONDS', 5.0),
+                    max_entries=app.config.get('PONDER_MAX_ENTRIES', 2000)
+                )
+                app.extensions['ponderer'] = ponderer
+    return ponderer
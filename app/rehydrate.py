@@ -0,0 +1,110 @@
+"""
+Rebuilding in-memory games from the database.
+
+A game is restored by replaying its binary move record (app/move_encoding.py)
+from the standard starting position. Replaying goes through Board.move_piece,
+so castling rights, en passant, the halfmove clock and repetition history come
+back exactly as they were; moves are not re-validated because they were legal
+when they were recorded.
+
+Games saved before move records existed fall back to their latest BoardState
+snapshot, which restores the pieces but not that extra state.
+"""
+from typing import Optional
+
+from app.bots import BOT_REGISTRY, BlackIdiotBot, WhiteIdiotBot
+from app.game import GameManager
+from app.models import db, BoardState, Game, Move
+from app.move_encoding import decode_game_record, decode_move
+from app.player import HumanPlayer
+from pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+BOTS_BY_CLASS_NAME = {bot_cls.__name__: bot_cls for bot_cls in BOT_REGISTRY.values()}
+
+PIECE_CLASSES = {cls.__name__: cls for cls in (Pawn, Rook, Knight, Bishop, Queen, King)}
+
+
+def restore_player(player_type: str, name: str, color: str):
+    """
+    Recreate a player from its Game columns. Bots are stored under their class
+    name; registry keys are accepted too for games created by older versions.
+    """
+    if player_type == 'human':
+        return HumanPlayer(name=name, color=color)
+    bot_cls = BOTS_BY_CLASS_NAME.get(name) or BOT_REGISTRY.get((name or '').lower().replace(' ', ''))
+    if bot_cls:
+        return bot_cls(name=name, color=color)
+    return WhiteIdiotBot() if color == 'white' else BlackIdiotBot()
+
+
+def replay_moves(manager: GameManager, moves) -> GameManager:
+    """
+    Play encoded moves on the manager's board without validation.
+
+    Only the board, turn and move list are updated; per-ply square changes are
+    not recorded, so clients of a rehydrated game get one full board first.
+    """
+    board = manager.board
+    color = manager.current_turn
+    if not manager.moves:
+        manager.first_color = color
+    for code in moves:
+        from_pos, to_pos, promotion_piece_cls = decode_move(code)
+        board.move_piece(from_pos, to_pos, promotion_piece_cls=promotion_piece_cls, validate=False)
+        color = 'black' if color == 'white' else 'white'
+    manager.moves.extend(moves)
+    manager.current_turn = color
+    return manager
+
+
+def restore_from_snapshot(manager: GameManager, board_state) -> GameManager:
+    """Place the pieces of a serialized board on an empty board (legacy games only)."""
+    manager.board.grid = [[None for _ in range(8)] for _ in range(8)]
+    for row in range(8):
+        for col in range(8):
+            piece_data = board_state[row][col]
+            if piece_data:
+                manager.board.place_piece(PIECE_CLASSES[piece_data['type']](piece_data['color']), (row, col))
+    return manager
+
+
+def rehydrate_game(game: Game, snapshot: Optional[BoardState] = None, legacy_moves=()) -> GameManager:
+    """
+    Build a GameManager for a Game row.
+
+    Args:
+        game: The Game row; its move_record is replayed when present
+        snapshot: Latest BoardState, used only when there is no move record
+        legacy_moves: Move rows giving the history shown for such games
+    """
+    manager = GameManager()
+    manager.set_players(
+        restore_player(game.white_player_type, game.white_player_name, 'white'),
+        restore_player(game.black_player_type, game.black_player_name, 'black')
+    )
+
+    if game.move_record:
+        moves, manager.current_turn = decode_game_record(game.move_record)
+        return replay_moves(manager, moves)
+
+    if snapshot is not None:
+        restore_from_snapshot(manager, snapshot.board_state)
+    manager.current_turn = game.current_turn
+    manager.move_history = [
+        {'from': move.from_position, 'to': move.to_position, 'color': move.piece_color}
+        for move in legacy_moves
+    ]
+    return manager
+
+
+def load_game(session_id) -> Optional[GameManager]:
+    """Rehydrate a game from the database by session UUID, or return None if it does not exist."""
+    game = db.session.get(Game, session_id)
+    if not game:
+        return None
+    if game.move_record:
+        return rehydrate_game(game)
+
+    snapshot = BoardState.query.filter_by(session_id=session_id).order_by(BoardState.move_number.desc()).first()
+    legacy_moves = Move.query.filter_by(session_id=session_id).order_by(Move.move_number).all()
+    return rehydrate_game(game, snapshot, legacy_moves)
@@ -0,0 +1,119 @@
+"""
+Statistics collected by a single bot search.
+
+Every search entry point (find_best_move, minimax_search,
+find_best_move_pvs and find_best_greedy_move) accepts an optional SearchStats and fills it in; the
+search bots keep the stats of their last decide_move() call in
+last_search_stats. The numbers answer "did this change pay off?" questions:
+more cutoffs on the first move mean better move ordering, a higher TT hit
+rate means more reuse, fewer nodes for the same depth means a cheaper search.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+Position = Tuple[int, int]
+Move = Tuple[Position, Position]
+
+
+class SearchStats:
+    """Counters, timings and the principal variation of one search."""
+
+    def __init__(self):
+        self.nodes = 0  # Positions visited by the main search
+        self.qnodes = 0  # Positions visited by quiescence search
+        self.interior_nodes = 0  # Nodes whose children were searched
+        self.children = 0  # Children searched from interior nodes
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0  # Cutoffs caused by the first move searched
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.researches = 0  # PVS null-window searches repeated with the full window
+        self.aspiration_researches = 0  # Root searches repeated after failing outside the aspiration window
+        self.null_move_cutoffs = 0  # Nodes cut off by a null-move search
+        self.reductions = 0  # Late moves searched at reduced depth
+        self.see_pruned = 0  # Quiescence captures skipped because they lose material by SEE
+        self.depth_times: Dict[int, float] = {}  # Seconds spent completing each depth
+        self.pv: List[Move] = []  # Principal variation, starting with the chosen move
+        self.score: Optional[float] = None
+        self.depth = 0
+        self.source = None  # 'search', 'book', 'tablebase' or 'greedy'
+        self.elapsed = 0.0
+        self._pv_table: Dict[int, List[Move]] = {}
+        self._started = time.perf_counter()
+
+    def record_cutoff(self, move_index: int):
+        """Count a beta cutoff caused by the move_index-th move searched at a node."""
+        self.beta_cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+    def clear_pv(self, ply: int):
+        self._pv_table[ply] = []
+
+    def update_pv(self, ply: int, move: Move):
+        """The move is the new best at ply: its line is the move followed by the child's line."""
+        self._pv_table[ply] = [move] + self._pv_table.get(ply + 1, [])
+
+    def line_at(self, ply: int) -> List[Move]:
+        return list(self._pv_table.get(ply, []))
+
+    def finish(self, source: str, pv: Optional[List[Move]] = None, score: Optional[float] = None, depth: int = 0):
+        """Record how the move was found and stop the clock."""
+        self.source = source
+        self.pv = pv or []
+        self.score = score
+        self.depth = depth
+        self.elapsed = time.perf_counter() - self._started
+        self._pv_table.clear()
+        return self
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def branching_factor(self) -> float:
+        """Average number of children searched per expanded node (after pruning)."""
+        return self.children / self.interior_nodes if self.interior_nodes else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return (self.nodes + self.qnodes) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'source': self.source,
+            'depth': self.depth,
+            'score': self.score,
+            'nodes': self.nodes,
+            'qnodes': self.qnodes,
+            'beta_cutoffs': self.beta_cutoffs,
+            'first_move_cutoff_rate': round(self.first_move_cutoff_rate, 3),
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_hit_rate': round(self.tt_hit_rate, 3),
+            'researches': self.researches,
+            'aspiration_researches': self.aspiration_researches,
+            'null_move_cutoffs': self.null_move_cutoffs,
+            'reductions': self.reductions,
+            'see_pruned': self.see_pruned,
+            'branching_factor': round(self.branching_factor, 2),
+            'depth_times': {depth: round(seconds, 4) for depth, seconds in self.depth_times.items()},
+            'elapsed': round(self.elapsed, 4),
+            'nodes_per_second': round(self.nodes_per_second),
+            'pv': [[list(from_pos), list(to_pos)] for from_pos, to_pos in self.pv]
+        }
+
+    def summary(self) -> str:
+        """One-line description for logs."""
+        if self.source != 'search':
+            return f"{self.source} move in {self.elapsed * 1000:.1f} ms"
+        pv = ' '.join(f"{f[0]}{f[1]}-{t[0]}{t[1]}" for f, t in self.pv)
+        return (f"depth {self.depth} score {self.score} nodes {self.nodes}+{self.qnodes}q "
+                f"cutoffs {self.beta_cutoffs} ({self.first_move_cutoff_rate:.0%} first) "
+                f"tt {self.tt_hits}/{self.tt_probes} bf {self.branching_factor:.1f} "
+                f"{self.elapsed * 1000:.1f} ms pv {pv}")
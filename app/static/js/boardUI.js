@@ -11,6 +11,52 @@ import { handleSquareClick } from './eventHandlers.js';
 
 let lastMove = {};
 
+// Client-side copy of the server board, kept in sync with /api/board?since=<version>
+let boardCache = { sessionId: null, version: null, turn: null, board: null };
+
+function resetBoardCache() {
+    boardCache = { sessionId: null, version: null, turn: null, board: null };
+}
+
+// Fetch what changed since the cached version and apply it to the cache.
+// Returns the response data (null on 304) and the changed squares (null means all of them).
+async function syncBoardCache(sessionId) {
+    const haveVersion = boardCache.sessionId === sessionId && boardCache.version !== null;
+    const sinceParam = haveVersion ? `&since=${boardCache.version}` : '';
+    const response = await fetch(`/api/board?session_id=${sessionId}${sinceParam}`);
+    if (response.status === 304) {
+        return { data: null, changed: [] };
+    }
+    if (!response.ok) {
+        throw new Error(`Server returned ${response.status}: ${response.statusText}`);
+    }
+
+    const data = await response.json();
+    if (data.error) {
+        return { data, changed: [] };
+    }
+
+    let changed = null;
+    if (data.changes) {
+        changed = data.changes.map(change => change.position);
+        data.changes.forEach(({ position, piece }) => {
+            boardCache.board[position[0]][position[1]] = piece;
+        });
+    } else {
+        boardCache = { sessionId, version: null, turn: null, board: data.board };
+    }
+    boardCache.version = data.version;
+    boardCache.turn = data.turn;
+    return { data, changed };
+}
+
+// Bring the cached board up to date, redrawing any squares that changed, and return it.
+// Clicks use this instead of downloading the full board, so they only fetch what changed.
+async function syncBoardState() {
+    await doUpdateBoard();
+    return { version: boardCache.version, turn: boardCache.turn, board: boardCache.board };
+}
+
 // Convert algebraic notation to backend position
 function algebraicToPosition(square) {
     const file = square.charCodeAt(0) - 97; // 'a' -> 0, 'b' -> 1, etc.
@@ -266,6 +312,7 @@ async function initializeBoard() {
 
         // Clear existing board
         chessboard.innerHTML = '';
+        resetBoardCache();
 
         // Create squares with proper coloring
         const humanIsBlack = typeof getBlackBot === 'function' && getBlackBot() === 'You';
@@ -324,6 +371,45 @@ function clearHighlights() {
     });
 }
 
+// Draw the cached piece for one square
+function renderSquare(row, col, animatingMove = null) {
+    const position = `${row},${col}`;
+    const square = document.querySelector(`[data-position="${position}"]`);
+    if (!square) {
+        console.error(`Square not found for position ${position}`);
+        return;
+    }
+
+    // Clear existing pieces
+    square.innerHTML = '';
+
+    // Add piece if one exists at this position
+    const piece = boardCache.board[row][col];
+    if (!piece) return;
+
+    // Skip the piece during animation if it's the moving piece
+    const moveToCheck = animatingMove || lastMove;
+    if (
+        moveToCheck &&
+        moveToCheck.from &&
+        moveToCheck.piece &&
+        moveToCheck.from[0] === row &&
+        moveToCheck.from[1] === col &&
+        moveToCheck.piece.type === piece.type &&
+        moveToCheck.piece.color === piece.color
+    ) {
+        return;
+    }
+
+    const pieceImageUrl = getPieceImageUrl(piece);
+    if (pieceImageUrl) {
+        const pieceImage = document.createElement('img');
+        pieceImage.src = pieceImageUrl;
+        pieceImage.className = 'piece-image';
+        square.appendChild(pieceImage);
+    }
+}
+
 // The actual board update logic, separated from animation
 async function doUpdateBoard(animatingMove = null) {
     const currentSessionId = getSessionId();
@@ -333,12 +419,10 @@ async function doUpdateBoard(animatingMove = null) {
     }
     
     try {
-        const response = await fetch(`/api/board?session_id=${currentSessionId}`);
-        if (!response.ok) {
-            throw new Error(`Server returned ${response.status}: ${response.statusText}`);
+        const { data, changed } = await syncBoardCache(currentSessionId);
+        if (!data) {
+            return;  // Nothing changed since the last update
         }
-        
-        const data = await response.json();
         if (data.error) {
             console.error(data.error);
             return;
@@ -351,51 +435,9 @@ async function doUpdateBoard(animatingMove = null) {
             updateCapturedPieces(data.captured_by_white || [], data.captured_by_black || []);
         }
 
-        const humanIsBlack = typeof getBlackBot === 'function' && getBlackBot() === 'You';
-        
-        // Update pieces on the board
-        for (let row = 0; row < 8; row++) {
-            for (let col = 0; col < 8; col++) {
-                const actualRow = humanIsBlack ? 7 - row : row;
-                const actualCol = humanIsBlack ? col : col;
-                const position = `${actualRow},${actualCol}`;
-                const square = document.querySelector(`[data-position="${position}"]`);
-                
-                if (!square) {
-                    console.error(`Square not found for position ${position}`);
-                    continue;
-                }
-
-                // Clear existing pieces
-                square.innerHTML = '';
-                
-                // Add piece if one exists at this position
-                const piece = data.board[actualRow][actualCol];
-                if (piece) {
-                    // Skip the piece during animation if it's the moving piece
-                    const moveToCheck = animatingMove || lastMove;
-                    if (
-                        moveToCheck &&
-                        moveToCheck.from &&
-                        moveToCheck.piece &&
-                        moveToCheck.from[0] === actualRow &&
-                        moveToCheck.from[1] === actualCol &&
-                        moveToCheck.piece.type === piece.type &&
-                        moveToCheck.piece.color === piece.color
-                    ) {
-                        continue;
-                    }
-
-                    const pieceImageUrl = getPieceImageUrl(piece);
-                    if (pieceImageUrl) {
-                        const pieceImage = document.createElement('img');
-                        pieceImage.src = pieceImageUrl;
-                        pieceImage.className = 'piece-image';
-                        square.appendChild(pieceImage);
-                    }
-                }
-            }
-        }
+        // Redraw only the squares that changed, or every square after a full update
+        const squares = changed || [...Array(64).keys()].map(i => [Math.floor(i / 8), i % 8]);
+        squares.forEach(([row, col]) => renderSquare(row, col, animatingMove));
 
         // Update status and turn indicator using the proper functions
         if (data.status) {
@@ -415,7 +457,9 @@ export {
     positionToAlgebraic,
     getPieceImageUrl,
     updateBoard,
+    syncBoardState,
     initializeBoard,
+    resetBoardCache,
     highlightSquare,
     highlightValidMoves,
     clearHighlights,
@@ -8,6 +8,29 @@ import { updateBoard, lastMove } from './boardUI.js';
 import { addMoveToHistory } from './moveHistory.js';
 import { fetchBoardState } from './eventHandlers.js';
 
+// Ask the server for a bot move: start a search job, then long-poll it until the move is played
+async function requestBotMove(sessionId, color) {
+    let response = await fetch('/api/bot-move', {
+        method: 'POST',
+        headers: { 
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        },
+        body: JSON.stringify({ 
+            session_id: sessionId,
+            bot_color: color,
+            async: true
+        })
+    });
+    let data = await response.json();
+
+    while (response.status === 202 && data.pending) {
+        response = await fetch(`/api/bot-move/${data.job_id}?wait=10`);
+        data = await response.json();
+    }
+    return { response, data };
+}
+
 // Make bot move
 async function makeBotMove() {
     try {
@@ -30,26 +53,14 @@ async function makeBotMove() {
         console.log('Making bot move for session:', currentSessionId, 'turn:', currentState.turn);
         console.log('Bot configuration:', { whiteBot: getWhiteBot(), blackBot: getBlackBot() });
 
-        const response = await fetch('/api/bot-move', {
-            method: 'POST',
-            headers: { 
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            },
-            body: JSON.stringify({ 
-                session_id: currentSessionId,
-                bot_color: currentState.turn
-            })
-        });
+        const { response, data } = await requestBotMove(currentSessionId, currentState.turn);
 
         if (!response.ok) {
-            const errorData = await response.json();
-            console.error('Bot move failed:', response.status, errorData);
+            console.error('Bot move failed:', response.status, data);
             updateStatus('Error making bot move. Please try again.');
             return;
         }
 
-        const data = await response.json();
         console.log('Bot move response:', data);
 
         if (data.success) {
@@ -110,7 +121,8 @@ const BOT_DISPLAY_NAMES = {
     'pongo': 'Pongo',
     'borzoi': 'Borzoi',
     'barrowofmonkeys': 'Barrow of Monkeys',
-    'gigantopithecus': 'Gigantopithecus'
+    'gigantopithecus': 'Gigantopithecus',
+    'silverback': 'Silverback'
 };
 
 // Bot type to avatar filename mapping
@@ -120,7 +132,8 @@ const BOT_AVATAR_FILES = {
     'pongo': 'pongo',
     'borzoi': 'borzoi',
     'barrowofmonkeys': 'barrowofmonkeys',
-    'gigantopithecus': 'gigantopithecus'
+    'gigantopithecus': 'gigantopithecus',
+    'silverback': 'default_player'
 };
 
 // Load bot avatars
@@ -177,5 +190,6 @@ function loadBotAvatars() {
 
 export {
     makeBotMove,
+    requestBotMove,
     loadBotAvatars
 }; 
\ No newline at end of file
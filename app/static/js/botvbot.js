@@ -1,6 +1,7 @@
 import { initializeBoard, updateBoard as updateBoardDisplay, lastMove } from './boardUI.js';
 import { clearMoveHistory, initializeMoveHistory, addMoveToHistory } from './moveHistory.js';
 import { fetchBoardState } from './eventHandlers.js';
+import { requestBotMove } from './botManager.js';
 import { 
     initializeDOMElements, 
     updateTurnIndicator, 
@@ -233,16 +234,7 @@ async function makeBotMove() {
     const currentState = await fetchBoardState();
     const moveColor = currentState.turn;  // Store the color before making the move
     
-    const response = await fetch('/api/bot-move', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ 
-            session_id: sessionId,
-            bot_color: moveColor
-        })
-    });
-
-    const data = await response.json();
+    const { data } = await requestBotMove(sessionId, moveColor);
     if (data.success) {
         // Only proceed with move processing if we have valid move data
         if (data.move && data.move.from && data.move.to) {
@@ -13,16 +13,35 @@ import {
     updateStatus,
     setGameStarted
 } from './gameState.js';
-import { updateBoard, clearHighlights, highlightSquare, highlightValidMoves, lastMove } from './boardUI.js';
+import { updateBoard, syncBoardState, clearHighlights, highlightSquare, highlightValidMoves, lastMove } from './boardUI.js';
 import { addMoveToHistory } from './moveHistory.js';
 import { makeBotMove } from './botManager.js';
 
+// Legal moves for the current position, fetched once per position
+let legalMovesCache = { key: null, moves: {} };
+
 // Fetch current board state
 async function fetchBoardState() {
     const response = await fetch(`/api/board?session_id=${getSessionId()}`);
     return await response.json();
 }
 
+// Fetch all legal moves for the position in state ({"row,col": [[row, col], ...]})
+async function fetchLegalMoves(state) {
+    const key = `${getSessionId()}:${state.version}`;
+    if (legalMovesCache.key !== key) {
+        const response = await fetch(`/api/legal-moves?session_id=${getSessionId()}`);
+        const data = await response.json();
+        legalMovesCache = { key, moves: data.moves || {} };
+    }
+    return legalMovesCache.moves;
+}
+
+// Legal destinations of the piece on position
+function movesFrom(legalMoves, position) {
+    return legalMoves[position.join(',')] || [];
+}
+
 // Handle square clicks
 async function handleSquareClick(event) {
     if (!isGameStarted()) return;  // Prevent moves before game starts
@@ -31,7 +50,8 @@ async function handleSquareClick(event) {
     if (!square) return;
 
     const position = square.dataset.position.split(',').map(Number);
-    const currentState = await fetchBoardState();
+    const currentState = await syncBoardState();
+    if (!currentState.board) return;  // No game loaded yet
     
     // If it's not the human's turn, don't allow moves
     if ((currentState.turn === 'white' && getWhiteBot() !== 'You') || (currentState.turn === 'black' && getBlackBot() !== 'You')) {
@@ -41,26 +61,24 @@ async function handleSquareClick(event) {
     // Clear previous selections
     clearHighlights();
 
+    const legalMoves = await fetchLegalMoves(currentState);
+
     if (getSelectedSquare()) {
         const fromPos = getSelectedSquare().dataset.position.split(',').map(Number);
         
         // Check if clicking a different piece of the same color
-        const response = await fetch(`/api/valid-moves?session_id=${getSessionId()}&position=${position.join(',')}`);
-        const data = await response.json();
+        const pieceMoves = movesFrom(legalMoves, position);
         
-        if (data.valid_moves && data.valid_moves.length > 0) {
+        if (pieceMoves.length > 0) {
             // If clicking a different piece of the same color, select that piece instead
             setSelectedSquare(square);
             highlightSquare(square);
-            highlightValidMoves(data.valid_moves);
+            highlightValidMoves(pieceMoves);
             return;
         }
         
         // Check if the destination is a valid move
-        const validMovesResponse = await fetch(`/api/valid-moves?session_id=${getSessionId()}&position=${fromPos.join(',')}`);
-        const validMovesData = await validMovesResponse.json();
-        
-        if (!validMovesData.valid_moves || !validMovesData.valid_moves.some(move => 
+        if (!movesFrom(legalMoves, fromPos).some(move => 
             move[0] === position[0] && move[1] === position[1])) {
             setSelectedSquare(null);
             return;
@@ -88,7 +106,7 @@ async function handleSquareClick(event) {
             setSelectedSquare(null);
             
             // If it's now the bot's turn, make the bot move
-            const newState = await fetchBoardState();
+            const newState = await syncBoardState();
             if ((newState.turn === 'white' && getWhiteBot() !== 'You') || (newState.turn === 'black' && getBlackBot() !== 'You')) {
                 await makeBotMove();
             }
@@ -98,12 +116,11 @@ async function handleSquareClick(event) {
             setSelectedSquare(null);
         }
     } else {
-        const response = await fetch(`/api/valid-moves?session_id=${getSessionId()}&position=${position.join(',')}`);
-        const data = await response.json();
-        if (data.valid_moves && data.valid_moves.length > 0) {
+        const pieceMoves = movesFrom(legalMoves, position);
+        if (pieceMoves.length > 0) {
             setSelectedSquare(square);
             highlightSquare(square);
-            highlightValidMoves(data.valid_moves);
+            highlightValidMoves(pieceMoves);
         }
     }
 }
@@ -157,6 +174,7 @@ function initializeEventListeners() {
 
 export {
     fetchBoardState,
+    fetchLegalMoves,
     handleSquareClick,
     initializeEventListeners
 }; 
\ No newline at end of file
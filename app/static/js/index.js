@@ -18,6 +18,7 @@ async function loadBotOptions() {
     document.getElementById("borzoi-bot-avatar").src = `/static/images/avatars/${botMap["borzoi"].avatar}`;
     document.getElementById("barrowofmonkeys-bot-avatar").src = `/static/images/avatars/${botMap["barrowofmonkeys"].avatar}`;
     document.getElementById("gigantopithecus-bot-avatar").src = `/static/images/avatars/${botMap["gigantopithecus"].avatar}`;
+    document.getElementById("silverback-bot-avatar").src = `/static/images/avatars/${botMap["silverback"].avatar}`;
     
     // Initially disable the start button
     document.querySelector('button[type="submit"]').disabled = true;
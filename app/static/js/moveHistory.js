@@ -4,6 +4,10 @@ import { getBlackBot } from './gameState.js';
 // Track move count internally
 let moveCount = 1; // Start at 1
 
+// Plies shown in the list and the game they belong to, so a re-sync only fetches newer moves
+let historySessionId = null;
+let historyPlies = 0;
+
 // Function to get moves list element
 function getMovesListElement() {
     return document.getElementById('moves-list') || movesList;
@@ -21,23 +25,33 @@ function scrollMoveHistoryToBottom() {
 }
 
 // Initialize move history from server data
+// If the list already shows this game, only the moves played since are fetched and appended.
 async function initializeMoveHistory(sessionId) {
     try {
-        const response = await fetch(`/api/board?session_id=${sessionId}`);
+        const resuming = sessionId && sessionId === historySessionId && historyPlies > 0;
+        const sinceParam = resuming ? `&since=${historyPlies}` : '';
+        const response = await fetch(`/api/board?session_id=${sessionId}${sinceParam}`);
+        if (response.status === 304) {
+            return;  // Already up to date
+        }
         if (!response.ok) {
             throw new Error(`Server returned ${response.status}: ${response.statusText}`);
         }
         
         const data = await response.json();
+        const moves = data.new_moves || data.move_history;
         
-        if (data.move_history) {
-            // Clear existing move history
-            clearMoveHistory();
+        if (moves) {
+            if (!data.new_moves) {
+                // Full history: clear existing move history and rebuild it
+                clearMoveHistory();
+            }
             
             // Add each move from the history
-            data.move_history.forEach(move => {
+            moves.forEach(move => {
                 addMoveToHistory(move.from, move.to, move.color);
             });
+            historySessionId = sessionId;
         }
     } catch (error) {
         console.error('Error initializing move history:', error);
@@ -135,6 +149,7 @@ function addMoveToHistory(from, to, color) {
     if (color === 'black') {
         moveCount++;
     }
+    historyPlies++;
 }
 
 // Clear move history
@@ -146,6 +161,7 @@ function clearMoveHistory() {
     }
     movesList.innerHTML = '';
     moveCount = 1;
+    historyPlies = 0;
 }
 
 export {
@@ -0,0 +1,71 @@
+"""
+Database backends.
+
+DATABASE_URL selects the backend: PostgreSQL (the default, managed with
+Alembic migrations) or SQLite for single-node deployments and tests. The
+models use portable column types, so both backends share the same schema
+and code paths.
+
+SQLite connections run in WAL mode, so readers never block the writer, with
+synchronous=NORMAL (a commit does not wait for fsync of the WAL; a power
+loss can drop the last commits but never corrupts the file). SQLite tables
+are created at startup because the Alembic migrations target Postgres.
+"""
+import os
+
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+# Applied to every new SQLite connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",  # Wait up to 5 s for the write lock instead of failing
+    "PRAGMA cache_size=-16000",  # 16 MB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def is_sqlite(database_url: str) -> bool:
+    return database_url.startswith("sqlite")
+
+
+def engine_options(database_url: str) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS for the backend of database_url, tuned from the DB_* environment variables."""
+    options = {
+        'query_cache_size': int(os.getenv('DB_STATEMENT_CACHE_SIZE', '500')),  # Compiled statements cached
+    }
+    if is_sqlite(database_url):
+        if database_url in ("sqlite://", "sqlite:///:memory:"):
+            # One shared connection, or every thread would see its own empty database
+            options.update(poolclass=StaticPool, connect_args={'check_same_thread': False})
+        return options
+
+    options.update({
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),  # Connections kept open
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),  # Extra connections allowed under load
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),  # Seconds to wait for a free connection
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),  # Reopen connections older than this
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    })
+    return options
+
+
+def configure_sqlite(engine):
+    """Apply SQLITE_PRAGMAS to each connection the engine opens."""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def init_storage(app, db):
+    """Prepare the configured backend: SQLite engines get their pragmas and tables."""
+    if not is_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+    with app.app_context():
+        configure_sqlite(db.engine)
+        db.create_all()
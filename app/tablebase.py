@@ -0,0 +1,584 @@
+"""
+Endgame tablebases for small pawnless endings (3 and 4 pieces).
+
+Tables are produced by retrograde analysis (generate_table) and written as one
+byte per position, memory-mapped when probed. Each byte holds the result for
+the side to move together with its distance to mate (DTM):
+
+    0          draw (also used for illegal and unused indices)
+    1..127     win,  mate in 2*v - 1 plies
+    128..255   loss, mated in 2*(v - 128) plies (128 = checkmated)
+
+Positions are indexed as
+    side to move x strong king square x one square per other piece
+where the board's 8-fold symmetry (valid without pawns or castling) is used to
+restrict the strong king to 10 squares. A 3-piece table is 80 KB and a 4-piece
+table 5 MB. Signatures name the stronger side first, e.g. "KQK" or "KRKN". The
+same table covers both colors: positions where black is stronger are mirrored.
+
+Search calls best_move() at the root and probe() at leaves. KQK and KRK ship in
+app/data/tablebases; utils/generate_tablebases.py builds the others (4-piece
+tables take several minutes each in pure Python).
+"""
+import mmap
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.board import Board
+from app.zobrist import castling_rights
+
+DEFAULT_TABLEBASE_DIR = os.path.join(os.path.dirname(__file__), "data", "tablebases")
+
+MAX_PIECES = 4
+
+# Score used by search for a tablebase win; the mate distance is subtracted from it
+TB_WIN_SCORE = 10000
+
+MAGIC = b"ICTB"
+HEADER_SIZE = 16
+FORMAT_VERSION = 1
+
+PIECE_ORDER = "QRBN"
+PIECE_VALUES = {'Q': 9, 'R': 5, 'B': 3, 'N': 3}
+
+# Signatures that can never be won; probes answer "draw" without a table
+DRAWN_SIGNATURES = {"KK", "KBK", "KNK"}
+
+WHITE, BLACK = 0, 1
+
+# Squares are row * 8 + col, matching Board.grid
+KING_TARGETS = []
+KNIGHT_TARGETS = []
+RAYS = []  # RAYS[sq] = [(is_diagonal, [squares...]), ...]
+ALIGNMENT = [[0] * 64 for _ in range(64)]  # 1 = same rank/file, 2 = same diagonal
+BETWEEN = [[()] * 64 for _ in range(64)]
+
+for _sq in range(64):
+    _r, _c = divmod(_sq, 8)
+    KING_TARGETS.append(frozenset(
+        (_r + dr) * 8 + _c + dc
+        for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+        if (dr or dc) and 0 <= _r + dr < 8 and 0 <= _c + dc < 8
+    ))
+    KNIGHT_TARGETS.append(frozenset(
+        (_r + dr) * 8 + _c + dc
+        for dr, dc in ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+        if 0 <= _r + dr < 8 and 0 <= _c + dc < 8
+    ))
+    _rays = []
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)):
+        ray = []
+        r, c = _r + dr, _c + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            target = r * 8 + c
+            ALIGNMENT[_sq][target] = 2 if dr and dc else 1
+            BETWEEN[_sq][target] = tuple(ray)
+            ray.append(target)
+            r, c = r + dr, c + dc
+        _rays.append((bool(dr and dc), ray))
+    RAYS.append(_rays)
+
+# The 8 symmetries of the board as square permutations
+TRANSFORMS = []
+for _flip_rows in (False, True):
+    for _flip_cols in (False, True):
+        for _transpose in (False, True):
+            _perm = []
+            for _sq in range(64):
+                _r, _c = divmod(_sq, 8)
+                if _flip_rows:
+                    _r = 7 - _r
+                if _flip_cols:
+                    _c = 7 - _c
+                if _transpose:
+                    _r, _c = _c, _r
+                _perm.append(_r * 8 + _c)
+            TRANSFORMS.append(_perm)
+
+# One square from each symmetry class; the strong king is always mapped onto these
+KING_SQUARES = sorted({min(t[sq] for t in TRANSFORMS) for sq in range(64)})
+KING_INDEX = {sq: i for i, sq in enumerate(KING_SQUARES)}
+# Transforms that bring a king on a given square into KING_SQUARES
+KING_TRANSFORMS = [[t for t in TRANSFORMS if t[sq] in KING_INDEX] for sq in range(64)]
+
+
+def encode_value(wdl: int, dtm: int) -> int:
+    """Encode a (win/draw/loss, plies to mate) result as a table byte."""
+    if wdl > 0:
+        return (dtm + 1) // 2
+    if wdl < 0:
+        return 128 + dtm // 2
+    return 0
+
+
+def decode_value(value: int) -> Tuple[int, int]:
+    """Decode a table byte into (wdl, dtm plies) for the side to move."""
+    if value == 0:
+        return 0, 0
+    if value < 128:
+        return 1, 2 * value - 1
+    return -1, 2 * (value - 128)
+
+
+def canonical_signature(white: str, black: str) -> Tuple[str, bool]:
+    """
+    Build the table signature for the non-king pieces of each side.
+
+    Returns:
+        (signature, flipped) where flipped means black is the stronger side
+        and positions must be mirrored before indexing.
+    """
+    white = "".join(sorted(white, key=PIECE_ORDER.index))
+    black = "".join(sorted(black, key=PIECE_ORDER.index))
+
+    def strength(pieces):
+        return sum(PIECE_VALUES[p] for p in pieces), [-PIECE_ORDER.index(p) for p in pieces]
+
+    flipped = strength(black) > strength(white)
+    strong, weak = (black, white) if flipped else (white, black)
+    return f"K{strong}K{weak}", flipped
+
+
+class TableLayout:
+    """Maps positions of one material signature to table indices and back."""
+
+    def __init__(self, signature: str):
+        second_king = signature.index("K", 1)
+        strong, weak = signature[1:second_king], signature[second_king + 1:]
+        self.signature = signature
+        self.types = ["K"] + list(strong) + ["K"] + list(weak)
+        self.sides = [WHITE] * (len(strong) + 1) + [BLACK] * (len(weak) + 1)
+        self.kings = (0, len(strong) + 1)
+        self.count = len(self.types)
+        self.span = 64 ** (self.count - 1)
+        self.size = 2 * len(KING_SQUARES) * self.span
+        # Runs of identical pieces, whose squares are sorted to make the index unique
+        self.groups = [
+            (i, i + 1) for i in range(1, self.count - 1)
+            if self.types[i] == self.types[i + 1] and self.sides[i] == self.sides[i + 1]
+        ]
+
+    def index(self, stm: int, squares: List[int]) -> int:
+        """Index of a position; the same for every symmetric copy of it."""
+        best = None
+        for transform in KING_TRANSFORMS[squares[0]]:
+            mapped = [transform[sq] for sq in squares]
+            for i, j in self.groups:
+                if mapped[i] > mapped[j]:
+                    mapped[i], mapped[j] = mapped[j], mapped[i]
+            index = KING_INDEX[mapped[0]]
+            for sq in mapped[1:]:
+                index = index * 64 + sq
+            if best is None or index < best:
+                best = index
+        return stm * len(KING_SQUARES) * self.span + best
+
+    def decode(self, index: int) -> Tuple[int, List[int]]:
+        """Inverse of index() for canonical indices: (side to move, squares)."""
+        stm, rest = divmod(index, len(KING_SQUARES) * self.span)
+        king, rest = divmod(rest, self.span)
+        squares = []
+        for _ in range(self.count - 1):
+            rest, sq = divmod(rest, 64)
+            squares.append(sq)
+        squares.reverse()
+        return stm, [KING_SQUARES[king]] + squares
+
+
+def _attacked(target: int, attackers, occupied) -> bool:
+    """Whether any (type, square) attacker hits target, given the occupied squares."""
+    for ptype, sq in attackers:
+        if ptype == "K":
+            if target in KING_TARGETS[sq]:
+                return True
+        elif ptype == "N":
+            if target in KNIGHT_TARGETS[sq]:
+                return True
+        else:
+            line = ALIGNMENT[sq][target]
+            if not line or (ptype == "R" and line != 1) or (ptype == "B" and line != 2):
+                continue
+            if not any(s in occupied for s in BETWEEN[sq][target]):
+                return True
+    return False
+
+
+def _targets(ptype: str, sq: int, occupied) -> List[int]:
+    """Squares a piece moves to (including occupied squares it could capture on)."""
+    if ptype == "K":
+        return list(KING_TARGETS[sq])
+    if ptype == "N":
+        return list(KNIGHT_TARGETS[sq])
+    targets = []
+    for diagonal, ray in RAYS[sq]:
+        if (ptype == "R" and diagonal) or (ptype == "B" and not diagonal):
+            continue
+        for target in ray:
+            targets.append(target)
+            if target in occupied:
+                break
+    return targets
+
+
+def _is_legal(layout: TableLayout, stm: int, squares: List[int]) -> bool:
+    """Distinct squares and the side not to move is not in check."""
+    if len(set(squares)) != layout.count:
+        return False
+    occupied = set(squares)
+    attackers = [(layout.types[i], squares[i]) for i in range(layout.count) if layout.sides[i] == stm]
+    return not _attacked(squares[layout.kings[1 - stm]], attackers, occupied)
+
+
+def _in_check(layout: TableLayout, stm: int, squares: List[int]) -> bool:
+    occupied = set(squares)
+    attackers = [(layout.types[i], squares[i]) for i in range(layout.count) if layout.sides[i] != stm]
+    return _attacked(squares[layout.kings[stm]], attackers, occupied)
+
+
+def _successors(layout: TableLayout, stm: int, squares: List[int]):
+    """Yield (captured piece index or None, new squares) for every legal move of the side to move."""
+    types, sides = layout.types, layout.sides
+    occupant = {sq: i for i, sq in enumerate(squares)}
+    king = layout.kings[stm]
+    for i in range(layout.count):
+        if sides[i] != stm:
+            continue
+        for to in _targets(types[i], squares[i], occupant):
+            captured = occupant.get(to)
+            if captured is not None and (sides[captured] == stm or types[captured] == "K"):
+                continue
+            new = list(squares)
+            new[i] = to
+            attackers = [
+                (types[k], new[k]) for k in range(layout.count)
+                if sides[k] != stm and k != captured
+            ]
+            if _attacked(new[king], attackers, set(new)):
+                continue
+            yield captured, new
+
+
+def _predecessors(layout: TableLayout, stm: int, squares: List[int]):
+    """Yield indices of positions from which the previous mover could have reached this one (no uncaptures)."""
+    mover = 1 - stm
+    occupant = {sq: i for i, sq in enumerate(squares)}
+    for i in range(layout.count):
+        if layout.sides[i] != mover:
+            continue
+        for origin in _targets(layout.types[i], squares[i], occupant):
+            if origin in occupant:
+                continue
+            previous = list(squares)
+            previous[i] = origin
+            yield layout.index(mover, previous)
+
+
+class Tablebase:
+    """A generated table, memory-mapped read-only."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:4] != MAGIC or self._data[4] != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a tablebase file")
+        self.signature = self._data[6:HEADER_SIZE].rstrip(b"\0").decode("ascii")
+        self.layout = TableLayout(self.signature)
+        if len(self._data) != HEADER_SIZE + self.layout.size:
+            self.close()
+            raise ValueError(f"{path} has the wrong size for {self.signature}")
+
+    def lookup(self, stm: int, squares: List[int]) -> Tuple[int, int]:
+        """(wdl, dtm plies) for the side to move; squares in layout order."""
+        return decode_value(self._data[HEADER_SIZE + self.layout.index(stm, squares)])
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+
+_tables: Dict[Tuple[str, str], Optional[Tablebase]] = {}
+_tables_lock = threading.Lock()
+
+
+def get_directory() -> str:
+    return os.getenv("TABLEBASE_PATH", DEFAULT_TABLEBASE_DIR)
+
+
+def table_path(signature: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or get_directory(), f"{signature}.tbl")
+
+
+def load_table(signature: str, directory: Optional[str] = None) -> Optional[Tablebase]:
+    """Open (once) and return the table for a signature, or None if it has not been generated."""
+    directory = directory or get_directory()
+    key = (directory, signature)
+    if key not in _tables:
+        with _tables_lock:
+            if key not in _tables:
+                path = table_path(signature, directory)
+                _tables[key] = Tablebase(path) if os.path.exists(path) else None
+    return _tables[key]
+
+
+def _lookup_pieces(pieces: List[Tuple[int, str, int]], stm: int, directory: Optional[str] = None) -> Optional[Tuple[int, int]]:
+    """
+    Probe a position given as (side, type, square) tuples.
+
+    Returns:
+        (wdl, dtm plies) for the side to move, or None when no table covers the material
+    """
+    if len(pieces) > MAX_PIECES:
+        return None
+    white = "".join(t for side, t, _ in pieces if side == WHITE and t != "K")
+    black = "".join(t for side, t, _ in pieces if side == BLACK and t != "K")
+    signature, flipped = canonical_signature(white, black)
+    if signature in DRAWN_SIGNATURES:
+        return 0, 0
+
+    table = load_table(signature, directory)
+    if table is None:
+        return None
+
+    if flipped:
+        pieces = [(1 - side, t, (7 - sq // 8) * 8 + sq % 8) for side, t, sq in pieces]
+        stm = 1 - stm
+
+    remaining = list(pieces)
+    squares = []
+    for side, ptype in zip(table.layout.sides, table.layout.types):
+        for k, (p_side, p_type, sq) in enumerate(remaining):
+            if p_side == side and p_type == ptype:
+                squares.append(sq)
+                del remaining[k]
+                break
+    return table.lookup(stm, squares)
+
+
+def _board_pieces(board: Board) -> Optional[List[Tuple[int, str, int]]]:
+    """Pieces of a board as (side, type, square), or None if it is out of tablebase scope."""
+    pieces = []
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece is None:
+                continue
+            ptype = piece.symbol().upper()
+            if ptype == "P" or len(pieces) == MAX_PIECES:
+                return None
+            pieces.append((WHITE if piece.color == 'white' else BLACK, ptype, row * 8 + col))
+    if any(castling_rights(board)):
+        return None
+    return pieces
+
+
+def probe(board: Board, color: str) -> Optional[Tuple[int, int]]:
+    """
+    Probe the tablebases for a position.
+
+    Args:
+        board: Position to probe
+        color: Side to move
+
+    Returns:
+        (wdl, dtm) where wdl is 1 (win), 0 (draw) or -1 (loss) for the side to
+        move and dtm is the distance to mate in plies; None if not covered.
+    """
+    pieces = _board_pieces(board)
+    if pieces is None:
+        return None
+    return _lookup_pieces(pieces, WHITE if color == 'white' else BLACK)
+
+
+def tablebase_score(board: Board, color: str) -> Optional[float]:
+    """Search score of a tablebase result for the side to move (faster mates score higher), or None."""
+    result = probe(board, color)
+    if result is None:
+        return None
+    wdl, dtm = result
+    return wdl * (TB_WIN_SCORE - dtm)
+
+
+def best_move(board: Board, color: str):
+    """
+    Pick the move that keeps the best tablebase result: the fastest mate when
+    winning, any holding move when drawn and the longest defence when losing.
+
+    Returns:
+        ((from_pos, to_pos)) or None when the position is not covered
+    """
+    if probe(board, color) is None:
+        return None
+
+    opponent = 'black' if color == 'white' else 'white'
+    best, best_score = None, None
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece is None or piece.color != color:
+                continue
+            for to_pos in piece.get_valid_moves(board):
+                child = board.copy()
+                if not child.move_piece((row, col), to_pos):
+                    continue
+                result = probe(child, opponent)
+                if result is None:
+                    # A capture into an uncovered ending; treat it as a draw
+                    score = 0
+                else:
+                    wdl, dtm = result
+                    score = -wdl * (TB_WIN_SCORE - dtm)
+                if best_score is None or score > best_score:
+                    best, best_score = ((row, col), to_pos), score
+    return best
+
+
+def _write_table(signature: str, values: bytearray, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    header = MAGIC + bytes([FORMAT_VERSION, len(TableLayout(signature).types)])
+    header += signature.encode("ascii").ljust(HEADER_SIZE - len(header), b"\0")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(values)
+    os.replace(tmp_path, path)
+
+
+def sub_signatures(signature: str) -> List[str]:
+    """Signatures reachable from this one by a single capture (excluding trivial draws)."""
+    layout = TableLayout(signature)
+    result = set()
+    for i in range(layout.count):
+        if layout.types[i] == "K":
+            continue
+        white = "".join(t for k, t in enumerate(layout.types) if layout.sides[k] == WHITE and t != "K" and k != i)
+        black = "".join(t for k, t in enumerate(layout.types) if layout.sides[k] == BLACK and t != "K" and k != i)
+        sub, _ = canonical_signature(white, black)
+        if sub not in DRAWN_SIGNATURES:
+            result.add(sub)
+    return sorted(result)
+
+
+def generate_table(signature: str, directory: Optional[str] = None,
+                   progress: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Generate a table by retrograde analysis and write it to directory.
+
+    Tables for the endings reachable by a capture are generated first if missing.
+    Checkmates seed level 0; each following level resolves positions whose DTM
+    equals that level. Candidates come from un-moving the positions resolved at
+    the previous level (and from captures into sub-tables) and are confirmed by
+    generating their moves. Positions still open at the end are draws.
+
+    Returns:
+        str: Path of the written table
+    """
+    directory = directory or get_directory()
+    signature, _ = canonical_signature(*_split_signature(signature))
+    if len(TableLayout(signature).types) > MAX_PIECES:
+        raise ValueError(f"Tablebases support at most {MAX_PIECES} pieces")
+    if signature in DRAWN_SIGNATURES:
+        raise ValueError(f"{signature} is always a draw and needs no table")
+
+    for sub in sub_signatures(signature):
+        if load_table(sub, directory) is None:
+            generate_table(sub, directory, progress)
+
+    layout = TableLayout(signature)
+    report = progress or (lambda message: None)
+    values = bytearray(layout.size)
+    resolved = bytearray(layout.size)  # 0 = open, 1 = resolved, 2 = illegal or non-canonical
+    pending = defaultdict(set)
+
+    def capture_result(stm, squares, captured):
+        pieces = [(layout.sides[k], layout.types[k], squares[k]) for k in range(layout.count) if k != captured]
+        return _lookup_pieces(pieces, 1 - stm, directory)
+
+    report(f"{signature}: scanning {layout.size} positions")
+    previous = []
+    for index in range(layout.size):
+        stm, squares = layout.decode(index)
+        if not _is_legal(layout, stm, squares) or layout.index(stm, squares) != index:
+            resolved[index] = 2
+            continue
+        has_move = False
+        for captured, new in _successors(layout, stm, squares):
+            has_move = True
+            if captured is not None:
+                wdl, dtm = capture_result(stm, new, captured)
+                if wdl:
+                    pending[dtm + 1].add(index)
+        if not has_move:
+            resolved[index] = 1
+            if _in_check(layout, stm, squares):
+                values[index] = encode_value(-1, 0)
+                previous.append(index)
+
+    level = 1
+    while previous or any(key >= level for key in pending):
+        candidates = pending.pop(level, set())
+        for index in previous:
+            stm, squares = layout.decode(index)
+            candidates.update(_predecessors(layout, stm, squares))
+
+        current = []
+        for index in candidates:
+            if resolved[index]:
+                continue
+            stm, squares = layout.decode(index)
+            if level % 2:
+                # Win: some move reaches a position lost in level - 1 plies
+                for captured, new in _successors(layout, stm, squares):
+                    if captured is None:
+                        child = layout.index(1 - stm, new)
+                        result = decode_value(values[child]) if resolved[child] == 1 else None
+                    else:
+                        result = capture_result(stm, new, captured)
+                    if result == (-1, level - 1):
+                        values[index] = encode_value(1, level)
+                        current.append(index)
+                        break
+            else:
+                # Loss: every move reaches a won position, the slowest in level - 1 plies
+                longest = -1
+                for captured, new in _successors(layout, stm, squares):
+                    if captured is None:
+                        child = layout.index(1 - stm, new)
+                        result = decode_value(values[child]) if resolved[child] == 1 else None
+                    else:
+                        result = capture_result(stm, new, captured)
+                    if result is None or result[0] != 1:
+                        break
+                    longest = max(longest, result[1])
+                else:
+                    if longest == level - 1:
+                        values[index] = encode_value(-1, level)
+                        current.append(index)
+        for index in current:
+            resolved[index] = 1
+        if current:
+            report(f"{signature}: {len(current)} positions with DTM {level}")
+        previous = current
+        level += 1
+
+    path = table_path(signature, directory)
+    _write_table(signature, values, path)
+    with _tables_lock:
+        _tables.pop((directory, signature), None)
+    report(f"{signature}: written to {path}")
+    return path
+
+
+def _split_signature(signature: str) -> Tuple[str, str]:
+    """'KRKN' -> ('R', 'N')"""
+    signature = signature.upper()
+    if not signature.startswith("K") or signature.count("K") != 2:
+        raise ValueError(f"Invalid signature: {signature}")
+    second_king = signature.index("K", 1)
+    strong, weak = signature[1:second_king], signature[second_king + 1:]
+    if any(p not in PIECE_ORDER for p in strong + weak):
+        raise ValueError(f"Only pawnless endings are supported: {signature}")
+    return strong, weak
@@ -0,0 +1,271 @@
+"""
+Headless bot-vs-bot tournaments.
+
+Plays games between bots from BOT_REGISTRY with a plain GameManager (no Flask
+request, no database) and spreads the games across a process pool. Results are
+summarised as win/draw/loss tables, Elo estimates and per-bot timing figures.
+"""
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.bots import BOT_REGISTRY
+from app.game import GameManager
+
+# Games that run longer than this are adjudicated as draws
+DEFAULT_MAX_PLIES = 300
+
+# Rating the field average is anchored to
+ELO_ANCHOR = 1500.0
+
+Pairing = Tuple[str, str]  # (white bot id, black bot id)
+
+
+def play_game(white_key: str, black_key: str, max_plies: int = DEFAULT_MAX_PLIES, seed: Optional[int] = None) -> dict:
+    """
+    Play a single game between two registered bots and return its record.
+
+    Args:
+        white_key: BOT_REGISTRY id of the white bot
+        black_key: BOT_REGISTRY id of the black bot
+        max_plies: Number of plies after which the game is adjudicated a draw
+        seed: Optional seed for the random number generator (makes games reproducible)
+
+    Returns:
+        dict: Game record with the result ('1-0', '0-1' or '1/2-1/2'), the reason,
+              the number of plies and per-color thinking time, move and node counts
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    manager = GameManager()
+    manager.set_players(
+        BOT_REGISTRY[white_key](color="white"),
+        BOT_REGISTRY[black_key](color="black")
+    )
+
+    think_time = {'white': 0.0, 'black': 0.0}
+    moves = {'white': 0, 'black': 0}
+    nodes = {'white': 0, 'black': 0}
+    result, reason = None, None
+
+    while manager.version < max_plies:
+        color = manager.current_turn
+        if manager.is_game_over():
+            break
+
+        player = manager.get_current_player()
+        start = time.perf_counter()
+        move = player.decide_move(manager.board)
+        think_time[color] += time.perf_counter() - start
+        moves[color] += 1
+        nodes[color] += player.nodes_searched
+
+        if not move:
+            break
+        from_pos, to_pos = move
+        if not manager.make_move(from_pos, to_pos):
+            # An illegal move forfeits the game
+            result = '0-1' if color == 'white' else '1-0'
+            reason = f"illegal move by {color}"
+            break
+
+    if result is None:
+        status = manager.status()
+        if status.state == 'checkmate':
+            result = '1-0' if status.winner == 'white' else '0-1'
+            reason = "checkmate"
+        elif status.state == 'draw':
+            result = '1/2-1/2'
+            reason = status.draw_reason
+        else:
+            result = '1/2-1/2'
+            reason = "move limit"
+
+    return {
+        'white': white_key,
+        'black': black_key,
+        'result': result,
+        'reason': reason,
+        'plies': manager.version,
+        'think_time': think_time,
+        'moves': moves,
+        'nodes': nodes
+    }
+
+
+def round_robin_pairings(bot_keys: Iterable[str], games_per_pair: int = 2) -> List[Pairing]:
+    """Every bot plays every other bot games_per_pair times, alternating colors."""
+    pairings = []
+    for first, second in combinations(bot_keys, 2):
+        for game in range(games_per_pair):
+            pairings.append((first, second) if game % 2 == 0 else (second, first))
+    return pairings
+
+
+def gauntlet_pairings(challenger: str, opponents: Iterable[str], games_per_pair: int = 2) -> List[Pairing]:
+    """The challenger plays each opponent games_per_pair times, alternating colors."""
+    pairings = []
+    for opponent in opponents:
+        if opponent == challenger:
+            continue
+        for game in range(games_per_pair):
+            pairings.append((challenger, opponent) if game % 2 == 0 else (opponent, challenger))
+    return pairings
+
+
+def _play_game_job(job: tuple) -> dict:
+    """Process pool entry point; unpacks a (white, black, max_plies, seed) tuple."""
+    return play_game(*job)
+
+
+def run_tournament(
+    pairings: List[Pairing],
+    workers: int = 1,
+    max_plies: int = DEFAULT_MAX_PLIES,
+    seed: Optional[int] = None
+) -> List[dict]:
+    """
+    Play every pairing and return the list of game records.
+
+    Args:
+        pairings: List of (white bot id, black bot id) tuples
+        workers: Number of worker processes; 1 plays the games in this process
+        max_plies: Move limit per game (see play_game)
+        seed: Base seed; game i is played with seed + i
+
+    Returns:
+        List[dict]: Game records in the same order as the pairings
+    """
+    for white_key, black_key in pairings:
+        for key in (white_key, black_key):
+            if key not in BOT_REGISTRY:
+                raise ValueError(f"Unknown bot: {key}")
+
+    jobs = [
+        (white_key, black_key, max_plies, None if seed is None else seed + i)
+        for i, (white_key, black_key) in enumerate(pairings)
+    ]
+
+    if workers <= 1:
+        return [_play_game_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_play_game_job, jobs))
+
+
+def _game_score(result: str) -> float:
+    """Score of a result string from white's point of view."""
+    return {'1-0': 1.0, '0-1': 0.0}.get(result, 0.5)
+
+
+def estimate_elo(games: List[dict], anchor: float = ELO_ANCHOR, iterations: int = 500) -> Dict[str, float]:
+    """
+    Estimate Elo ratings from game records.
+
+    Fits a logistic (Bradley-Terry) model by gradient steps. Each bot gets one
+    virtual draw against an average opponent so that perfect scores stay finite.
+    Ratings are shifted so that the field average equals the anchor.
+    """
+    players = sorted({g['white'] for g in games} | {g['black'] for g in games})
+    ratings = {p: 0.0 for p in players}
+
+    def expected(rating: float, opponent: float) -> float:
+        return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+    for _ in range(iterations):
+        actual = {p: 0.5 for p in players}
+        predicted = {p: expected(ratings[p], 0.0) for p in players}
+        counts = {p: 1 for p in players}
+        for game in games:
+            white, black = game['white'], game['black']
+            score = _game_score(game['result'])
+            expected_white = expected(ratings[white], ratings[black])
+            actual[white] += score
+            actual[black] += 1.0 - score
+            predicted[white] += expected_white
+            predicted[black] += 1.0 - expected_white
+            counts[white] += 1
+            counts[black] += 1
+        for p in players:
+            ratings[p] += 400.0 * (actual[p] - predicted[p]) / counts[p]
+
+    mean = sum(ratings.values()) / len(ratings) if ratings else 0.0
+    return {p: round(anchor + r - mean, 1) for p, r in ratings.items()}
+
+
+def summarize(games: List[dict]) -> Dict[str, dict]:
+    """
+    Aggregate game records into per-bot standings.
+
+    Returns:
+        Dict[str, dict]: For each bot: games, wins, draws, losses, score,
+                         elo, avg_ply_ms and nodes_per_second (None when the
+                         bot does not report search nodes)
+    """
+    elo = estimate_elo(games)
+    standings = {}
+    totals = {}
+
+    for game in games:
+        score_white = _game_score(game['result'])
+        for color, score in (('white', score_white), ('black', 1.0 - score_white)):
+            key = game[color]
+            row = standings.setdefault(key, {'games': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'score': 0.0})
+            total = totals.setdefault(key, {'time': 0.0, 'moves': 0, 'nodes': 0})
+            row['games'] += 1
+            row['score'] += score
+            if score == 1.0:
+                row['wins'] += 1
+            elif score == 0.0:
+                row['losses'] += 1
+            else:
+                row['draws'] += 1
+            total['time'] += game['think_time'][color]
+            total['moves'] += game['moves'][color]
+            total['nodes'] += game['nodes'][color]
+
+    for key, row in standings.items():
+        total = totals[key]
+        row['elo'] = elo[key]
+        row['avg_ply_ms'] = 1000.0 * total['time'] / total['moves'] if total['moves'] else 0.0
+        row['nodes_per_second'] = total['nodes'] / total['time'] if total['nodes'] and total['time'] else None
+
+    return standings
+
+
+def format_standings(standings: Dict[str, dict]) -> str:
+    """Render standings as a plain-text table, strongest bot first."""
+    header = f"{'Bot':<18}{'Games':>6}{'W':>5}{'D':>5}{'L':>5}{'Score':>8}{'Elo':>8}{'ms/ply':>10}{'NPS':>10}"
+    lines = [header, '-' * len(header)]
+    for key, row in sorted(standings.items(), key=lambda item: item[1]['elo'], reverse=True):
+        nps = f"{row['nodes_per_second']:.0f}" if row['nodes_per_second'] is not None else '-'
+        lines.append(
+            f"{key:<18}{row['games']:>6}{row['wins']:>5}{row['draws']:>5}{row['losses']:>5}"
+            f"{row['score']:>8.1f}{row['elo']:>8.0f}{row['avg_ply_ms']:>10.1f}{nps:>10}"
+        )
+    return "\n".join(lines)
+
+
+def format_crosstable(games: List[dict]) -> str:
+    """Render a head-to-head table of points scored by each row bot against each column bot."""
+    players = sorted({g['white'] for g in games} | {g['black'] for g in games})
+    points = {(a, b): 0.0 for a in players for b in players}
+    played = {(a, b): 0 for a in players for b in players}
+    for game in games:
+        score_white = _game_score(game['result'])
+        points[(game['white'], game['black'])] += score_white
+        points[(game['black'], game['white'])] += 1.0 - score_white
+        played[(game['white'], game['black'])] += 1
+        played[(game['black'], game['white'])] += 1
+
+    width = max(8, max((len(p) for p in players), default=0) + 2)
+    lines = [' ' * width + ''.join(f"{p[:width - 2]:>{width}}" for p in players)]
+    for a in players:
+        cells = []
+        for b in players:
+            cells.append(f"{'x':>{width - 3}}   " if a == b else f"{points[(a, b)]:>{width - 4}.1f}/{played[(a, b)]:<3}")
+        lines.append(f"{a:<{width}}" + ''.join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,59 @@
+"""
+Request-scoped database transactions.
+
+Endpoints add and change rows on db.session (flushing when they need errors
+early) but never commit; commit_unit_of_work() commits once after the view
+returns, or rolls back when the response is an error. A request therefore
+costs at most one COMMIT, and none at all if it did not touch the database.
+
+Views decorated with @read_only read through an autocommit connection, so no
+BEGIN/COMMIT is sent for them.
+"""
+from functools import wraps
+
+from flask import g, jsonify, request
+
+from app.logs import get_logger
+from app.models import db
+
+logger = get_logger("db")
+
+
+def read_only(view):
+    """Mark a view as never writing: its queries skip the transaction."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def begin_read():
+    """
+    Prepare db.session for a query. In a read-only request the session is
+    bound to an autocommit connection before its first statement.
+    """
+    if g.get('read_only') and not db.session().in_transaction():
+        db.session.connection(execution_options={'isolation_level': 'AUTOCOMMIT'})
+
+
+def commit_unit_of_work(response):
+    """after_request hook: commit the request's changes once, or roll back on error responses."""
+    session = db.session()
+    if not session.in_transaction():
+        return response
+    if g.get('read_only') or response.status_code >= 400:
+        session.rollback()
+        return response
+    try:
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.exception("commit failed", extra={'endpoint': request.path})
+        response = jsonify({"error": str(e)})
+        response.status_code = 500
+    return response
+
+
+def init_unit_of_work(app):
+    app.after_request(commit_unit_of_work)
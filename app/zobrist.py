@@ -0,0 +1,106 @@
+"""
+Zobrist hashing of board positions.
+
+A position hash is the XOR of one random 64-bit key per (piece, square), plus
+keys for castling rights, the en passant file and the side to move. The keys
+come from a fixed seed so hashes are stable across processes and restarts,
+which lets them be written to disk (opening book, tablebases) and compared
+between workers.
+"""
+import random
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.board import Board
+
+_rng = random.Random(0x1D107C4E55)
+
+# Piece symbols as returned by Piece.symbol()
+PIECE_SYMBOLS = "PNBRQKpnbrqk"
+
+# PIECE_KEYS[symbol][row * 8 + col]
+PIECE_KEYS = {symbol: [_rng.getrandbits(64) for _ in range(64)] for symbol in PIECE_SYMBOLS}
+
+# White kingside, white queenside, black kingside, black queenside
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(4)]
+
+# One key per file of the en passant target square
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+
+# XORed in when white is to move
+WHITE_TO_MOVE_KEY = _rng.getrandbits(64)
+
+
+def castling_rights(board: "Board") -> tuple:
+    """
+    Return (white kingside, white queenside, black kingside, black queenside)
+    castling availability, derived from unmoved kings and rooks on their home squares.
+    """
+    rights = []
+    for color, row in (('white', 7), ('black', 0)):
+        king = board.grid[row][4]
+        king_ok = (
+            king is not None and king.color == color and
+            king.__class__.__name__ == 'King' and not king.has_moved
+        )
+        for rook_col in (7, 0):
+            rook = board.grid[row][rook_col]
+            rights.append(
+                king_ok and rook is not None and rook.color == color and
+                rook.__class__.__name__ == 'Rook' and not rook.has_moved
+            )
+    return tuple(rights)
+
+
+def en_passant_file(board: "Board") -> Optional[int]:
+    """
+    Return the file of the en passant target square, or None.
+
+    Like Polyglot, the file only counts when an enemy pawn stands next to the
+    pawn that just advanced two squares, i.e. when the capture is possible.
+    """
+    if not board.last_move:
+        return None
+    last_from, last_to = board.last_move
+    pawn = board.grid[last_to[0]][last_to[1]]
+    if pawn is None or pawn.__class__.__name__ != 'Pawn' or abs(last_from[0] - last_to[0]) != 2:
+        return None
+    row, col = last_to
+    for adjacent in (col - 1, col + 1):
+        if 0 <= adjacent < 8:
+            neighbour = board.grid[row][adjacent]
+            if neighbour is not None and neighbour.color != pawn.color and neighbour.__class__.__name__ == 'Pawn':
+                return col
+    return None
+
+
+def compute_hash(board: "Board", color_to_move: Optional[str] = None) -> int:
+    """
+    Compute the 64-bit Zobrist hash of a position.
+
+    Args:
+        board: Board to hash
+        color_to_move: Side to move; defaults to board.current_turn
+
+    Returns:
+        int: Unsigned 64-bit hash
+    """
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board.grid[row][col]
+            if piece is not None:
+                key ^= PIECE_KEYS[piece.symbol()][row * 8 + col]
+
+    for i, available in enumerate(castling_rights(board)):
+        if available:
+            key ^= CASTLING_KEYS[i]
+
+    ep_file = en_passant_file(board)
+    if ep_file is not None:
+        key ^= EN_PASSANT_KEYS[ep_file]
+
+    if (color_to_move or board.current_turn) == 'white':
+        key ^= WHITE_TO_MOVE_KEY
+
+    return key
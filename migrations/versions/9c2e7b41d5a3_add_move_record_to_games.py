@@ -0,0 +1,28 @@
+"""add move_record to games
+
+Revision ID: 9c2e7b41d5a3
+Revises: 63490fb72900
+Create Date: 2026-10-19 10:12:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2e7b41d5a3'
+down_revision: Union[str, None] = '63490fb72900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('games', sa.Column('move_record', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('games', 'move_record')
@@ -0,0 +1,34 @@
+"""add indexes for game lookups
+
+Revision ID: b81f3e0c6d27
+Revises: 9c2e7b41d5a3
+Create Date: 2026-10-19 11:03:27.640912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f3e0c6d27'
+down_revision: Union[str, None] = '9c2e7b41d5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_moves_session_move', 'moves', ['session_id', 'move_number'])
+    op.create_index('ix_board_states_session_move', 'board_states', ['session_id', 'move_number'])
+    op.create_index('ix_games_active_last_active', 'games', ['last_active'],
+                    postgresql_where=sa.text("game_status = 'active'"),
+                    sqlite_where=sa.text("game_status = 'active'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_games_active_last_active', table_name='games')
+    op.drop_index('ix_board_states_session_move', table_name='board_states')
+    op.drop_index('ix_moves_session_move', table_name='moves')
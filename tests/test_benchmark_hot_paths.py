@@ -0,0 +1,56 @@
+import json
+
+from utils import benchmark_hot_paths as bench
+
+
+def test_every_benchmark_runs():
+    run = bench.run_benchmarks(list(bench.BENCHMARKS), rounds=1, min_time=0)
+    assert set(run['results']) == set(bench.BENCHMARKS)
+    assert all(result['seconds'] > 0 for result in run['results'].values())
+
+
+def test_suite_covers_hot_paths():
+    names = set(bench.BENCHMARKS)
+    assert {'Board.copy', 'Board.move_piece[validate]', 'Board.move_piece[no validate]', 'Board.is_in_check',
+            'Board.has_any_valid_moves', 'Board.generate_position_key',
+            'GameManager.to_dict', 'GameManager.from_dict'} <= names
+    assert {f'decide_move[{key}]' for key in bench.BOT_REGISTRY} <= names
+    assert set(bench.EVALUATORS) <= names
+
+
+def test_benchmarked_moves_are_legal():
+    setup, _ = bench.BENCHMARKS['Board.move_piece[validate]']
+    assert setup().move_piece(*bench.QUIET_MOVE)
+    assert setup().move_piece(*bench.CAPTURE)
+    for key in bench.BOT_REGISTRY:
+        setup, run = bench.BENCHMARKS[f'decide_move[{key}]']
+        assert run(setup()) is not None
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = {'fast': {'relative': 1.0}, 'slow': {'relative': 1.0}}
+    results = {'fast': {'relative': 1.1}, 'slow': {'relative': 1.5}, 'added': {'relative': 1.0}}
+    assert bench.compare(results, baseline, threshold=0.25) == [
+        ('fast', 1.1, False), ('slow', 1.5, True), ('added', None, False)
+    ]
+
+
+def test_check_fails_on_regression(tmp_path):
+    path = tmp_path / "baseline.json"
+    run = bench.run_benchmarks(['Board.generate_position_key'], rounds=1, min_time=0)
+    bench.save_baseline(str(path), run)
+    data = json.loads(path.read_text())
+    data['results']['Board.generate_position_key']['relative'] /= 10
+    path.write_text(json.dumps(data))
+
+    args = ['--baseline', str(path), '--only', 'generate_position_key', '--rounds', '1', '--min-time', '0']
+    assert bench.main(args + ['--check']) == 1
+    assert bench.main(args) == 0
+
+
+def test_save_keeps_entries_that_were_not_run(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    bench.save_baseline(path, bench.run_benchmarks(['Board.copy'], rounds=1, min_time=0))
+    bench.save_baseline(path, bench.run_benchmarks(['Board.is_in_check'], rounds=1, min_time=0),
+                        bench.load_baseline(path))
+    assert set(bench.load_baseline(path)) == {'Board.copy', 'Board.is_in_check'}
@@ -0,0 +1,111 @@
+import uuid
+
+import pytest
+from flask import Flask
+
+from app.api import api
+from app.game import GameManager
+from app.player import HumanPlayer
+
+
+def _new_manager():
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="white", color="white"), HumanPlayer(name="black", color="black"))
+    return manager
+
+
+def test_version_counts_plies():
+    manager = GameManager()
+    assert manager.version == 0
+    manager.make_move((6, 4), (4, 4))
+    manager.make_move((1, 4), (3, 4))
+    assert manager.version == 2
+
+
+def test_changed_squares_since():
+    manager = GameManager()
+    manager.make_move((6, 4), (4, 4))
+    manager.make_move((1, 3), (3, 3))
+    manager.make_move((4, 4), (3, 3))  # exd5
+
+    assert manager.changed_squares_since(3) == []
+    assert manager.changed_squares_since(2) == [(3, 3), (4, 4)]
+    assert manager.changed_squares_since(0) == [(1, 3), (3, 3), (4, 4), (6, 4)]
+    assert manager.changed_squares_since(4) is None
+
+
+def test_delta_since_reports_new_pieces_and_moves():
+    manager = GameManager()
+    manager.make_move((7, 6), (5, 5))
+    delta = manager.delta_since(0)
+    assert {'position': [7, 6], 'piece': None} in delta['changes']
+    assert {'position': [5, 5], 'piece': {'type': 'Knight', 'color': 'white', 'symbol': 'N'}} in delta['changes']
+    assert delta['new_moves'] == manager.move_history
+
+
+def test_delta_unavailable_before_reload():
+    manager = GameManager.from_dict(_new_manager().to_dict())
+    manager.move_history = [{'from': (6, 4), 'to': (4, 4), 'color': 'white'}]
+    assert manager.delta_since(0) is None
+    assert manager.delta_since(1) == {'changes': [], 'new_moves': []}
+
+
+@pytest.fixture
+def client_and_manager():
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    session_id = str(uuid.uuid4())
+    manager = _new_manager()
+    app.config["games"] = {session_id: manager}
+    return app.test_client(), manager, session_id
+
+
+def test_board_endpoint_full_then_delta(client_and_manager):
+    client, manager, session_id = client_and_manager
+
+    full = client.get(f"/api/board?session_id={session_id}").get_json()
+    assert full['version'] == 0
+    assert len(full['board']) == 8
+    assert full['move_history'] == []
+
+    assert client.get(f"/api/board?session_id={session_id}&since=0").status_code == 304
+
+    manager.make_move((6, 4), (4, 4))
+    delta = client.get(f"/api/board?session_id={session_id}&since=0").get_json()
+    assert delta['version'] == 1
+    assert 'board' not in delta
+    assert [change['position'] for change in delta['changes']] == [[4, 4], [6, 4]]
+    assert len(delta['new_moves']) == 1
+
+
+def test_board_endpoint_unknown_version_gets_full_board(client_and_manager):
+    client, manager, session_id = client_and_manager
+    data = client.get(f"/api/board?session_id={session_id}&since=7").get_json()
+    assert 'board' in data and 'changes' not in data
+
+
+def test_board_etag_and_conditional_get(client_and_manager):
+    client, manager, session_id = client_and_manager
+
+    first = client.get(f"/api/board?session_id={session_id}")
+    etag = first.headers['ETag']
+    assert etag == f'"{manager.etag()}"'
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    cached = client.get(f"/api/board?session_id={session_id}", headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    manager.make_move((6, 4), (4, 4))
+    changed = client.get(f"/api/board?session_id={session_id}", headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_full_board_payload_serialized_once_per_version(client_and_manager, monkeypatch):
+    client, manager, session_id = client_and_manager
+    first = client.get(f"/api/board?session_id={session_id}").get_json()
+    assert manager.board_payload(lambda: pytest.fail("payload not cached"))
+
+    monkeypatch.setattr(manager, "board_state", lambda: pytest.fail("board re-serialized"))
+    assert client.get(f"/api/board?session_id={session_id}").get_json() == first
@@ -0,0 +1,131 @@
+import threading
+import uuid
+
+import pytest
+from flask import Flask
+
+from app.api import api
+from app.bot_jobs import BotJobRunner, CANCELLED, DONE, FAILED
+from app.bots import WhiteIdiotBot, BlackIdiotBot, evaluate_material
+from app.game import GameManager
+from app.minimax_search import minimax_search
+from app.player import HumanPlayer, Player
+
+
+class SlowBot(Player):
+    """Searches until its job is cancelled."""
+
+    def __init__(self, color="white"):
+        super().__init__(name="Slow", color=color)
+
+    def decide_move(self, board):
+        while True:
+            minimax_search(board, 1, self.color, evaluate_material)
+
+
+class BrokenBot(Player):
+    def __init__(self, color="white"):
+        super().__init__(name="Broken", color=color)
+
+    def decide_move(self, board):
+        raise ValueError("no idea")
+
+
+def _manager(white, black=None):
+    manager = GameManager()
+    manager.set_players(white, black or BlackIdiotBot())
+    return manager
+
+
+@pytest.fixture
+def runner():
+    runner = BotJobRunner(max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+def test_job_computes_legal_move(runner):
+    manager = _manager(WhiteIdiotBot())
+    job = runner.submit("game", manager)
+    assert job.wait(5)
+    assert job.state == DONE
+    assert manager.is_legal_move(*job.move)
+    assert manager.version == 0  # Nothing is played until the result is collected
+
+
+def test_submit_reuses_job_for_same_position(runner):
+    manager = _manager(SlowBot())
+    job = runner.submit("game", manager)
+    assert runner.submit("game", manager) is job
+    runner.cancel(job.id)
+    assert job.wait(5)
+
+
+def test_submit_refuses_when_a_human_is_to_move(runner):
+    assert runner.submit("game", _manager(HumanPlayer(name="you", color="white"))) is None
+
+
+def test_submit_reads_the_position_after_a_move_in_progress(runner):
+    manager = _manager(WhiteIdiotBot())
+    submitted = []
+    with manager.lock:
+        thread = threading.Thread(target=lambda: submitted.append(runner.submit("game", manager)))
+        thread.start()
+        thread.join(0.1)
+        assert thread.is_alive()  # Blocked until the move below is complete
+        manager._make_move((6, 4), (4, 4), None)
+    thread.join(5)
+
+    job = submitted[0]
+    assert (job.version, job.color) == (1, "black")
+    assert job.wait(5)
+    assert manager.is_legal_move(*job.move)
+
+
+def test_cancel_stops_running_search(runner):
+    manager = _manager(SlowBot())
+    job = runner.submit("game", manager)
+    assert not job.wait(0.2)
+
+    assert runner.cancel_session("game") == 1
+    assert job.wait(5)
+    assert job.state == CANCELLED
+    assert job.move is None
+
+
+def test_failed_search_reports_error(runner):
+    job = runner.submit("game", _manager(BrokenBot()))
+    assert job.wait(5)
+    assert job.state == FAILED
+    assert job.error == "no idea"
+
+
+@pytest.fixture
+def client_and_session():
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    session_id = str(uuid.uuid4())
+    app.config["games"] = {session_id: _manager(SlowBot(), HumanPlayer(name="you", color="black"))}
+    yield app.test_client(), session_id
+    app.extensions["bot_jobs"].shutdown()
+
+
+def test_async_bot_move_returns_job_and_can_be_cancelled(client_and_session):
+    client, session_id = client_and_session
+    response = client.post("/api/bot-move", json={"session_id": session_id, "async": True})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    poll = client.get(f"/api/bot-move/{job_id}?wait=0.1")
+    assert poll.status_code == 202
+    assert poll.get_json()["state"] in ("pending", "running")
+
+    assert client.delete(f"/api/bot-move/{job_id}").status_code == 200
+    collected = client.get(f"/api/bot-move/{job_id}?wait=5")
+    assert collected.status_code == 409
+    assert collected.get_json()["state"] == CANCELLED
+
+
+def test_unknown_job_is_404(client_and_session):
+    client, _ = client_and_session
+    assert client.get("/api/bot-move/nope").status_code == 404
@@ -0,0 +1,75 @@
+import threading
+
+from flask import Flask
+
+from app import cleanup
+from app.bot_jobs import get_job_runner
+from app.cleanup import CleanupScheduler, purge_in_memory, start_cleanup_scheduler
+from app.game import GameManager
+from app.player import HumanPlayer
+from tests.test_bot_jobs import SlowBot
+
+
+def _app(**config):
+    app = Flask(__name__)
+    app.config["games"] = {}
+    app.config.update(config)
+    return app
+
+
+def test_purge_drops_games_and_cancels_their_jobs():
+    app = _app()
+    manager = GameManager()
+    manager.set_players(SlowBot(), HumanPlayer(name="you", color="black"))
+    app.config["games"] = {"a": manager, "b": GameManager()}
+    job = get_job_runner(app).submit("a", manager)
+    try:
+        assert purge_in_memory(app, ["a", "missing"]) == 1
+        assert list(app.config["games"]) == ["b"]
+        assert job.wait(5)
+    finally:
+        app.extensions["bot_jobs"].shutdown()
+
+
+def test_scheduler_runs_cleanup_periodically(monkeypatch):
+    app = _app()
+    calls = []
+    ran_twice = threading.Event()
+
+    def fake_cleanup(app, timeout_minutes, batch_size):
+        calls.append((timeout_minutes, batch_size))
+        if len(calls) >= 2:
+            ran_twice.set()
+        return 0
+
+    monkeypatch.setattr(cleanup, "cleanup_abandoned_games", fake_cleanup)
+    scheduler = CleanupScheduler(app, interval_seconds=0.01, timeout_minutes=30, batch_size=50).start()
+    try:
+        assert ran_twice.wait(5)
+    finally:
+        scheduler.stop(timeout=5)
+    assert calls[0] == (30, 50)
+
+
+def test_scheduler_survives_failed_runs(monkeypatch):
+    app = _app()
+
+    def failing_cleanup(app, timeout_minutes, batch_size):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(cleanup, "cleanup_abandoned_games", failing_cleanup)
+    scheduler = CleanupScheduler(app, interval_seconds=0.01, timeout_minutes=30).start()
+    try:
+        for _ in range(500):
+            if scheduler.runs >= 2:
+                break
+            threading.Event().wait(0.01)
+        assert scheduler.runs >= 2
+    finally:
+        scheduler.stop(timeout=5)
+
+
+def test_scheduler_disabled_with_zero_interval():
+    app = _app(CLEANUP_INTERVAL_SECONDS=0)
+    assert start_cleanup_scheduler(app) is None
+    assert "cleanup_scheduler" not in app.extensions
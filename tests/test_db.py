@@ -1,13 +1,22 @@
+import os
+
 import pytest
 from sqlalchemy import inspect, create_engine
 from sqlalchemy.orm import sessionmaker
-from app.config import Config
 from app.models import Game, BoardState, db
+from app.storage import configure_sqlite, engine_options, is_sqlite
+
+# In-memory SQLite by default; set TEST_DATABASE_URL to run against Postgres
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite://")
 
 @pytest.fixture(scope="session")
 def engine():
-    """Fixture to create a SQLAlchemy engine (using the DATABASE_URL from Config)."""
-    return create_engine(Config.SQLALCHEMY_DATABASE_URI)
+    """Fixture to create a SQLAlchemy engine for TEST_DATABASE_URL, with the schema created."""
+    engine = create_engine(TEST_DATABASE_URL, **engine_options(TEST_DATABASE_URL))
+    if is_sqlite(TEST_DATABASE_URL):
+        configure_sqlite(engine)
+        db.metadata.create_all(engine)
+    return engine
 
 
 @pytest.fixture(scope="session")
@@ -33,8 +42,8 @@ def session(Session):
 
 @pytest.mark.parametrize("table_name", ["games", "board_states", "moves"])
 def test_table_exists(inspector, table_name):
-    """Test that the given table exists in the database (in the 'public' schema)."""
-    assert inspector.has_table(table_name, schema="public"), f"Table {table_name} does not exist."
+    """Test that the given table exists in the database (in the default schema)."""
+    assert inspector.has_table(table_name), f"Table {table_name} does not exist."
 
 
 def test_insert_and_query_game(session):
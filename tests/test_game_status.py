@@ -0,0 +1,145 @@
+import sys
+import threading
+
+import pytest
+from app.board import Board
+from app.game import GameManager, GameStatus
+from pieces import King, Queen, Rook, Bishop, Knight, Pawn
+
+
+def _fools_mate(manager):
+    for from_pos, to_pos in [((6, 5), (5, 5)), ((1, 4), (3, 4)), ((6, 6), (4, 6)), ((0, 3), (4, 7))]:
+        assert manager.make_move(from_pos, to_pos)
+
+
+@pytest.mark.parametrize("piece_cls, piece_pos, target, expected", [
+    (Knight, (5, 5), (7, 4), True),
+    (Knight, (5, 4), (7, 4), False),
+    (Rook, (7, 0), (7, 4), True),
+    (Bishop, (4, 1), (7, 4), True),
+    (Queen, (4, 4), (7, 4), True),
+    (Pawn, (6, 3), (7, 4), True),   # black pawn attacks downwards
+    (Pawn, (7, 3), (7, 4), False),
+    (King, (6, 5), (7, 4), True),
+])
+def test_is_square_attacked(piece_cls, piece_pos, target, expected):
+    board = Board()
+    board.place_piece(piece_cls("black"), piece_pos)
+    assert board.is_square_attacked(target, "black") is expected
+    assert board.is_square_attacked(target, "white") is False
+
+
+def test_sliding_attack_is_blocked():
+    board = Board()
+    board.place_piece(Rook("black"), (7, 0))
+    board.place_piece(Knight("white"), (7, 2))
+    assert not board.is_square_attacked((7, 4), "black")
+
+
+def test_pinned_piece_cannot_move_and_board_is_restored():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(Bishop("white"), (6, 4))
+    board.place_piece(Rook("black"), (0, 4))
+    before = [row[:] for row in board.grid]
+
+    assert board.leaves_king_in_check((6, 4), (5, 3))
+    assert not board.move_piece((6, 4), (5, 3))
+    assert board.grid == before
+
+
+def test_en_passant_legality_restores_captured_pawn():
+    board = Board()
+    board.place_piece(King("white"), (3, 0))
+    board.place_piece(Pawn("white"), (3, 4))
+    board.place_piece(Rook("black"), (3, 7))
+    board.place_piece(King("black"), (0, 0))
+    board.place_piece(Pawn("black"), (1, 5))
+    board.move_piece((1, 5), (3, 5), validate=False)
+
+    # Capturing en passant removes both pawns from the rank and exposes the king
+    assert board.leaves_king_in_check((3, 4), (2, 5))
+    assert isinstance(board.get_piece_at((3, 5)), Pawn)
+    assert board.get_piece_at((2, 5)) is None
+
+
+def test_legality_checks_do_not_touch_the_shared_grid():
+    # Request threads evaluate the live board concurrently, so checks must only read it
+    board = Board()
+    board.setup_standard_position()
+    before = [row[:] for row in board.grid]
+    errors = []
+
+    def check():
+        try:
+            for _ in range(30):
+                assert len(list(board.iter_legal_moves("white"))) == 20
+                assert board.grid == before
+        except Exception as error:
+            errors.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible
+    try:
+        threads = [threading.Thread(target=check) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+
+
+def test_iter_legal_moves_from_start():
+    board = Board()
+    board.setup_standard_position()
+    assert len(list(board.iter_legal_moves("white"))) == 20
+
+
+def test_status_active_at_start():
+    manager = GameManager()
+    status = manager.status()
+    assert status.state == "active"
+    assert not status.is_over
+    assert manager.get_game_status() == "active"
+
+
+def test_status_checkmate():
+    manager = GameManager()
+    _fools_mate(manager)
+    status = manager.status()
+    assert status.state == "checkmate"
+    assert status.winner == "black"
+    assert status.in_check and status.is_over
+    assert manager.get_game_status() == "Checkmate! Black wins."
+    assert status.to_dict()["game_over"] is True
+
+
+def test_status_stalemate():
+    manager = GameManager()
+    manager.board = Board()
+    manager.board.place_piece(King("black"), (0, 0))
+    manager.board.place_piece(Queen("white"), (2, 1))
+    manager.board.place_piece(King("white"), (7, 7))
+    manager.current_turn = "black"
+    status = manager.status()
+    assert status.state == "draw"
+    assert status.draw_reason == "stalemate"
+    assert manager.get_game_status() == "Draw by stalemate."
+
+
+def test_status_is_memoized_per_position(monkeypatch):
+    manager = GameManager()
+    calls = []
+    original = GameStatus.evaluate
+    monkeypatch.setattr(GameStatus, "evaluate", classmethod(lambda cls, board, color: calls.append(color) or original(board, color)))
+
+    first = manager.status()
+    assert manager.status() is first
+    assert manager.is_game_over() is False
+    assert len(calls) == 1
+
+    manager.make_move((6, 4), (4, 4))
+    assert manager.status() is not first
+    assert len(calls) == 2
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from app.board import Board
+from app.game import GameManager
+from app.move_scoring import find_best_greedy_move, find_random_move
+from app.search_stats import SearchStats
+from pieces import King, Bishop, Queen, Rook
+
+
+def test_legal_moves_cached_until_board_changes():
+    board = Board()
+    board.setup_standard_position()
+    moves = board.legal_moves("white")
+    assert board.legal_moves("white") is moves
+    assert sum(len(targets) for targets in moves.values()) == 20
+
+    board.move_piece((6, 4), (4, 4))
+    assert board.legal_moves("white") is not moves
+    assert (4, 4) not in board.legal_moves("black")
+
+
+def test_legal_moves_cache_is_per_color():
+    board = Board()
+    board.setup_standard_position()
+    white = board.legal_moves("white")
+    black = board.legal_moves("black")
+    assert (6, 4) in white and (1, 4) in black
+    assert (6, 4) not in black
+
+
+def test_get_valid_moves_excludes_pinned_piece_moves():
+    manager = GameManager()
+    manager.board = Board()
+    manager.board.place_piece(King("white"), (7, 4))
+    manager.board.place_piece(Bishop("white"), (6, 4))
+    manager.board.place_piece(Rook("black"), (0, 4))
+    manager.board.place_piece(King("black"), (0, 0))
+
+    assert manager.get_valid_moves((6, 4)) == []
+    assert not manager.make_move((6, 4), (5, 3))
+    assert manager.move_history == []
+
+
+def test_get_valid_moves_only_for_side_to_move():
+    manager = GameManager()
+    assert sorted(manager.get_valid_moves((6, 4))) == [(4, 4), (5, 4)]
+    assert manager.get_valid_moves((1, 4)) == []
+    assert manager.get_valid_moves((4, 4)) == []
+
+
+def test_make_move_uses_and_refreshes_cache():
+    manager = GameManager()
+    assert manager.is_legal_move((6, 6), (5, 5)) is False
+    assert manager.make_move((7, 6), (5, 5))
+    assert manager.current_turn == "black"
+    assert manager.get_valid_moves((7, 6)) == []
+    assert sorted(manager.get_valid_moves((0, 6))) == [(2, 5), (2, 7)]
+
+
+def _boxed_in_king(in_check):
+    """Black king on a8 with no moves: mated by the queen on b7 (guarded by the king on c6) or stalemated by one on b6."""
+    board = Board()
+    board.place_piece(King("black"), (0, 0))
+    board.place_piece(King("white"), (2, 2))
+    board.place_piece(Queen("white"), (1, 1) if in_check else (2, 1))
+    return board
+
+
+def test_random_and_greedy_moves_come_from_one_enumeration_without_copies(monkeypatch):
+    board = Board()
+    board.setup_standard_position()
+    board.move_piece((6, 4), (4, 4))
+    board.move_piece((1, 5), (3, 5))
+    board.move_piece((7, 3), (3, 7))  # Qh5+: black must answer the check
+    legal = [(from_pos, to_pos) for from_pos, targets in board.legal_moves("black").items() for to_pos in targets]
+
+    def no_copies(self):
+        raise AssertionError("Board.copy() called")
+    monkeypatch.setattr(Board, "copy", no_copies)
+    for seed in range(10):
+        random.seed(seed)
+        assert find_random_move(board, "black") in legal
+        assert find_best_greedy_move(board, "black", use_book=False) in legal
+
+
+@pytest.mark.parametrize("in_check", [True, False])
+def test_random_and_greedy_moves_none_without_legal_moves(in_check):
+    board = _boxed_in_king(in_check)
+    assert board.is_in_check("black") == in_check
+    stats = SearchStats()
+    assert find_random_move(board, "black") is None
+    assert find_best_greedy_move(board, "black", stats=stats) is None
+    assert stats.nodes == 0 and stats.pv == []
+
+
+def test_lazy_random_move_is_uniform_over_legal_moves():
+    """In check, most pseudo-legal moves are rejected; every legal one is still drawn equally often."""
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(Rook("white"), (6, 0))
+    board.place_piece(Bishop("white"), (5, 2))
+    board.place_piece(Rook("black"), (0, 4))
+    board.place_piece(King("black"), (0, 0))
+    legal = set(board.iter_legal_moves("white"))
+
+    random.seed(1)
+    samples = 600 * len(legal)
+    counts = {}
+    for _ in range(samples):
+        move = find_random_move(board, "white")
+        counts[move] = counts.get(move, 0) + 1
+    assert set(counts) == legal
+    assert all(abs(count - 600) < 120 for count in counts.values())  # About five standard deviations
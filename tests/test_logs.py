@@ -0,0 +1,101 @@
+import io
+import json
+import logging
+
+import pytest
+
+from app.logs import ROOT_LOGGER, DebugSampler, configure_logging, get_logger, stop_listener
+
+
+@pytest.fixture
+def capture():
+    """Configure logging into a buffer; yields (stream, configure) and restores the logger afterwards."""
+    root = logging.getLogger(ROOT_LOGGER)
+    saved = (list(root.handlers), root.level, root.propagate)
+    stream = io.StringIO()
+    listeners = []
+
+    def configure(**kwargs):
+        listener = configure_logging(stream=stream, **kwargs)
+        listeners.append(listener)
+        return listener
+
+    yield stream, configure
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for listener in listeners:
+        stop_listener(listener)
+    root.handlers[:], root.level, root.propagate = saved
+
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_records_carry_extra_fields(capture):
+    stream, configure = capture
+    listener = configure(level='DEBUG', debug_sample_rate=1.0)
+    get_logger("api").info("game created %s", "now", extra={'session_id': 'abc', 'duration_ms': 1.5})
+    listener.stop()
+
+    [entry] = lines(stream)
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'idiotchess.api'
+    assert entry['message'] == 'game created now'
+    assert entry['session_id'] == 'abc'
+    assert entry['duration_ms'] == 1.5
+
+
+def test_debug_records_are_sampled_but_info_always_passes(capture):
+    stream, configure = capture
+    listener = configure(level='DEBUG', debug_sample_rate=0.0)
+    logger = get_logger("api")
+    for _ in range(50):
+        logger.debug("move")
+    logger.info("game created")
+    listener.stop()
+
+    assert [entry['message'] for entry in lines(stream)] == ['game created']
+
+
+def test_level_filters_before_sampling(capture):
+    stream, configure = capture
+    listener = configure(level='WARNING', debug_sample_rate=1.0)
+    logger = get_logger("api")
+    logger.info("ignored")
+    logger.warning("kept")
+    listener.stop()
+
+    assert [entry['message'] for entry in lines(stream)] == ['kept']
+
+
+def test_exceptions_cross_the_queue(capture):
+    stream, configure = capture
+    listener = configure()
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        get_logger("bot_jobs").exception("bot search failed", extra={'session_id': 'abc'})
+    listener.stop()
+
+    [entry] = lines(stream)
+    assert entry['level'] == 'ERROR'
+    assert 'ValueError: boom' in entry['exception']
+    assert entry['session_id'] == 'abc'
+
+
+def test_text_format(capture):
+    stream, configure = capture
+    listener = configure(fmt='text')
+    get_logger("cleanup").info("abandoned games deleted", extra={'deleted': 3})
+    listener.stop()
+
+    assert 'idiotchess.cleanup: abandoned games deleted deleted=3' in stream.getvalue()
+
+
+def test_sampler_rate():
+    sampler = DebugSampler(0.5)
+    record = logging.LogRecord('x', logging.DEBUG, '', 0, 'm', (), None)
+    kept = sum(sampler.filter(record) for _ in range(2000))
+    assert 800 < kept < 1200
+    assert DebugSampler(0.0).filter(logging.LogRecord('x', logging.INFO, '', 0, 'm', (), None))
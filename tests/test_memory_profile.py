@@ -0,0 +1,96 @@
+import tracemalloc
+import uuid
+
+import pytest
+from flask import Flask
+
+from app.api import api
+from app.bots import GreedyBot
+from app.game import GameManager
+from app.memory_profile import SEARCH_MEMORY, game_footprint, memory_report, search_memory, subsystem_of
+from app.player import HumanPlayer
+from utils import profile_memory
+
+
+@pytest.fixture
+def tracing():
+    SEARCH_MEMORY.reset()
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+    SEARCH_MEMORY.reset()
+
+
+def new_game():
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="w", color="white"), HumanPlayer(name="b", color="black"))
+    return manager
+
+
+def test_footprint_components_add_up_and_history_grows():
+    manager = new_game()
+    before = game_footprint(manager)
+    assert before['total'] == sum(size for name, size in before.items() if name != 'total')
+
+    for from_pos, to_pos in (((7, 6), (5, 5)), ((0, 6), (2, 5)), ((5, 5), (7, 6)), ((2, 5), (0, 6))):
+        assert manager.make_move(from_pos, to_pos)
+    after = game_footprint(manager)
+    assert after['history'] > before['history']
+    assert after['moves'] > before['moves']
+
+
+def test_subsystem_of():
+    assert subsystem_of('/srv/app/board.py') == 'board'
+    assert subsystem_of('/srv/pieces/rook.py') == 'board'
+    assert subsystem_of('/srv/app/minimax_search.py') == 'search'
+    assert subsystem_of('/venv/site-packages/sqlalchemy/orm/session.py') == 'database'
+    assert subsystem_of('/usr/lib/python3/collections/__init__.py') == 'other'
+
+
+def test_search_memory_is_a_no_op_without_tracing():
+    SEARCH_MEMORY.reset()
+    with search_memory('GreedyBot') as sample:
+        GreedyBot(color='white').decide_move(new_game().board)
+    assert sample == {}
+    assert SEARCH_MEMORY.to_dict() == {}
+
+
+def test_search_memory_records_peak(tracing):
+    with search_memory('GreedyBot') as sample:
+        GreedyBot(color='white').decide_move(new_game().board)
+    assert sample['peak_bytes'] > 0
+    stats = SEARCH_MEMORY.to_dict()['GreedyBot']
+    assert stats['searches'] == 1
+    assert stats['max_peak_bytes'] == sample['peak_bytes']
+
+
+def test_report_groups_traced_memory_by_subsystem(tracing):
+    games = {'a': new_game(), 'b': new_game()}
+    report = memory_report(games, top=3)
+    assert report['games']['count'] == 2
+    assert report['games']['bytes_per_game'] == game_footprint(games['a'])['total']
+    assert report['subsystems']['board'] > 0
+    assert len(report['top_allocations']) == 3
+
+
+def test_admin_endpoint_requires_profiling_mode():
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    app.config["games"] = {str(uuid.uuid4()): new_game()}
+    client = app.test_client()
+
+    assert client.get("/api/admin/memory").status_code == 404
+
+    app.config["MEMORY_PROFILING"] = True
+    data = client.get("/api/admin/memory").get_json()
+    assert data['games']['count'] == 1
+    assert data['games']['bytes_per_game'] > 0
+    assert set(data['games']['components_per_game']) >= {'pieces', 'history', 'captured', 'moves'}
+
+
+def test_cli_runs(capsys):
+    assert profile_memory.main(['--games', '2', '--plies', '4', '--bots', 'white_idiot', '--repeat', '1']) == 0
+    output = capsys.readouterr().out
+    assert 'Traced memory per game' in output
+    assert 'WhiteIdiotBot' in output
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,74 @@
+import uuid
+
+import pytest
+from flask import Flask
+
+from app.api import api
+from app.game import GameManager
+from app.metrics import METRICS, Histogram, instrument_app, timed
+from app.player import HumanPlayer
+
+
+@pytest.fixture
+def client_and_session(tmp_path):
+    METRICS.reset()
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    instrument_app(app)
+    app.config["PROFILE_DIR"] = str(tmp_path)
+    session_id = str(uuid.uuid4())
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="w", color="white"), HumanPlayer(name="b", color="black"))
+    app.config["games"] = {session_id: manager}
+    yield app, app.test_client(), session_id
+    METRICS.reset()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    for value in (0.005, 0.05, 0.05, 3.0):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [('0.01', 1), ('0.1', 3), ('+Inf', 4)]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(3.105)
+
+
+def test_requests_are_timed_by_endpoint_and_phase(client_and_session):
+    app, client, session_id = client_and_session
+    client.get(f"/api/board?session_id={session_id}")
+    client.get("/api/legal-moves?session_id=missing")
+
+    assert METRICS.requests[("/api/board", "GET", "200")].count == 1
+    assert METRICS.requests[("/api/legal-moves", "GET", "400")].count == 1
+    assert METRICS.phases[("/api/board", "status")].count == 1
+    assert METRICS.phases[("/api/board", "serialize")].count == 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(client_and_session):
+    app, client, session_id = client_and_session
+    client.get(f"/api/board?session_id={session_id}")
+    response = client.get("/metrics")
+    body = response.get_data(as_text=True)
+
+    assert response.mimetype == "text/plain"
+    assert "# TYPE idiotchess_request_duration_seconds histogram" in body
+    assert 'idiotchess_request_duration_seconds_count{endpoint="/api/board",method="GET",status="200"} 1' in body
+    assert 'idiotchess_request_phase_seconds_bucket{endpoint="/api/board",phase="status",le="+Inf"} 1' in body
+
+
+def test_timing_outside_requests_uses_endpoint_label():
+    METRICS.reset()
+    with timed("decide_move", endpoint="bot_job"):
+        pass
+    assert METRICS.phases[("bot_job", "decide_move")].count == 1
+    METRICS.reset()
+
+
+def test_slow_requests_are_profiled(client_and_session, tmp_path):
+    app, client, session_id = client_and_session
+    app.config["PROFILE_SLOW_REQUESTS_MS"] = 0.001
+    client.get(f"/api/board?session_id={session_id}")
+    profiles = list(tmp_path.glob("*.prof"))
+    assert len(profiles) == 1
+    assert "api_board" in profiles[0].name
+    assert METRICS.slow_profiles == 1
@@ -0,0 +1,54 @@
+import random
+
+from app.board import Board
+from app.bots import evaluate_material
+from app.minimax_search import find_best_move, minimax_search
+from app.search_stats import SearchStats
+from pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+
+def _position():
+    """A few pieces each, so that a full-width search stays cheap, and too many for the tablebases."""
+    board = Board()
+    board.place_piece(King("white"), (7, 6))
+    board.place_piece(Queen("white"), (5, 3))
+    board.place_piece(Knight("white"), (5, 5))
+    board.place_piece(Pawn("white"), (6, 6))
+    board.place_piece(King("black"), (0, 6))
+    board.place_piece(Rook("black"), (2, 3))
+    board.place_piece(Bishop("black"), (2, 6))
+    board.place_piece(Pawn("black"), (1, 6))
+    return board
+
+
+def _full_width(board, depth, color, maximizing):
+    """Minimax score without pruning, scored like minimax_search."""
+    if depth == 0:
+        return evaluate_material(board, color)
+    mover = color if maximizing else ('black' if color == 'white' else 'white')
+    scores = []
+    for move in list(board.iter_legal_moves(mover)):
+        child = board.copy()
+        child.move_piece(*move, validate=False)
+        scores.append(_full_width(child, depth - 1, color, not maximizing))
+    if not scores:
+        return float('-inf') if maximizing else float('inf')
+    return max(scores) if maximizing else min(scores)
+
+
+def test_cutoffs_leave_root_move_scores_and_choice_unchanged():
+    board = _position()
+    scores = {}
+    stats = SearchStats()
+    for move in board.iter_legal_moves('white'):
+        child = board.copy()
+        child.move_piece(*move, validate=False)
+        scores[move] = _full_width(child, 2, 'white', False)
+        # Root children are searched with an open window, so their scores are exact
+        assert minimax_search(child, 2, 'white', evaluate_material, maximizing_player=False, stats=stats) == scores[move]
+    assert stats.beta_cutoffs > 0
+
+    best = max(scores.values())
+    for seed in range(3):
+        random.seed(seed)
+        assert scores[find_best_move(board, 'white', 3, evaluate_material, use_book=False)] == best
@@ -0,0 +1,110 @@
+import base64
+import uuid
+
+import pytest
+from flask import Flask
+
+from app.api import api
+from app.board import Board
+from app.game import GameManager
+from app.move_encoding import (
+    RECORD_HEADER, decode_game_record, decode_move, encode_game_record, encode_move
+)
+from app.player import HumanPlayer
+from pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+
+def _new_manager():
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="w", color="white"), HumanPlayer(name="b", color="black"))
+    return manager
+
+
+def _play_random_game(manager, plies, seed=7):
+    import random
+    rng = random.Random(seed)
+    for _ in range(plies):
+        moves = [(f, t) for f, targets in manager.legal_moves().items() for t in targets]
+        if not moves or manager.is_game_over():
+            break
+        manager.make_move(*rng.choice(moves))
+
+
+@pytest.mark.parametrize("promotion", [None, Knight, Bishop, Rook, Queen])
+def test_every_square_pair_round_trips(promotion):
+    for from_square in range(64):
+        for to_square in range(64):
+            from_pos, to_pos = divmod(from_square, 8), divmod(to_square, 8)
+            code = encode_move(from_pos, to_pos, promotion)
+            assert 0 <= code < 1 << 16
+            assert decode_move(code) == (from_pos, to_pos, promotion)
+
+
+def test_record_round_trip_and_size():
+    codes = [encode_move((6, 4), (4, 4)), encode_move((1, 0), (0, 0)), encode_move((1, 1), (0, 1), Knight)]
+    record = encode_game_record(codes, first_color='black')
+    assert len(record) == RECORD_HEADER.size + 2 * len(codes)
+    moves, first_color = decode_game_record(record)
+    assert list(moves) == codes
+    assert first_color == 'black'
+
+
+@pytest.mark.parametrize("data", [b"", b"XXXX\x01\x00\x00\x00\x00\x00", b"ICGR\x01\x00\x00\x00\x00\x02\x00\x01"])
+def test_decode_rejects_bad_records(data):
+    with pytest.raises(ValueError):
+        decode_game_record(data)
+
+
+def test_manager_history_is_stored_compactly():
+    manager = _new_manager()
+    _play_random_game(manager, 60)
+    assert manager.moves.itemsize == 2
+    assert manager.version == len(manager.moves) == len(manager.move_history)
+    assert [move['color'] for move in manager.move_history[:2]] == ['white', 'black']
+    assert len(manager.move_record()) == RECORD_HEADER.size + 2 * manager.version
+
+
+def test_replaying_record_reproduces_position():
+    manager = _new_manager()
+    _play_random_game(manager, 80)
+
+    replay = _new_manager()
+    moves, _ = decode_game_record(manager.move_record())
+    for code in moves:
+        from_pos, to_pos, promotion = decode_move(code)
+        assert replay.make_move(from_pos, to_pos, promotion)
+    assert replay.board_state() == manager.board_state()
+    assert replay.move_history == manager.move_history
+
+
+def test_promotion_is_recorded():
+    manager = _new_manager()
+    manager.board = Board()
+    manager.board.place_piece(King("white"), (7, 4))
+    manager.board.place_piece(King("black"), (0, 7))
+    manager.board.place_piece(Pawn("white"), (1, 0))
+    assert manager.make_move((1, 0), (0, 0), Rook)
+    assert decode_move(manager.moves[0]) == ((1, 0), (0, 0), Rook)
+    assert isinstance(manager.board.get_piece_at((0, 0)), Rook)
+
+
+def test_to_dict_round_trips_move_record():
+    manager = _new_manager()
+    _play_random_game(manager, 20)
+    data = manager.to_dict()
+    assert base64.b64decode(data['move_record']) == manager.move_record()
+    assert GameManager.from_dict(data).move_history == manager.move_history
+
+
+def test_game_record_endpoint_exports_in_memory_game():
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    session_id = str(uuid.uuid4())
+    manager = _new_manager()
+    _play_random_game(manager, 10)
+    app.config["games"] = {session_id: manager}
+
+    response = app.test_client().get(f"/api/game-record?session_id={session_id}")
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
+    assert response.data == manager.move_record()
@@ -0,0 +1,204 @@
+import threading
+
+import pytest
+
+from app.board import Board
+from app.bots import BetterMinimaxBotTwo, MinimaxBot, SilverbackBot, evaluate_material
+from app.minimax_search import SearchCancelled, find_best_move, search_cancel_event
+from app.negamax_search import MATE_SCORE, NegamaxSearch, SearchOptions, find_best_move_pvs, has_non_pawn_material
+from app.position_evaluation import evaluate_position_safety
+from app.search_stats import SearchStats
+from pieces import King, Pawn, Queen, Rook
+
+
+def _middlegame():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(King("black"), (0, 4))
+    board.place_piece(Queen("white"), (5, 3))
+    board.place_piece(Rook("black"), (2, 3))
+    board.place_piece(Pawn("black"), (1, 0))
+    board.place_piece(Pawn("white"), (6, 7))
+    board.place_piece(Pawn("white"), (6, 1))
+    return board
+
+
+def _back_rank_mate():
+    """White mates with Ra1-a8."""
+    board = Board()
+    board.place_piece(King("white"), (7, 6))
+    board.place_piece(Rook("white"), (7, 0))
+    board.place_piece(King("black"), (0, 7))
+    for col in (5, 6, 7):
+        board.place_piece(Pawn("black"), (1, col))
+    return board
+
+
+@pytest.mark.parametrize("depth, evaluate", [(2, evaluate_material), (3, evaluate_material), (2, evaluate_position_safety)])
+def test_same_score_as_minimax_with_fewer_nodes(depth, evaluate):
+    board = _middlegame()
+    minimax, pvs = SearchStats(), SearchStats()
+    find_best_move(board, "white", depth, evaluate, minimax, use_book=False)
+    move = find_best_move_pvs(board, "white", depth, evaluate, pvs, use_book=False)
+
+    assert pvs.score == minimax.score
+    assert pvs.nodes < minimax.nodes
+    assert move is not None and pvs.pv[0] == move
+
+
+def test_fills_in_stats_and_playable_principal_variation():
+    board = _middlegame()
+    stats = SearchStats()
+    find_best_move_pvs(board, "white", 3, evaluate_material, stats, use_book=False)
+
+    assert stats.source == "search" and stats.depth == 3
+    assert set(stats.depth_times) == {1, 2, 3}
+    assert stats.beta_cutoffs > 0
+    assert stats.tt_probes > stats.tt_hits > 0
+    assert len(stats.pv) == 3
+    replay = board.copy()
+    for from_pos, to_pos in stats.pv:
+        assert replay.move_piece(from_pos, to_pos)
+
+
+def test_mates_are_scored_by_distance():
+    stats = SearchStats()
+    move = find_best_move_pvs(_back_rank_mate(), "white", 3, evaluate_material, stats, use_book=False)
+    assert move == ((7, 0), (0, 0))
+    assert stats.score == MATE_SCORE - 1
+
+
+def test_stalemate_scores_zero_and_mated_side_has_no_move():
+    board = Board()
+    board.place_piece(King("black"), (0, 0))
+    board.place_piece(Queen("white"), (2, 1))
+    board.place_piece(King("white"), (7, 7))
+    assert NegamaxSearch(evaluate_material, SearchStats()).negamax(board, 1, -MATE_SCORE, MATE_SCORE, "black", 0) == 0
+
+    mated = _back_rank_mate()
+    assert mated.move_piece((7, 0), (0, 0))
+    assert find_best_move_pvs(mated, "black", 2, evaluate_material, use_book=False) is None
+
+
+def test_cancelled_search_raises():
+    event = threading.Event()
+    event.set()
+    token = search_cancel_event.set(event)
+    try:
+        with pytest.raises(SearchCancelled):
+            find_best_move_pvs(_middlegame(), "white", 2, evaluate_material, use_book=False)
+    finally:
+        search_cancel_event.reset(token)
+
+
+def test_bots_select_the_engine():
+    board = _middlegame()
+    pvs = BetterMinimaxBotTwo(color="white", engine="pvs")
+    minimax = BetterMinimaxBotTwo(color="white", engine="minimax")
+    move = pvs.decide_move(board)
+    minimax.decide_move(board)
+    assert pvs.last_search_stats.pv[0] == move
+    assert pvs.last_search_stats.score == minimax.last_search_stats.score
+    assert pvs.nodes_searched < minimax.nodes_searched
+    with pytest.raises(ValueError):
+        MinimaxBot(color="white", engine="nope")
+
+
+SELECTIVE = SearchOptions(null_move=True, late_move_reductions=True)
+
+
+def test_null_move_and_reductions_search_fewer_nodes():
+    board = _middlegame()
+    plain, selective = SearchStats(), SearchStats()
+    find_best_move_pvs(board, "white", 4, evaluate_material, plain, use_book=False)
+    find_best_move_pvs(board, "white", 4, evaluate_material, selective, use_book=False, options=SELECTIVE)
+
+    assert selective.null_move_cutoffs > 0
+    assert selective.reductions > 0
+    assert selective.nodes < plain.nodes
+    assert plain.null_move_cutoffs == plain.reductions == 0
+
+
+def test_selective_search_still_finds_mate():
+    stats = SearchStats()
+    move = find_best_move_pvs(_back_rank_mate(), "white", 4, evaluate_material, stats, use_book=False, options=SELECTIVE)
+    assert move == ((7, 0), (0, 0))
+    assert stats.score == MATE_SCORE - 1
+
+
+def test_no_null_moves_with_only_king_and_pawns():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(Pawn("white"), (6, 0))
+    board.place_piece(King("black"), (0, 4))
+    board.place_piece(Rook("black"), (0, 0))
+    assert not has_non_pawn_material(board, "white")
+    assert has_non_pawn_material(board, "black")
+
+    stats = SearchStats()
+    find_best_move_pvs(board, "white", 4, evaluate_material, stats, use_book=False,
+                       options=SearchOptions(null_move=True))
+    assert stats.null_move_cutoffs == 0
+
+
+def test_time_limit_keeps_deepest_completed_iteration():
+    stats = SearchStats()
+    move = find_best_move_pvs(_middlegame(), "white", 20, evaluate_material, stats, use_book=False,
+                              options=SearchOptions(time_limit=0.05))
+    assert 1 <= stats.depth < 20
+    assert set(stats.depth_times) == set(range(1, stats.depth + 1))
+    assert move is not None and stats.pv[0] == move
+
+
+def test_silverback_uses_selective_pvs():
+    bot = SilverbackBot(color="white")
+    assert bot.engine == "pvs"
+    move = bot.decide_move(_middlegame())
+    assert move is not None
+    assert bot.last_search_stats.depth >= 3
+    with pytest.raises(ValueError):
+        SilverbackBot(color="white", engine="minimax")
+
+
+def _hanging_rook_behind_defended_pawn():
+    """Black's rook on d5 is defended by the e6 pawn; white's queen can take it but is then lost."""
+    board = Board()
+    board.place_piece(King("white"), (7, 6))
+    board.place_piece(King("black"), (0, 6))
+    board.place_piece(Queen("white"), (5, 3))
+    board.place_piece(Rook("black"), (3, 3))
+    board.place_piece(Pawn("black"), (2, 4))
+    board.place_piece(Pawn("white"), (6, 0))
+    return board
+
+
+def test_losing_captures_are_ordered_after_quiet_moves():
+    board = _hanging_rook_behind_defended_pawn()
+    search = NegamaxSearch(evaluate_material, SearchStats())
+    moves, _ = search.ordered_moves(board, 'white')
+    queen_takes_rook = ((5, 3), (3, 3))
+    assert moves[-1] == queen_takes_rook
+
+
+def test_quiescence_plays_out_captures_and_prunes_losing_ones():
+    board = _hanging_rook_behind_defended_pawn()
+    stats = SearchStats()
+    search = NegamaxSearch(evaluate_material, stats, SearchOptions(quiescence=True))
+    # Qxd5 exd5 loses the queen for a rook, so the leaf keeps its static score
+    assert search.quiesce(board, -float('inf'), float('inf'), 'white', 0) == evaluate_material(board, 'white')
+    assert stats.see_pruned == 1
+    assert stats.qnodes == 0
+
+    board.remove_piece((2, 4))  # Now the rook hangs
+    assert search.quiesce(board, -float('inf'), float('inf'), 'white', 0) == evaluate_material(board, 'white') + 5
+    assert stats.qnodes > 0
+
+
+def test_quiescence_avoids_a_depth_one_blunder():
+    """At depth 1 without quiescence the queen grabs the defended rook; with it, she does not."""
+    board = _hanging_rook_behind_defended_pawn()
+    plain = find_best_move_pvs(board.copy(), 'white', 1, evaluate_material, use_book=False)
+    quiet = find_best_move_pvs(board.copy(), 'white', 1, evaluate_material, use_book=False,
+                               options=SearchOptions(quiescence=True))
+    assert plain == ((5, 3), (3, 3))
+    assert quiet != ((5, 3), (3, 3))
@@ -0,0 +1,88 @@
+import pytest
+from app.board import Board
+from app.move_scoring import find_best_greedy_move
+from app.opening_book import (
+    OpeningBook,
+    build_book_from_pgn,
+    decode_book_move,
+    encode_book_move,
+    parse_san,
+    probe_book,
+    read_pgn_games,
+)
+from pieces import King, Queen, Rook
+
+
+def _start():
+    board = Board()
+    board.setup_standard_position()
+    return board
+
+
+def test_move_encoding_round_trip():
+    board = _start()
+    move = encode_book_move((6, 4), (4, 4))
+    assert decode_book_move(move, board)[:2] == ((6, 4), (4, 4))
+
+
+def test_castling_is_stored_as_king_takes_rook():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(Rook("white"), (7, 7))
+    move = encode_book_move((7, 4), (7, 6), castling=True)
+    assert move & 7 == 7  # to file h
+    assert decode_book_move(move, board)[:2] == ((7, 4), (7, 6))
+
+
+@pytest.mark.parametrize("san, expected", [
+    ("e4", ((6, 4), (4, 4))),
+    ("Nf3", ((7, 6), (5, 5))),
+    ("Nc3", ((7, 1), (5, 2))),
+])
+def test_parse_san_from_start(san, expected):
+    from_pos, to_pos, promotion = parse_san(_start(), san, 'white')
+    assert (from_pos, to_pos) == expected
+    assert promotion is None
+
+
+def test_parse_san_rejects_illegal_move():
+    with pytest.raises(ValueError):
+        parse_san(_start(), "Ke2", 'white')
+
+
+def test_read_pgn_strips_comments_and_variations():
+    text = '[Event "x"]\n\n1. e4 {best by test} e5 (1... c5 2. Nf3) 2. Nf3 $1 Nc6 1-0\n'
+    assert list(read_pgn_games(text)) == [["e4", "e5", "Nf3", "Nc6"]]
+
+
+def test_built_book_is_sorted_and_searchable(tmp_path):
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text('[Event "a"]\n\n1. e4 e5 2. Nf3 *\n\n[Event "b"]\n\n1. e4 c5 *\n\n[Event "c"]\n\n1. d4 d5 *\n')
+    path = str(tmp_path / "book.bin")
+    build_book_from_pgn([str(pgn)], path)
+
+    book = OpeningBook(path)
+    keys = [book._key_at(i) for i in range(len(book))]
+    assert keys == sorted(keys)
+
+    start = _start()
+    entries = dict(book.find(start.position_hash('white')))
+    assert entries == {encode_book_move((6, 4), (4, 4)): 2, encode_book_move((6, 3), (4, 3)): 1}
+    assert book.find(12345) == []
+    book.close()
+
+
+def test_default_book_covers_start_position():
+    board = _start()
+    assert probe_book(board, 'white') is not None
+    assert find_best_greedy_move(board, 'white') in [
+        ((6, 4), (4, 4)), ((6, 3), (4, 3)), ((6, 2), (4, 2)), ((7, 6), (5, 5))
+    ]
+
+
+def test_out_of_book_position_returns_none():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(Queen("white"), (4, 4))
+    board.place_piece(King("black"), (0, 4))
+    assert probe_book(board, 'white') is None
@@ -0,0 +1,97 @@
+import pytest
+
+from app.board import Board
+from app.bots import GreedyBot
+from app.game import GameManager
+from app.pondering import Ponderer, likely_replies
+from app.player import HumanPlayer
+from pieces import King, Pawn, Queen, Rook
+from tests.test_bot_jobs import SlowBot
+
+
+def _human_vs(bot):
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="you", color="white"), bot)
+    return manager
+
+
+@pytest.fixture
+def ponderer():
+    ponderer = Ponderer(max_workers=1, replies_per_round=4, seconds_per_round=10, max_entries=100)
+    yield ponderer
+    ponderer.shutdown()
+
+
+def test_likely_replies_put_biggest_captures_first():
+    board = Board()
+    board.place_piece(King("white"), (7, 0))
+    board.place_piece(King("black"), (0, 0))
+    board.place_piece(Rook("white"), (4, 4))
+    board.place_piece(Queen("black"), (4, 7))
+    board.place_piece(Pawn("black"), (2, 4))
+
+    replies = likely_replies(board, "white")
+    assert replies[0] == ((4, 4), (4, 7))
+    assert replies[1] == ((4, 4), (2, 4))
+    assert len(replies) == sum(len(targets) for targets in board.legal_moves("white").values())
+
+
+def test_pondered_answer_found_after_human_reply(ponderer):
+    manager = _human_vs(GreedyBot(color="black"))
+    ponderer.start("game", manager).result(timeout=30)
+    assert 0 < ponderer.cached_entries <= 4
+
+    reply = likely_replies(manager.board, "white")[0]
+    manager.make_move(*reply)
+    move = ponderer.lookup("game", manager)
+    assert move is not None
+    assert manager.is_legal_move(*move)
+
+
+def test_pondering_leaves_the_game_bot_untouched(ponderer):
+    bot = GreedyBot(color="black")
+    manager = _human_vs(bot)
+    manager.make_move((6, 0), (5, 0))  # Out of the opening book, so the bot searches
+    manager.make_move((1, 7), (2, 7))
+    ponderer.start("game", manager).result(timeout=30)
+    assert ponderer.cached_entries > 0
+    assert bot.last_search_stats is None
+    assert bot.nodes_searched == 0
+
+
+def test_lookup_misses_unpondered_position(ponderer):
+    manager = _human_vs(GreedyBot(color="black"))
+    ponderer.start("game", manager).result(timeout=30)
+    last_reply = likely_replies(manager.board, "white")[-1]
+    manager.make_move(*last_reply)
+    assert ponderer.lookup("game", manager) is None
+
+
+def test_stop_cancels_running_round(ponderer):
+    manager = _human_vs(SlowBot(color="black"))
+    future = ponderer.start("game", manager)
+    ponderer.stop("game")
+    future.result(timeout=5)
+    assert ponderer.cached_entries == 0
+
+
+def test_global_cap_evicts_oldest_game():
+    ponderer = Ponderer(max_workers=1, replies_per_round=4, seconds_per_round=10, max_entries=5)
+    try:
+        first = _human_vs(GreedyBot(color="black"))
+        ponderer.start("first", first).result(timeout=30)
+        first.make_move(*likely_replies(first.board, "white")[0])
+        assert ponderer.lookup("first", first) is not None
+
+        ponderer.start("second", _human_vs(GreedyBot(color="black"))).result(timeout=30)
+        assert ponderer.cached_entries <= 5
+        assert ponderer.lookup("first", first) is None
+    finally:
+        ponderer.shutdown()
+
+
+def test_forget_drops_answers(ponderer):
+    manager = _human_vs(GreedyBot(color="black"))
+    ponderer.start("game", manager).result(timeout=30)
+    ponderer.forget("game")
+    assert ponderer.cached_entries == 0
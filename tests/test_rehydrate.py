@@ -0,0 +1,115 @@
+import random
+import uuid
+
+from flask import Flask
+
+from app.api import api
+from app.bots import GreedyBot, MinimaxBot, WhiteIdiotBot
+from app.game import GameManager
+from app.models import Game
+from app.player import HumanPlayer
+from app.rehydrate import rehydrate_game, restore_player
+
+
+def _played_game(plies, seed=0):
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="you", color="white"), GreedyBot(name="GreedyBot", color="black"))
+    rng = random.Random(seed)
+    while manager.version < plies:
+        moves = [(f, t) for f, targets in manager.legal_moves().items() for t in targets]
+        if not moves:
+            break
+        manager.make_move(*rng.choice(moves))
+    return manager
+
+
+def _game_row(manager):
+    return Game(
+        session_id=uuid.uuid4(),
+        current_turn=manager.current_turn,
+        game_status="active",
+        white_player_type="human",
+        black_player_type="bot",
+        white_player_name="you",
+        black_player_name="GreedyBot",
+        move_record=manager.move_record()
+    )
+
+
+def _moved_flags(board):
+    return [[piece.has_moved if piece else None for piece in row] for row in board.grid]
+
+
+def test_rehydrated_game_matches_original():
+    original = _played_game(120, seed=3)
+    restored = rehydrate_game(_game_row(original))
+
+    assert restored.current_turn == original.current_turn
+    assert restored.board_state() == original.board_state()
+    assert restored.move_history == original.move_history
+    assert restored.board.last_move == original.board.last_move
+    assert restored.board.halfmove_clock == original.board.halfmove_clock
+    assert restored.board.history == original.board.history
+    assert _moved_flags(restored.board) == _moved_flags(original.board)
+    assert restored.legal_moves() == original.legal_moves()
+    assert restored.status().to_dict() == original.status().to_dict()
+
+
+def test_castling_rights_survive_rehydration():
+    manager = _played_game(0)
+    for move in [((6, 6), (4, 6)), ((1, 0), (2, 0)), ((7, 6), (5, 5)), ((2, 0), (3, 0)),
+                 ((7, 5), (6, 6)), ((3, 0), (4, 0))]:
+        assert manager.make_move(*move)
+    restored = rehydrate_game(_game_row(manager))
+    assert restored.is_legal_move((7, 4), (7, 6))
+
+
+def test_from_dict_replays_the_move_record():
+    manager = _played_game(0)
+    manager.set_players(MinimaxBot(color="white"), GreedyBot(color="black"))
+    for move in [((6, 6), (4, 6)), ((1, 0), (2, 0)), ((7, 6), (5, 5)), ((2, 0), (3, 0)),
+                 ((7, 5), (6, 6)), ((3, 0), (4, 0)), ((6, 1), (4, 1))]:
+        assert manager.make_move(*move)
+    restored = GameManager.from_dict(manager.to_dict())
+
+    assert restored.board_state() == manager.board_state()
+    assert restored.board.last_move == manager.board.last_move
+    assert restored.board.history == manager.board.history
+    assert restored.legal_moves() == manager.legal_moves()
+    assert restored.is_legal_move((4, 0), (5, 1))  # En passant after b2-b4
+    assert type(restored.players["white"]) is MinimaxBot
+    assert type(restored.players["black"]) is GreedyBot
+
+
+def test_from_dict_without_move_record_places_pieces_on_an_empty_board():
+    data = _played_game(40, seed=5).to_dict()
+    del data['move_record']
+    restored = GameManager.from_dict(data)
+    assert restored.board_state() == data['board']
+    assert restored.current_turn == data['current_turn']
+
+
+def test_players_restored_by_class_name():
+    assert isinstance(restore_player("bot", "MinimaxBot", "black"), MinimaxBot)
+    assert isinstance(restore_player("bot", "pongo", "white"), GreedyBot)  # Registry key from older games
+    assert isinstance(restore_player("bot", "Unknown", "white"), WhiteIdiotBot)
+    assert restore_player("human", "you", "black").name == "you"
+
+
+def test_rehydrating_200_plies():
+    original = _played_game(200)
+    restored = rehydrate_game(_game_row(original))
+    assert restored.version == 200
+    assert restored.board_state() == original.board_state()
+
+
+def test_endpoints_share_the_in_memory_game():
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    session_id = str(uuid.uuid4())
+    manager = _played_game(10)
+    app.config["games"] = {session_id: manager}
+    client = app.test_client()
+
+    assert client.get(f"/api/legal-moves?session_id={session_id}").get_json()["turn"] == manager.current_turn
+    assert client.get("/api/legal-moves?session_id=not-a-uuid").status_code == 400
@@ -0,0 +1,74 @@
+from app.board import Board
+from app.bots import GreedyBot, MinimaxBot, evaluate_material
+from app.minimax_search import find_best_move
+from app.search_stats import SearchStats
+from pieces import King, Pawn, Queen, Rook
+from tests.test_storage import app  # noqa: F401  (SQLite-backed app fixture)
+
+
+def _middlegame():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(King("black"), (0, 4))
+    board.place_piece(Queen("white"), (5, 3))
+    board.place_piece(Rook("black"), (2, 3))
+    board.place_piece(Pawn("black"), (1, 0))
+    board.place_piece(Pawn("white"), (6, 7))
+    return board
+
+
+def test_search_fills_in_counters_and_principal_variation():
+    board = _middlegame()
+    stats = SearchStats()
+    move = find_best_move(board, "white", 3, evaluate_material, stats, use_book=False)
+
+    assert stats.source == "search"
+    assert stats.depth == 3 and 3 in stats.depth_times
+    assert stats.nodes > stats.interior_nodes > 0
+    assert stats.beta_cutoffs > 0
+    assert 0 < stats.first_move_cutoff_rate <= 1
+    assert stats.branching_factor > 1
+    assert stats.pv[0] == move
+    assert len(stats.pv) == 3
+
+
+def test_principal_variation_is_playable():
+    board = _middlegame()
+    stats = SearchStats()
+    find_best_move(board, "white", 3, evaluate_material, stats, use_book=False)
+    replay = board.copy()
+    for from_pos, to_pos in stats.pv:
+        assert replay.move_piece(from_pos, to_pos)
+
+
+def test_bots_keep_stats_of_last_search():
+    bot = MinimaxBot(color="white")
+    board = _middlegame()
+    move = bot.decide_move(board)
+    assert bot.last_search_stats.pv[0] == move
+    assert bot.nodes_searched == bot.last_search_stats.nodes
+
+    greedy = GreedyBot(color="white")
+    greedy.decide_move(board)
+    assert greedy.last_search_stats.source == "greedy"
+    assert greedy.last_search_stats.nodes == sum(len(t) for t in board.legal_moves("white").values())
+
+
+def test_book_moves_are_reported_as_such():
+    board = Board()
+    board.setup_standard_position()
+    stats = SearchStats()
+    move = find_best_move(board, "white", 2, evaluate_material, stats)
+    assert stats.source == "book"
+    assert stats.pv == [move]
+    assert stats.nodes == 0
+
+
+def test_bot_move_response_includes_stats_on_request(app):  # noqa: F811
+    client = app.test_client()
+    session_id = client.post("/api/new-game/bot", json={"bot_type": "borzoi", "player_color": "black"}).get_json()["session_id"]
+    data = client.post("/api/bot-move", json={"session_id": session_id, "include_stats": True}).get_json()
+    assert data["success"]
+    assert data["search_stats"]["source"] in ("book", "search")
+    assert data["search_stats"]["pv"][0] == [data["move"]["from"], data["move"]["to"]]
+    app.extensions["bot_jobs"].shutdown()
@@ -0,0 +1,83 @@
+import random
+
+from app.board import Board
+from app.bots import GreedyBot
+from app.move_scoring import static_exchange_evaluation
+from pieces import Bishop, King, Knight, Pawn, Queen, Rook
+
+
+def square(name):
+    return 8 - int(name[1]), ord(name[0]) - ord('a')
+
+
+def _board(*placements):
+    board = Board()
+    board.place_piece(King("white"), square("g1"))
+    board.place_piece(King("black"), square("g8"))
+    for piece, name in placements:
+        board.place_piece(piece, square(name))
+    return board
+
+
+def see(board, move):
+    return static_exchange_evaluation(board, square(move[:2]), square(move[2:]))
+
+
+def test_attackers_lists_every_attacker_but_not_xrays():
+    board = _board((Rook("white"), "e1"), (Rook("white"), "e2"), (Knight("white"), "f3"),
+                   (Pawn("white"), "d4"), (Bishop("black"), "b8"))
+    assert sorted(board.attackers(square("e5"), "white")) == sorted([square("e2"), square("f3"), square("d4")])
+    assert board.attackers(square("e5"), "black") == [square("b8")]
+
+
+def test_free_and_defended_captures():
+    assert see(_board((Rook("white"), "e1"), (Pawn("black"), "e5")), "e1e5") == 1
+    assert see(_board((Rook("white"), "e1"), (Pawn("black"), "e5"), (Pawn("black"), "d6")), "e1e5") == -4
+    assert see(_board((Knight("white"), "f3"), (Knight("black"), "e5"), (Pawn("black"), "d6")), "f3e5") == 0
+
+
+def test_xray_attackers_join_the_exchange():
+    # Rxe5 Rxe5 Rxe5: the rook behind wins the last recapture
+    board = _board((Rook("white"), "e1"), (Rook("white"), "e2"), (Pawn("black"), "e5"), (Rook("black"), "e8"))
+    assert see(board, "e2e5") == 1
+    # Without the second white rook the pawn is defended
+    board.remove_piece(square("e1"))
+    assert see(board, "e2e5") == -4
+
+
+def test_defender_stops_when_recapturing_loses():
+    board = _board((Queen("white"), "e2"), (Pawn("white"), "d4"), (Pawn("black"), "e5"), (Knight("black"), "c6"))
+    assert see(board, "d4e5") == 1  # Nxe5 Qxe5 would lose the knight, so black leaves the pawn
+    assert see(board, "e2e5") == -5  # Qxe5 Nxe5 dxe5: a queen for a pawn and a knight
+
+
+def test_quiet_moves_onto_attacked_squares():
+    board = _board((Knight("white"), "f3"), (Pawn("black"), "e6"))
+    assert see(board, "f3d4") == 0
+    board.place_piece(Pawn("black"), square("c6"))
+    assert see(board, "f3d4") == 0  # c6 guards d5 and b5, not d4
+    assert see(_board((Knight("white"), "f3"), (Pawn("black"), "e5")), "f3d4") == -3
+
+
+def test_grid_is_left_untouched():
+    board = _board((Rook("white"), "e1"), (Rook("white"), "e2"), (Pawn("black"), "e5"), (Rook("black"), "e8"))
+    before = [row[:] for row in board.grid]
+    see(board, "e2e5")
+    assert board.grid == before
+
+
+def test_pongo_does_not_take_a_defended_piece_with_its_queen():
+    board = _board((Queen("white"), "d3"), (Rook("black"), "d5"), (Pawn("black"), "e6"), (Knight("white"), "b1"))
+    bot = GreedyBot(color="white")
+    for seed in range(5):
+        random.seed(seed)
+        assert bot.decide_move(board) != (square("d3"), square("d5"))
+
+
+def test_pongo_does_not_hang_its_queen():
+    board = _board((Queen("white"), "d1"), (Pawn("black"), "c6"), (Pawn("black"), "e6"))
+    bot = GreedyBot(color="white")
+    for seed in range(5):
+        random.seed(seed)
+        move = bot.decide_move(board)
+        assert move[1] not in (square("d5"), square("b5"), square("f5"))
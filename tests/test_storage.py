@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from app.api import api
+from app.cleanup import cleanup_abandoned_games
+from app.metrics import METRICS, instrument_app
+from app.models import db, Game
+from app.storage import engine_options, init_storage
+from app.unit_of_work import init_unit_of_work
+
+
+@pytest.fixture
+def app(tmp_path):
+    url = f"sqlite:///{tmp_path / 'games.db'}"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=url,
+        SQLALCHEMY_ENGINE_OPTIONS=engine_options(url),
+        games={}
+    )
+    db.init_app(app)
+    init_storage(app, db)
+    init_unit_of_work(app)
+    instrument_app(app, db)
+    app.register_blueprint(api)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_sqlite_runs_in_wal_mode(app):
+    with app.app_context():
+        assert db.session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert db.session.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+
+def test_sqlite_engine_has_no_server_pool_options():
+    assert "pool_size" not in engine_options("sqlite:///games.db")
+    assert engine_options("postgresql://localhost/idiotchess")["pool_pre_ping"] is True
+
+
+def test_game_persists_and_rehydrates_on_sqlite(app):
+    client = app.test_client()
+    session_id = client.post("/api/new-game/bot", json={"bot_type": "black_idiot", "player_color": "white"}).get_json()["session_id"]
+    assert client.post("/api/move", json={"session_id": session_id, "from": [6, 4], "to": [4, 4]}).status_code == 200
+    assert client.post("/api/bot-move", json={"session_id": session_id, "bot_color": "black"}).status_code == 200
+    before = client.get(f"/api/board?session_id={session_id}").get_json()
+
+    app.config["games"].clear()
+    after = client.get(f"/api/board?session_id={session_id}").get_json()
+    assert after["board"] == before["board"]
+    assert after["move_history"] == before["move_history"]
+    assert after["version"] == 2
+    assert after["turn"] == "white"
+    assert METRICS.phases[("/api/move", "db")].count >= 1
+    app.extensions["bot_jobs"].shutdown()
+
+
+def test_cleanup_deletes_only_abandoned_games(app):
+    client = app.test_client()
+    stale = [client.post("/api/new-game/bots", json={}).get_json()["session_id"] for _ in range(5)]
+    fresh = client.post("/api/new-game/bots", json={}).get_json()["session_id"]
+    with app.app_context():
+        Game.query.filter(Game.session_id.in_([uuid.UUID(s) for s in stale])).update(
+            {"last_active": datetime.now(UTC) - timedelta(hours=2)}, synchronize_session=False)
+        db.session.commit()
+        assert cleanup_abandoned_games(app, timeout_minutes=60, batch_size=2) == 5
+        assert Game.query.count() == 1
+    assert list(app.config["games"]) == [fresh]
@@ -0,0 +1,71 @@
+import pytest
+from app.board import Board
+from app.bots import MinimaxBot
+from app.tablebase import (
+    best_move,
+    canonical_signature,
+    decode_value,
+    encode_value,
+    generate_table,
+    probe,
+    table_path,
+)
+from pieces import King, Pawn, Queen, Rook
+
+
+def _board(*placements):
+    board = Board()
+    for color, piece_cls, position in placements:
+        piece = piece_cls(color)
+        piece.mark_as_moved()  # no castling rights
+        board.place_piece(piece, position)
+    return board
+
+
+@pytest.mark.parametrize("wdl, dtm", [(1, 1), (1, 31), (-1, 0), (-1, 30), (0, 0)])
+def test_value_encoding_round_trip(wdl, dtm):
+    assert decode_value(encode_value(wdl, dtm)) == (wdl, dtm)
+
+
+def test_signature_puts_stronger_side_first():
+    assert canonical_signature("Q", "") == ("KQK", False)
+    assert canonical_signature("N", "R") == ("KRKN", True)
+
+
+def test_mate_in_one_is_found_and_played():
+    board = _board(("white", King, (2, 2)), ("white", Queen, (1, 6)), ("black", King, (0, 0)))
+    assert probe(board, 'white') == (1, 1)
+    board.move_piece(*best_move(board, 'white'))
+    assert board.is_checkmate('black')
+
+
+def test_colors_are_mirrored():
+    board = _board(("black", King, (5, 2)), ("black", Rook, (6, 6)), ("white", King, (7, 0)))
+    mirrored = _board(("white", King, (2, 2)), ("white", Rook, (1, 6)), ("black", King, (0, 0)))
+    assert probe(board, 'black') == probe(mirrored, 'white')
+    assert probe(board, 'white')[0] == -1
+
+
+def test_hanging_rook_is_a_draw_for_the_side_to_move():
+    board = _board(("white", King, (7, 0)), ("black", Rook, (6, 1)), ("black", King, (0, 7)))
+    assert probe(board, 'white') == (0, 0)
+    assert best_move(board, 'white') == ((7, 0), (6, 1))
+
+
+def test_positions_with_pawns_are_not_covered():
+    board = _board(("white", King, (7, 0)), ("white", Pawn, (6, 1)), ("black", King, (0, 7)))
+    assert probe(board, 'white') is None
+    assert best_move(board, 'white') is None
+
+
+def test_minimax_bot_uses_tablebase_move():
+    board = _board(("white", King, (2, 2)), ("white", Queen, (1, 6)), ("black", King, (0, 0)))
+    bot = MinimaxBot(color="white")
+    board.move_piece(*bot.decide_move(board))
+    assert board.is_checkmate('black')
+
+
+def test_generated_table_matches_shipped_table(tmp_path):
+    path = generate_table("KQK", str(tmp_path))
+    with open(path, "rb") as generated, open(table_path("KQK"), "rb") as shipped:
+        assert generated.read() == shipped.read()
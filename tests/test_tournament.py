@@ -0,0 +1,62 @@
+import pytest
+from app.tournament import (
+    estimate_elo,
+    gauntlet_pairings,
+    play_game,
+    round_robin_pairings,
+    run_tournament,
+    summarize,
+)
+
+
+def _game(white, black, result):
+    return {
+        'white': white, 'black': black, 'result': result, 'reason': None, 'plies': 10,
+        'think_time': {'white': 0.1, 'black': 0.1},
+        'moves': {'white': 5, 'black': 5},
+        'nodes': {'white': 0, 'black': 0},
+    }
+
+
+def test_round_robin_alternates_colors():
+    pairings = round_robin_pairings(["a", "b", "c"], games_per_pair=2)
+    assert len(pairings) == 6
+    assert ("a", "b") in pairings and ("b", "a") in pairings
+
+
+def test_gauntlet_skips_challenger_in_field():
+    pairings = gauntlet_pairings("a", ["a", "b", "c"], games_per_pair=1)
+    assert pairings == [("a", "b"), ("a", "c")]
+
+
+def test_elo_orders_stronger_bot_first_and_is_anchored():
+    games = [_game("strong", "weak", "1-0"), _game("weak", "strong", "0-1"), _game("strong", "weak", "1/2-1/2")]
+    elo = estimate_elo(games)
+    assert elo["strong"] > elo["weak"]
+    assert (elo["strong"] + elo["weak"]) / 2 == pytest.approx(1500, abs=0.5)
+
+
+def test_equal_scores_give_equal_ratings():
+    elo = estimate_elo([_game("a", "b", "1-0"), _game("b", "a", "1-0")])
+    assert elo["a"] == pytest.approx(elo["b"], abs=0.5)
+
+
+def test_play_game_respects_move_limit():
+    game = play_game("white_idiot", "black_idiot", max_plies=6, seed=1)
+    assert game['plies'] <= 6
+    assert game['result'] in ('1-0', '0-1', '1/2-1/2')
+    assert game['moves']['white'] >= game['moves']['black']
+
+
+def test_tournament_summary_counts_every_game():
+    games = run_tournament(round_robin_pairings(["white_idiot", "black_idiot"], 2), workers=1, max_plies=4, seed=7)
+    standings = summarize(games)
+    for row in standings.values():
+        assert row['games'] == 2
+        assert row['wins'] + row['draws'] + row['losses'] == 2
+        assert row['nodes_per_second'] is None
+
+
+def test_unknown_bot_is_rejected():
+    with pytest.raises(ValueError):
+        run_tournament([("white_idiot", "no_such_bot")])
@@ -0,0 +1,71 @@
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import event, text
+
+from app.models import db
+from app.unit_of_work import begin_read, init_unit_of_work, read_only
+
+
+@pytest.fixture
+def app_and_commits():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    init_unit_of_work(app)
+
+    @app.route("/write/<int:value>")
+    def write(value):
+        db.session.execute(text("INSERT INTO items (value) VALUES (:value)"), {"value": value})
+        db.session.execute(text("INSERT INTO items (value) VALUES (:value)"), {"value": value + 1})
+        return jsonify({"ok": True})
+
+    @app.route("/fail")
+    def fail():
+        db.session.execute(text("INSERT INTO items (value) VALUES (99)"))
+        return jsonify({"error": "nope"}), 400
+
+    @app.route("/read")
+    @read_only
+    def read():
+        begin_read()
+        count = db.session.execute(text("SELECT COUNT(*) FROM items")).scalar()
+        return jsonify({"count": count})
+
+    @app.route("/nothing")
+    def nothing():
+        return jsonify({})
+
+    commits = []
+    with app.app_context():
+        db.session.execute(text("CREATE TABLE items (value INTEGER)"))
+        db.session.commit()
+        event.listen(db.engine, "commit", lambda conn: commits.append(1))
+    yield app, commits
+
+
+def _count(client):
+    return client.get("/read").get_json()["count"]
+
+
+def test_request_commits_once(app_and_commits):
+    app, commits = app_and_commits
+    client = app.test_client()
+    assert client.get("/write/1").status_code == 200
+    assert len(commits) == 1
+    assert _count(client) == 2
+
+
+def test_error_response_rolls_back(app_and_commits):
+    app, commits = app_and_commits
+    client = app.test_client()
+    assert client.get("/fail").status_code == 400
+    assert commits == []
+    assert _count(client) == 0
+
+
+def test_read_only_and_untouched_requests_do_not_commit(app_and_commits):
+    app, commits = app_and_commits
+    client = app.test_client()
+    _count(client)
+    client.get("/nothing")
+    assert commits == []
@@ -0,0 +1,49 @@
+import pytest
+from app.board import Board
+from pieces import King, Pawn, Rook
+
+
+def _start():
+    board = Board()
+    board.setup_standard_position()
+    return board
+
+
+def test_side_to_move_changes_hash():
+    board = _start()
+    assert board.position_hash('white') != board.position_hash('black')
+
+
+def test_transpositions_hash_equal():
+    first = _start()
+    for move in [((7, 6), (5, 5)), ((0, 6), (2, 5)), ((7, 1), (5, 2)), ((0, 1), (2, 2))]:
+        first.move_piece(*move)
+    second = _start()
+    for move in [((7, 1), (5, 2)), ((0, 1), (2, 2)), ((7, 6), (5, 5)), ((0, 6), (2, 5))]:
+        second.move_piece(*move)
+    assert first.position_hash() == second.position_hash()
+
+
+def test_castling_rights_affect_hash():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(Rook("white"), (7, 7))
+    board.place_piece(King("black"), (0, 4))
+    before = board.position_hash('white')
+    board.get_piece_at((7, 7)).mark_as_moved()
+    assert board.position_hash('white') != before
+
+
+def test_en_passant_only_counts_when_capture_possible():
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(King("black"), (0, 4))
+    board.place_piece(Pawn("white"), (6, 0))
+    board.move_piece((6, 0), (4, 0))
+    no_capture = board.position_hash('black')
+
+    board = Board()
+    board.place_piece(King("white"), (7, 4))
+    board.place_piece(King("black"), (0, 4))
+    board.place_piece(Pawn("white"), (4, 0))
+    assert board.position_hash('black') == no_capture
@@ -0,0 +1,278 @@
+"""
+Micro-benchmarks for the engine's hot paths, with regression gating.
+
+Times board copying, move making, check and mate detection, position keys,
+static exchange evaluation, random move selection, every evaluator,
+GameManager (de)serialization and each bot's decide_move() on a fixed
+middlegame position, plus rehydrating a 200-ply game from its database row,
+and compares the results with the baseline stored in benchmarks/hot_paths.json:
+
+    python utils/benchmark_hot_paths.py                 # compare with the baseline
+    python utils/benchmark_hot_paths.py --check         # exit 1 on a regression
+    python utils/benchmark_hot_paths.py --save          # record a new baseline
+    python utils/benchmark_hot_paths.py --only decide_move
+
+Timings are divided by the time of a fixed pure-Python calibration loop
+before they are compared, so a baseline recorded on one machine stays
+meaningful on another; only slowdowns beyond --threshold count as
+regressions.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bots import BOT_REGISTRY, MinimaxBot, evaluate_material
+from app.game import GameManager
+from app.models import Game
+from app.move_scoring import find_random_move, static_exchange_evaluation
+from app.negamax_search import SearchOptions
+from app.player import HumanPlayer
+from app.rehydrate import rehydrate_game
+from app import position_evaluation
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "hot_paths.json")
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown relative to the baseline
+TIME_LIMITED_BOT_DEPTH = 3  # Depth searched by bots that normally stop on a time limit
+REHYDRATED_PLIES = 200
+
+# Giuoco Pianissimo with a kingside pawn storm: out of the opening book, white to move
+MIDDLEGAME_LINE = "e2e4 e7e5 g1f3 b8c6 f1c4 f8c5 c2c3 g8f6 d2d3 d7d6 e1g1 a7a6 c1g5 h7h6 g5h4 g7g5 h4g3 c8g4"
+
+EVALUATORS = {
+    'evaluate_material': evaluate_material,
+    'evaluate_mobility': position_evaluation.evaluate_mobility,
+    'evaluate_king_safety': position_evaluation.evaluate_king_safety,
+    'evaluate_material_and_position': position_evaluation.evaluate_material_and_position,
+    'evaluate_position_mobility': position_evaluation.evaluate_position_mobility,
+    'evaluate_position_safety': position_evaluation.evaluate_position_safety,
+}
+
+# name -> (setup, run): setup() builds the input of one call outside the timer, run(input) is timed
+BENCHMARKS = {}
+
+
+def square(name):
+    """Algebraic square ("e4") to a (row, col) position."""
+    return 8 - int(name[1]), ord(name[0]) - ord('a')
+
+
+def middlegame_manager():
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="white", color="white"), HumanPlayer(name="black", color="black"))
+    for move in MIDDLEGAME_LINE.split():
+        if not manager.make_move(square(move[:2]), square(move[2:])):
+            raise ValueError(f"Illegal move in MIDDLEGAME_LINE: {move}")
+    return manager
+
+
+def benchmark(name, setup=None):
+    """Register run under name; without setup every call gets the same middlegame board."""
+    def register(run):
+        BENCHMARKS[name] = (setup or (lambda: POSITION.board), run)
+        return run
+    return register
+
+
+POSITION = middlegame_manager()
+QUIET_MOVE = (square("b1"), square("d2"))
+CAPTURE = (square("f3"), square("e5"))
+
+
+def fresh_board():
+    return POSITION.board.copy()
+
+
+benchmark('Board.copy')(lambda board: board.copy())
+benchmark('Board.move_piece[validate]', fresh_board)(lambda board: board.move_piece(*QUIET_MOVE))
+benchmark('Board.move_piece[capture]', fresh_board)(lambda board: board.move_piece(*CAPTURE))
+benchmark('Board.move_piece[no validate]', fresh_board)(lambda board: board.move_piece(*QUIET_MOVE, validate=False))
+benchmark('Board.is_in_check')(lambda board: board.is_in_check('white'))
+benchmark('Board.has_any_valid_moves')(lambda board: board.has_any_valid_moves('white'))
+benchmark('Board.generate_position_key')(lambda board: board.generate_position_key())
+benchmark('static_exchange_evaluation')(lambda board: static_exchange_evaluation(board, *CAPTURE))
+benchmark('find_random_move[full]', lambda: random.seed(0) or POSITION.board)(
+    lambda board: find_random_move(board, 'white', lazy=False))
+benchmark('find_random_move[lazy]', lambda: random.seed(0) or POSITION.board)(
+    lambda board: find_random_move(board, 'white'))
+for _name, _evaluate in EVALUATORS.items():
+    benchmark(_name)(lambda board, evaluate=_evaluate: evaluate(board, 'white'))
+benchmark('GameManager.to_dict', lambda: POSITION)(lambda manager: manager.to_dict())
+benchmark('GameManager.from_dict', POSITION.to_dict)(GameManager.from_dict)
+
+
+def long_game_row(plies=REHYDRATED_PLIES, seed=0):
+    """Game row of a seeded random game of plies plies, as stored in the database."""
+    manager = GameManager()
+    manager.set_players(HumanPlayer(name="white", color="white"), HumanPlayer(name="black", color="black"))
+    rng = random.Random(seed)
+    while manager.version < plies:
+        moves = [(from_pos, to_pos) for from_pos, targets in manager.legal_moves().items() for to_pos in targets]
+        if not moves or not manager.make_move(*rng.choice(moves)):
+            raise ValueError(f"Random game ended after {manager.version} plies; pick another seed")
+    return Game(current_turn=manager.current_turn, game_status='active',
+                white_player_type='human', black_player_type='human',
+                white_player_name='white', black_player_name='black', move_record=manager.move_record())
+
+
+LONG_GAME = long_game_row()
+benchmark(f'rehydrate_game[{REHYDRATED_PLIES} plies]', lambda: LONG_GAME)(rehydrate_game)
+
+
+def bench_bot(bot_class):
+    """The bot playing white; time-limited searches always use their whole budget, so they search a fixed depth instead."""
+    bot = bot_class(color='white')
+    options = getattr(bot, 'search_options', None)
+    if options is not None and options.time_limit is not None:
+        bot.search_options = SearchOptions(**{**vars(options), 'time_limit': None})
+        bot.depth = TIME_LIMITED_BOT_DEPTH
+    return bot
+
+
+for _key, _bot_class in BOT_REGISTRY.items():
+    # Seeded so random tie-breaks pick the same moves on every run
+    benchmark(f'decide_move[{_key}]', lambda: random.seed(0) or POSITION.board.copy())(
+        lambda board, bot=bench_bot(_bot_class): bot.decide_move(board))
+    if issubclass(_bot_class, MinimaxBot) and _bot_class.search_options is None:
+        benchmark(f'decide_move[{_key}/pvs]', lambda: random.seed(0) or POSITION.board.copy())(
+            lambda board, bot=_bot_class(color='white', engine='pvs'): bot.decide_move(board))
+
+
+def calibration_workload():
+    """Fixed dict-and-list workload whose time is the unit benchmarks are normalized by."""
+    grid = [[(row * 8 + col) % 7 or None for col in range(8)] for row in range(8)]
+    total = 0
+    for _ in range(20):
+        counts = {}
+        for row in grid:
+            for value in row:
+                if value is not None:
+                    counts[value] = counts.get(value, 0) + 1
+        total += sum(counts.values())
+    return total
+
+
+def measure(setup, run, rounds=7, min_time=0.05):
+    """
+    Fastest per-call time over rounds, each lasting at least min_time seconds
+    (at least one call). The garbage collector is paused while timing, as in timeit.
+    """
+    run(setup())  # Warm caches and lazy loads
+    best = float('inf')
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            elapsed = 0.0
+            calls = 0
+            while elapsed < min_time or calls == 0:
+                value = setup()
+                start = time.perf_counter()
+                run(value)
+                elapsed += time.perf_counter() - start
+                calls += 1
+            best = min(best, elapsed / calls)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def run_benchmarks(names, rounds=7, min_time=0.05):
+    """Time the named benchmarks; returns {'calibration': seconds, 'results': {name: {'seconds', 'relative'}}}."""
+    unit = measure(lambda: None, lambda _: calibration_workload(), rounds=rounds, min_time=min_time)
+    results = {}
+    for name in names:
+        seconds = measure(*BENCHMARKS[name], rounds=rounds, min_time=min_time)
+        results[name] = {'seconds': seconds, 'relative': seconds / unit}
+    return {'calibration': unit, 'results': results}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """(name, ratio to baseline or None, regressed) for each result; ratios compare normalized times."""
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        ratio = result['relative'] / base['relative'] if base else None
+        rows.append((name, ratio, ratio is not None and ratio > 1 + threshold))
+    return rows
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def save_baseline(path, run, previous=None):
+    """Write the run as the baseline, keeping previous entries for benchmarks that were not run."""
+    results = dict(previous or {})
+    results.update({name: {'seconds': round(r['seconds'], 9), 'relative': round(r['relative'], 6)}
+                    for name, r in run['results'].items()})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'calibration': round(run['calibration'], 9),
+            'results': dict(sorted(results.items()))
+        }, f, indent=2)
+        f.write('\n')
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine's hot paths against a stored baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file (default: benchmarks/hot_paths.json)")
+    parser.add_argument("--save", action="store_true", help="Record this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if any benchmark regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown that counts as a regression, as a fraction (default: 0.25)")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=7, help="Timing rounds per benchmark; the fastest counts")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.only or args.only in name]
+    if not names:
+        parser.error(f"no benchmark matches {args.only!r}")
+
+    run = run_benchmarks(names, args.rounds, args.min_time)
+    baseline = load_baseline(args.baseline)
+    rows = compare(run['results'], baseline, args.threshold)
+
+    width = max(len(name) for name in names)
+    print(f"{'benchmark':<{width}}  {'time':>10}  {'vs baseline':>11}")
+    for name, ratio, regressed in rows:
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "new"
+        flag = "  REGRESSED" if regressed else ""
+        print(f"{name:<{width}}  {format_seconds(run['results'][name]['seconds']):>10}  {change:>11}{flag}")
+
+    if args.save:
+        save_baseline(args.baseline, run, baseline)
+        print(f"Baseline saved to {args.baseline}")
+
+    regressions = [name for name, _, regressed in rows if regressed]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
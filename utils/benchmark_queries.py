@@ -0,0 +1,137 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert
+
+from app import create_app
+from app.game import GameManager
+from app.models import db, Game, BoardState, Move
+
+SEED_PLAYER_NAME = "query-benchmark"  # Marks seeded rows so --drop-seed can remove them
+BATCH_SIZE = 2000
+
+LOOKUP_INDEXES = [
+    (Move.__table__, 'ix_moves_session_move'),
+    (BoardState.__table__, 'ix_board_states_session_move'),
+    (Game.__table__, 'ix_games_active_last_active'),
+]
+
+
+def seed(games, moves_per_game, rng):
+    """Insert games with their board states and moves in bulk; about a tenth are stale active games."""
+    board = GameManager().board_state()
+    now = datetime.now(UTC)
+    for start in range(0, games, BATCH_SIZE):
+        game_rows, state_rows, move_rows = [], [], []
+        for _ in range(min(BATCH_SIZE, games - start)):
+            session_id = uuid.uuid4()
+            finished = rng.random() < 0.7
+            game_rows.append({
+                'session_id': session_id,
+                'created_at': now,
+                'current_turn': 'white',
+                'game_status': "Checkmate! White wins." if finished else "active",
+                'white_player_type': 'human',
+                'black_player_type': 'bot',
+                'white_player_name': SEED_PLAYER_NAME,
+                'black_player_name': 'GreedyBot',
+                'last_active': now - timedelta(minutes=rng.randint(0, 600))
+            })
+            for move_number in range(1, moves_per_game + 1):
+                state_rows.append({'session_id': session_id, 'move_number': move_number,
+                                   'board_state': board, 'captured_pieces': []})
+                move_rows.append({'session_id': session_id, 'move_number': move_number,
+                                  'from_position': [6, 4], 'to_position': [4, 4],
+                                  'piece_type': 'Pawn', 'piece_color': 'white'})
+        db.session.execute(insert(Game), game_rows)
+        db.session.execute(insert(BoardState), state_rows)
+        db.session.execute(insert(Move), move_rows)
+        db.session.commit()
+        print(f"  seeded {start + len(game_rows)}/{games} games")
+
+
+def drop_seed():
+    seeded = db.session.query(Game.session_id).filter(Game.white_player_name == SEED_PLAYER_NAME)
+    Move.query.filter(Move.session_id.in_(seeded)).delete(synchronize_session=False)
+    BoardState.query.filter(BoardState.session_id.in_(seeded)).delete(synchronize_session=False)
+    Game.query.filter(Game.white_player_name == SEED_PLAYER_NAME).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def hot_queries(session_ids):
+    """The lookups behind rehydration and abandoned-game cleanup, each run for a random game."""
+    cutoff = datetime.now(UTC) - timedelta(minutes=60)
+    return {
+        'moves by game': lambda: Move.query.filter_by(session_id=random.choice(session_ids)).order_by(Move.move_number).all(),
+        'latest board state': lambda: BoardState.query.filter_by(session_id=random.choice(session_ids)).order_by(BoardState.move_number.desc()).first(),
+        'abandoned games': lambda: db.session.query(func.count(Game.session_id)).filter(
+            Game.game_status == "active", Game.last_active < cutoff).scalar(),
+    }
+
+
+def time_queries(queries, repeats):
+    timings = {}
+    for name, run in queries.items():
+        run()  # Warm the cache
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - start)
+        timings[name] = statistics.median(samples) * 1000
+    return timings
+
+
+def set_indexes(present):
+    for table, name in LOOKUP_INDEXES:
+        index = next(index for index in table.indexes if index.name == name)
+        if present:
+            index.create(bind=db.engine, checkfirst=True)
+        else:
+            index.drop(bind=db.engine, checkfirst=True)
+    db.session.execute(db.text("ANALYZE"))
+    db.session.commit()
+
+
+def main(argv=None):
+    """Seed a database with many games and compare hot query latency without and with the lookup indexes."""
+    parser = argparse.ArgumentParser(description="Benchmark game lookup queries with and without indexes.")
+    parser.add_argument("--games", type=int, default=100_000, help="Games to seed")
+    parser.add_argument("--moves", type=int, default=4, help="Moves and board states per seeded game")
+    parser.add_argument("--repeats", type=int, default=200, help="Timed runs per query")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse rows seeded by an earlier run")
+    parser.add_argument("--drop-seed", action="store_true", help="Delete the seeded rows afterwards")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        if not args.skip_seed:
+            print(f"Seeding {args.games} games...")
+            seed(args.games, args.moves, random.Random(0))
+        session_ids = [row[0] for row in db.session.query(Game.session_id).limit(10_000)]
+        queries = hot_queries(session_ids)
+
+        set_indexes(False)
+        before = time_queries(queries, args.repeats)
+        set_indexes(True)
+        after = time_queries(queries, args.repeats)
+
+        print(f"\n{'query':<22}{'no index':>12}{'indexed':>12}{'speedup':>10}")
+        for name in queries:
+            print(f"{name:<22}{before[name]:>10.2f}ms{after[name]:>10.2f}ms{before[name] / after[name]:>9.1f}x")
+
+        if args.drop_seed:
+            drop_seed()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.opening_book import DEFAULT_BOOK_PATH, DEFAULT_BOOK_PLIES, OpeningBook, build_book_from_pgn
+
+DEFAULT_PGN_PATH = os.path.join(os.path.dirname(DEFAULT_BOOK_PATH), "openings.pgn")
+
+def main(argv=None):
+    """Build the binary opening book from a PGN corpus."""
+    parser = argparse.ArgumentParser(description="Build an opening book from PGN files.")
+    parser.add_argument("pgn", nargs="*", default=[DEFAULT_PGN_PATH], help="PGN files to read")
+    parser.add_argument("-o", "--output", default=DEFAULT_BOOK_PATH, help="Book file to write")
+    parser.add_argument("--plies", type=int, default=DEFAULT_BOOK_PLIES, help="Plies per game to include")
+    args = parser.parse_args(argv)
+
+    count = build_book_from_pgn(args.pgn, args.output, max_plies=args.plies)
+    book = OpeningBook(args.output)
+    print(f"Wrote {count} entries ({len(book) * 16} bytes) to {args.output}")
+    book.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare the search engines the minimax bots can use.
+
+Runs minimax (app/minimax_search.py) and negamax/PVS (app/negamax_search.py)
+on the same positions, depths and evaluators, and reports the nodes and time
+each needed and whether both found the same best score:
+
+    python utils/compare_search_engines.py --depths 2 3 --positions 6
+
+Exits with status 1 if the engines disagree on any score.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bots import SEARCH_ENGINES, evaluate_material
+from app.game import GameManager
+from app.move_scoring import find_random_move
+from app.position_evaluation import evaluate_position_mobility, evaluate_position_safety
+from app.search_stats import SearchStats
+
+EVALUATORS = {
+    'material': evaluate_material,
+    'mobility': evaluate_position_mobility,
+    'safety': evaluate_position_safety,
+}
+
+
+def random_positions(count, rng, min_plies=10, max_plies=40):
+    """Boards after random play, with the side to move; games that end early are skipped."""
+    positions = []
+    while len(positions) < count:
+        manager = GameManager()
+        random.seed(rng.random())
+        for _ in range(rng.randint(min_plies, max_plies)):
+            move = find_random_move(manager.board, manager.current_turn)
+            if move is None or not manager.make_move(*move):
+                break
+        if not manager.is_game_over():
+            positions.append((manager.board, manager.current_turn))
+    return positions
+
+
+def run_engine(engine, board, color, depth, evaluate):
+    stats = SearchStats()
+    start = time.perf_counter()
+    SEARCH_ENGINES[engine](board.copy(), color, depth, evaluate, stats, use_book=False)
+    return stats, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare nodes and time of the minimax and PVS search engines.")
+    parser.add_argument("--positions", type=int, default=6, help="Random positions searched (default: 6)")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 3], help="Search depths (default: 2 3)")
+    parser.add_argument("--evaluators", nargs="+", choices=sorted(EVALUATORS), default=['material', 'safety'],
+                        help="Evaluation functions (default: material safety)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the positions (default: 7)")
+    args = parser.parse_args(argv)
+
+    positions = random_positions(args.positions, random.Random(args.seed))
+    totals = {engine: [0, 0.0] for engine in SEARCH_ENGINES}
+    mismatches = 0
+    print(f"{'pos':>3} {'eval':<9} {'depth':>5} {'minimax nodes':>14} {'pvs nodes':>10} {'ratio':>6} "
+          f"{'minimax s':>10} {'pvs s':>8}  same score")
+    for index, (board, color) in enumerate(positions):
+        for name in args.evaluators:
+            for depth in args.depths:
+                minimax, minimax_time = run_engine('minimax', board, color, depth, EVALUATORS[name])
+                pvs, pvs_time = run_engine('pvs', board, color, depth, EVALUATORS[name])
+                same = pvs.score == minimax.score
+                mismatches += not same
+                totals['minimax'][0] += minimax.nodes
+                totals['minimax'][1] += minimax_time
+                totals['pvs'][0] += pvs.nodes
+                totals['pvs'][1] += pvs_time
+                print(f"{index:>3} {name:<9} {depth:>5} {minimax.nodes:>14} {pvs.nodes:>10} "
+                      f"{minimax.nodes / max(pvs.nodes, 1):>5.1f}x {minimax_time:>10.3f} {pvs_time:>8.3f}  "
+                      f"{'yes' if same else f'NO ({minimax.score} vs {pvs.score})'}")
+
+    (minimax_nodes, minimax_time), (pvs_nodes, pvs_time) = totals['minimax'], totals['pvs']
+    print(f"Total: minimax {minimax_nodes} nodes in {minimax_time:.2f} s, "
+          f"pvs {pvs_nodes} nodes in {pvs_time:.2f} s "
+          f"({minimax_nodes / max(pvs_nodes, 1):.1f}x fewer nodes, {minimax_time / max(pvs_time, 1e-9):.1f}x faster)")
+    if mismatches:
+        print(f"{mismatches} search(es) disagreed on the best score")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
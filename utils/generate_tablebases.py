@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.tablebase import generate_table, get_directory
+
+def main(argv=None):
+    """Generate endgame tablebases by retrograde analysis."""
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases for small pawnless endings.")
+    parser.add_argument("signatures", nargs="*", default=["KQK", "KRK"],
+                        help="Material signatures, stronger side first (e.g. KQK KRK KQKR KBNK)")
+    parser.add_argument("--dir", default=None, help="Output directory (default: TABLEBASE_PATH or app/data/tablebases)")
+    args = parser.parse_args(argv)
+
+    directory = args.dir or get_directory()
+    for signature in args.signatures:
+        start = time.perf_counter()
+        path = generate_table(signature, directory, progress=print)
+        print(f"{signature} done in {time.perf_counter() - start:.1f}s -> {path}")
+
+if __name__ == "__main__":
+    main()
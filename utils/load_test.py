@@ -0,0 +1,141 @@
+"""
+Load test of the game API against the configured database.
+
+Several threads create games against Moose, then repeatedly poll the board,
+read the legal moves, move and ask for the bot's reply; the script reports
+requests per second:
+
+    DATABASE_URL=sqlite:////tmp/load.db python utils/load_test.py --threads 8 --seconds 20
+
+--baseline measures the same code with the unit-of-work optimizations of
+app/unit_of_work.py undone: read-only requests query inside a transaction
+and game updates SELECT the row, change it and commit straight away. To
+compare with any other version, point --app-root at a checkout of it (e.g.
+made with `git worktree add`), so both runs use this script. The games.json
+the app saves goes to a temporary instance folder, not the checkout's.
+"""
+import argparse
+import inspect
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, UTC
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def use_baseline_paths():
+    """Undo the unit-of-work optimizations in this process, for a before/after comparison."""
+    import app.api as api_module
+    from app.models import db, Game
+
+    def update_game(session_id, **values):
+        game = db.session.get(Game, uuid.UUID(str(session_id)))
+        if game:
+            values['last_active'] = datetime.now(UTC)
+            for name, value in values.items():
+                setattr(game, name, value)
+            db.session.commit()
+
+    api_module.begin_read = lambda: None  # Reads open a transaction like writes
+    api_module._update_game = update_game
+
+
+def create_games(client, count):
+    session_ids = []
+    for _ in range(count):
+        response = client.post("/api/new-game/bot", json={"bot_type": "black_idiot", "player_color": "white"})
+        if response.status_code != 200:
+            raise SystemExit(f"Could not create a game: {response.get_json()}")
+        session_ids.append(response.get_json()["session_id"])
+    return session_ids
+
+
+def play_session(app, session_ids, deadline, cold, counts, lock, seed):
+    """Poll the board, read legal moves, move and ask for the bot's reply, until the deadline."""
+    client = app.test_client()
+    rng = random.Random(seed)
+    local = Counter()
+    while time.monotonic() < deadline:
+        session_id = rng.choice(session_ids)
+        if cold:
+            # Force the next read to rehydrate the game from the database
+            app.config["games"].pop(session_id, None)
+        board = client.get(f"/api/board?session_id={session_id}")
+        local[board.status_code] += 1
+        moves = client.get(f"/api/legal-moves?session_id={session_id}")
+        local[moves.status_code] += 1
+        legal = moves.get_json().get("moves") or {}
+        if moves.get_json().get("turn") != "white" or not legal:
+            continue
+        from_key = rng.choice(list(legal))
+        move = client.post("/api/move", json={
+            "session_id": session_id,
+            "from": [int(n) for n in from_key.split(",")],
+            "to": rng.choice(legal[from_key])
+        })
+        local[move.status_code] += 1
+        reply = client.post("/api/bot-move", json={"session_id": session_id, "bot_color": "black"})
+        local[reply.status_code] += 1
+    with lock:
+        counts.update(local)
+
+
+def main(argv=None):
+    """Drive the API from several threads against the configured database and report requests per second."""
+    parser = argparse.ArgumentParser(description="Load test the game API against DATABASE_URL (Postgres or SQLite).")
+    parser.add_argument("--games", type=int, default=50, help="Games created before the run")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=20, help="Duration of the run")
+    parser.add_argument("--cold", action="store_true", help="Drop games from memory before each read so reads hit the database")
+    parser.add_argument("--baseline", action="store_true",
+                        help="Run without the unit-of-work optimizations (transactional reads, SELECT before UPDATE)")
+    parser.add_argument("--app-root", help="Load the application from this checkout instead (for a baseline run)")
+    args = parser.parse_args(argv)
+
+    if args.app_root:
+        sys.path.insert(0, os.path.abspath(args.app_root))
+    from app import create_app
+    from app.models import db
+
+    # Keep the games.json the app saves before every request out of the checkout
+    instance_dir = tempfile.mkdtemp(prefix="load-test-")
+    if 'instance_path' in inspect.signature(create_app).parameters:
+        app = create_app(instance_path=instance_dir)
+    else:
+        app = create_app()  # Older checkouts always write to their own instance/ folder
+    with app.app_context():
+        db.create_all()  # Older checkouts do not create their tables on SQLite
+    if args.baseline:
+        use_baseline_paths()
+    session_ids = create_games(app.test_client(), args.games)
+
+    counts, lock = Counter(), threading.Lock()
+    deadline = time.monotonic() + args.seconds
+    threads = [
+        threading.Thread(target=play_session, args=(app, session_ids, deadline, args.cold, counts, lock, seed))
+        for seed in range(args.threads)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    total = sum(counts.values())
+    mode = " (baseline)" if args.baseline else ""
+    print(f"{total} requests in {elapsed:.1f}s on {args.threads} threads{mode}: {total / elapsed:.1f} req/s")
+    print("Responses by status: " + ", ".join(f"{code}: {n}" for code, n in sorted(counts.items())))
+    shutil.rmtree(instance_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Measure how much memory games and bot searches take, for sizing workers.
+
+Replays --games random games of up to --plies plies in memory under tracemalloc
+and reports the bytes each game holds (by component and by subsystem), then
+runs every bot's decide_move() on a middlegame position and reports its peak
+allocation:
+
+    python utils/profile_memory.py --games 200 --plies 80
+    python utils/profile_memory.py --bots gigantopithecus --json
+
+No database or Flask app is needed.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bots import BOT_REGISTRY, WhiteIdiotBot, BlackIdiotBot
+from app.game import GameManager
+from app.memory_profile import SEARCH_MEMORY, game_footprint, search_memory, subsystem_usage
+
+
+def random_game_moves(plies, rng):
+    """Moves of a random game of up to plies plies (fewer if the game ends)."""
+    manager = GameManager()
+    manager.set_players(WhiteIdiotBot(), BlackIdiotBot())
+    random.seed(rng.random())
+    moves = []
+    for _ in range(plies):
+        if manager.is_game_over():
+            break
+        move = manager.get_current_player().decide_move(manager.board)
+        if move is None or not manager.make_move(*move):
+            break
+        moves.append(move)
+    return moves
+
+
+def replay(moves):
+    manager = GameManager()
+    manager.set_players(WhiteIdiotBot(), BlackIdiotBot())
+    for from_pos, to_pos in moves:
+        manager.make_move(from_pos, to_pos)
+    return manager
+
+
+def profile_games(move_lists, top=10):
+    """
+    Traced bytes and deep size per game of the games replayed from move_lists
+    (tracemalloc must be tracing); returns (report, games).
+    """
+    count = len(move_lists)
+    before = tracemalloc.take_snapshot()
+    games = [replay(moves) for moves in move_lists]
+    after = tracemalloc.take_snapshot()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    usage = subsystem_usage(after, top)
+    footprints = [game_footprint(manager) for manager in games]
+    components = {name: sum(footprint[name] for footprint in footprints) // count for name in footprints[0]}
+    return {
+        'games': count,
+        'mean_plies': sum(manager.version for manager in games) / count,
+        'traced_bytes_per_game': retained // count,
+        'components_per_game': components,
+        'subsystems': usage['subsystems'],
+        'top_allocations': usage['top_allocations']
+    }, games
+
+
+def profile_searches(bot_keys, board, repeat):
+    """Peak allocation of each bot's decide_move() on board, repeated repeat times."""
+    SEARCH_MEMORY.reset()
+    for key in bot_keys:
+        bot_class = BOT_REGISTRY[key]
+        bot = bot_class(color=board.current_turn)
+        for _ in range(repeat):
+            random.seed(0)
+            with search_memory(bot_class.__name__):
+                bot.decide_move(board.copy())
+    return SEARCH_MEMORY.to_dict()
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report memory per in-memory game and peak memory per bot search.")
+    parser.add_argument("--games", type=int, default=50, help="Games to keep in memory (default: 50)")
+    parser.add_argument("--plies", type=int, default=60, help="Random plies played in each game (default: 60)")
+    parser.add_argument("--bots", nargs="+", choices=sorted(BOT_REGISTRY), default=list(BOT_REGISTRY),
+                        help="Bots whose decide_move() is measured (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Searches measured per bot (default: 3)")
+    parser.add_argument("--frames", type=int, default=1, help="Stack frames traced per allocation (default: 1)")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites listed (default: 10)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the games (default: 1)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    # Choosing random moves is slow under tracemalloc, so only replaying them is traced
+    rng = random.Random(args.seed)
+    move_lists = [random_game_moves(args.plies, rng) for _ in range(args.games)]
+    tracemalloc.start(args.frames)
+    try:
+        report, games = profile_games(move_lists, args.top)
+        report['searches'] = profile_searches(args.bots, games[0].board, args.repeat)
+    finally:
+        tracemalloc.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{report['games']} games, {report['mean_plies']:.1f} plies on average")
+    print(f"Traced memory per game: {format_bytes(report['traced_bytes_per_game'])}")
+    print("Deep size per game:")
+    for name, size in report['components_per_game'].items():
+        print(f"  {name:<10} {format_bytes(size):>10}")
+    print("Traced memory by subsystem:")
+    for name, size in report['subsystems'].items():
+        print(f"  {name:<10} {format_bytes(size):>10}")
+    print("Top allocation sites:")
+    for site in report['top_allocations']:
+        print(f"  {format_bytes(site['bytes']):>10}  {site['count']:>7} blocks  {site['location']}")
+    print("Peak allocation per decide_move():")
+    for bot, memory in report['searches'].items():
+        print(f"  {bot:<20} mean {format_bytes(memory['mean_peak_bytes']):>10}  max {format_bytes(memory['max_peak_bytes']):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
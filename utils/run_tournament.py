@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.bots import BOT_REGISTRY
+from app.tournament import (
+    DEFAULT_MAX_PLIES,
+    format_crosstable,
+    format_standings,
+    gauntlet_pairings,
+    round_robin_pairings,
+    run_tournament,
+    summarize,
+)
+
+def main(argv=None):
+    """Play a headless round-robin or gauntlet tournament and print the standings."""
+    parser = argparse.ArgumentParser(description="Play bot-vs-bot matches without the web UI.")
+    parser.add_argument("--bots", nargs="+", default=sorted(BOT_REGISTRY),
+                        help="Bot ids from BOT_REGISTRY (default: all bots)")
+    parser.add_argument("--mode", choices=["round-robin", "gauntlet"], default="round-robin")
+    parser.add_argument("--challenger", help="Bot id that plays the field in gauntlet mode")
+    parser.add_argument("--games", type=int, default=2, help="Games per pairing (colors alternate)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="Adjudicate a draw after this many plies")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed for reproducible games")
+    args = parser.parse_args(argv)
+
+    if args.mode == "gauntlet":
+        if not args.challenger:
+            parser.error("--challenger is required in gauntlet mode")
+        pairings = gauntlet_pairings(args.challenger, args.bots, args.games)
+    else:
+        pairings = round_robin_pairings(args.bots, args.games)
+
+    print(f"Playing {len(pairings)} games on {args.workers} worker(s)...")
+    games = run_tournament(pairings, workers=args.workers, max_plies=args.max_plies, seed=args.seed)
+
+    print()
+    print(format_standings(summarize(games)))
+    print()
+    print(format_crosstable(games))
+
+if __name__ == "__main__":
+    main()